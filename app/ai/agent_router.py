@@ -4,7 +4,7 @@ import json
 from typing import List
 
 from app.ai.interpret import interpret_message
-from app.ai.rag import retrieve_with_filters
+from app.ai.hybrid import hybrid_retrieve
 from app.ai.chat_model import chat_response
 from app.ai.trace_models import AIDebugTrace, ParsedFilters, RetrievedItem
 
@@ -35,18 +35,18 @@ def _parse_filters(raw_json: str) -> ParsedFilters:
     )
 
 
-def _filters_to_chroma_where(parsed: ParsedFilters) -> dict:
-    where = {}
+def _retrieval_filters(parsed: ParsedFilters) -> dict:
+    """Filters applied inside retrieval (rag.build_where format)."""
+    filters = {}
     if parsed.origin:
-        where["origin"] = parsed.origin
+        filters["origin"] = parsed.origin
     if parsed.category:
-        where["category"] = parsed.category
+        filters["category"] = parsed.category
     if parsed.dietary_features:
         # Simple “contains substring” style. You can refine later.
-        where["dietary_features"] = {"$contains": parsed.dietary_features}
-    # You can’t directly do numeric comparisons with Chroma where yet,
-    # so price_max can be handled in Python after retrieval.
-    return where
+        filters["dietary_features"] = parsed.dietary_features
+    # price_max is handled in Python after retrieval.
+    return filters
 
 
 def _choose_agent(user_message: str, filters: ParsedFilters) -> str:
@@ -92,8 +92,8 @@ def run_ai_pipeline(user_message: str, top_k: int = 5) -> AIDebugTrace:
     # 3) Retrieve candidates (if agent needs them)
     retrieved_raw = []
     if agent == "RecommendationAgent":
-        where = _filters_to_chroma_where(parsed_filters)
-        retrieved_raw = retrieve_with_filters(user_message, filters=where, top_k=top_k)
+        result = hybrid_retrieve(user_message, filters=_retrieval_filters(parsed_filters), top_k=top_k)
+        retrieved_raw = [dict(meta, id=doc_id) for doc_id, meta in zip(result["ids"], result["metadatas"])]
 
         # Apply price_max filter in Python
         if parsed_filters.price_max is not None:
@@ -107,7 +107,7 @@ def run_ai_pipeline(user_message: str, top_k: int = 5) -> AIDebugTrace:
     for r in retrieved_raw:
         retrieved_items.append(
             RetrievedItem(
-                id=str(r.get("id", "")) if "id" in r else "",
+                id=str(r.get("id", "")),
                 title=r.get("title", ""),
                 origin=r.get("origin") or None,
                 category=r.get("category") or None,
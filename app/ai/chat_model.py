@@ -1,9 +1,30 @@
 # app/ai/chat_model.py
-from openai import OpenAI
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+from app.ai.provider import get_provider
+
+
+def _build_messages(
+    system_prompt: str,
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, str]]:
+    messages = [{"role": "system", "content": system_prompt}]
+
+    # Add conversation history if provided
+    if conversation_history:
+        # Take only the last 20 messages (10 turns) for better context
+        recent_history = conversation_history[-20:]
+        for msg in recent_history:
+            messages.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+
+    # Add current user message
+    messages.append({"role": "user", "content": user_message})
+    return messages
 
-# Uses your OPENAI_API_KEY automatically
-client = OpenAI()
 
 def chat_response(
     system_prompt: str,
@@ -11,7 +32,7 @@ def chat_response(
     conversation_history: Optional[List[Dict[str, Any]]] = None
 ) -> str:
     """
-    Generate a friendly Yorkie chat reply using GPT with optional conversation history.
+    Generate a friendly Yorkie chat reply with optional conversation history.
 
     Args:
         system_prompt: System prompt to set AI behavior
@@ -22,27 +43,29 @@ def chat_response(
     Returns:
         AI response string
     """
-    # Build messages array
-    messages = [{"role": "system", "content": system_prompt}]
+    messages = _build_messages(system_prompt, user_message, conversation_history)
 
-    # Add conversation history if provided
-    if conversation_history:
-        # Take only the last 20 messages (10 turns) for better context
-        recent_history = conversation_history[-20:]
-        for msg in recent_history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+    return get_provider().chat(messages, temperature=0.7, max_tokens=200)
 
-    # Add current user message
-    messages.append({"role": "user", "content": user_message})
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=200,
-    )
+async def chat_response_async(
+    system_prompt: str,
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """Async variant of chat_response (same prompt/model settings)."""
+    messages = _build_messages(system_prompt, user_message, conversation_history)
+
+    return await get_provider().chat_async(messages, temperature=0.7, max_tokens=200)
+
+
+async def chat_response_stream(
+    system_prompt: str,
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[str]:
+    """Streaming variant of chat_response: yields content deltas as they arrive."""
+    messages = _build_messages(system_prompt, user_message, conversation_history)
 
-    return completion.choices[0].message.content.strip()
\ No newline at end of file
+    async for delta in get_provider().chat_stream(messages, temperature=0.7, max_tokens=200):
+        yield delta
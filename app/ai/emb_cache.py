@@ -0,0 +1,199 @@
+# app/ai/emb_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "app/ai/vector_store/embedding_cache.sqlite3")
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "2048"))
+EMBED_CACHE_DISK_ITEMS = int(os.getenv("EMBED_CACHE_DISK_ITEMS", "100000"))
+
+
+def cache_key(model: str, normalized_text: str) -> str:
+    """Content address for an embedding: model name + normalized input text."""
+    return hashlib.sha256(f"{model}\x00{normalized_text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
+
+    - Memory tier: LRU (OrderedDict) of the hottest vectors.
+    - Disk tier: SQLite table of float32 blobs, evicted least-recently-used
+      once it grows past `disk_items`.
+
+    Disk hits are promoted to the memory tier. Pass `path=None` to run
+    memory-only (useful in tests).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        memory_items: int = EMBED_CACHE_MEMORY_ITEMS,
+        disk_items: int = EMBED_CACHE_DISK_ITEMS,
+    ):
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            try:
+                self._open(path)
+            except Exception as e:
+                # Cache is an optimization only — never fail embedding because of it
+                logger.warning(f"Embedding disk cache disabled ({path}): {e}")
+                self._conn = None
+
+    # ---------------------------------------------------------------
+    # DISK TIER
+    # ---------------------------------------------------------------
+    def _open(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embedding_cache_last_used ON embedding_cache (last_used)"
+        )
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def _disk_get(self, key: str) -> Optional[List[float]]:
+        row = self._conn.execute(
+            "SELECT vector FROM embedding_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(
+            "UPDATE embedding_cache SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def _disk_put(self, key: str, model: str, vector: List[float]):
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        cur = self._conn.execute(
+            "INSERT OR IGNORE INTO embedding_cache (key, model, dim, vector, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, model, len(vector), blob, time.time()),
+        )
+        self._disk_count += cur.rowcount
+
+        if self._disk_count > self.disk_items:
+            # Evict in chunks (10%) so we don't run a DELETE on every insert
+            overflow = self._disk_count - self.disk_items + max(1, self.disk_items // 10)
+            self._conn.execute(
+                "DELETE FROM embedding_cache WHERE key IN ("
+                "SELECT key FROM embedding_cache ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    # ---------------------------------------------------------------
+    # MEMORY TIER
+    # ---------------------------------------------------------------
+    def _memory_put(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ---------------------------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------------------------
+    def get(self, model: str, normalized_text: str) -> Optional[List[float]]:
+        key = cache_key(model, normalized_text)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+            if self._conn is not None:
+                try:
+                    vector = self._disk_get(key)
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache read failed: {e}")
+                    vector = None
+
+                if vector is not None:
+                    self._memory_put(key, vector)
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, normalized_text: str, vector: List[float]):
+        key = cache_key(model, normalized_text)
+
+        with self._lock:
+            self._memory_put(key, list(vector))
+            if self._conn is not None:
+                try:
+                    self._disk_put(key, model, vector)
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embedding_cache")
+                self._disk_count = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_items": self._disk_count,
+            }
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        disabled = os.getenv("EMBED_CACHE_DISABLE_DISK", "").lower() in ("1", "true", "yes")
+        _cache = EmbeddingCache(path=None if disabled else EMBED_CACHE_PATH)
+    return _cache
@@ -2,6 +2,9 @@
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
 from dotenv import load_dotenv
 
 # Always load .env when this module is imported
@@ -10,16 +13,12 @@ ENV_PATH = os.path.join(BASE_DIR, ".env")
 
 load_dotenv(dotenv_path=ENV_PATH)
 
-from openai import OpenAI
-
-api_key = os.getenv("OPENAI_API_KEY")
-
-if not api_key:
-    raise ValueError("❌ OPENAI_API_KEY is missing. Check your .env file.")
+from app.ai.emb_cache import get_embedding_cache
+from app.ai.provider import get_provider
 
-client = OpenAI(api_key=api_key)
-
-MODEL_NAME = "text-embedding-3-small"
+# Inputs per embeddings request, and concurrent requests for embed_texts()
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+EMBED_MAX_WORKERS = int(os.getenv("EMBED_MAX_WORKERS", "4"))
 
 
 # ---------------------------------------------------------------
@@ -42,7 +41,8 @@ def _normalize(text: str) -> str:
     return text.strip()
 
 
-def embed_text(text: str):
+def _prepare(text: str) -> Optional[str]:
+    """Normalize + truncate text; returns None when nothing is left to embed."""
     if not text:
         return None
 
@@ -56,9 +56,105 @@ def embed_text(text: str):
     if len(text) > 2048:
         text = text[:2048]
 
-    resp = client.embeddings.create(
-        model=MODEL_NAME,
-        input=text
-    )
+    return text
+
+
+def embed_text(text: str):
+    text = _prepare(text)
+    if text is None:
+        return None
+
+    # Repeat queries skip the provider round trip entirely
+    provider = get_provider()
+    cache = get_embedding_cache()
+    cached = cache.get(provider.embedding_model, text)
+    if cached is not None:
+        return cached
 
-    return resp.data[0].embedding
+    vector = provider.embed([text])[0]
+    cache.put(provider.embedding_model, text, vector)
+    return vector
+
+
+async def embed_text_async(text: str):
+    """Async variant of embed_text (same normalization + cache)."""
+    text = _prepare(text)
+    if text is None:
+        return None
+
+    provider = get_provider()
+    cache = get_embedding_cache()
+    cached = cache.get(provider.embedding_model, text)
+    if cached is not None:
+        return cached
+
+    vector = (await provider.embed_async([text]))[0]
+    cache.put(provider.embedding_model, text, vector)
+    return vector
+
+
+# ---------------------------------------------------------------
+# BATCH EMBEDDING
+# ---------------------------------------------------------------
+def _embed_batch(batch: List[str]) -> List[List[float]]:
+    return get_provider().embed(batch)
+
+
+def embed_texts(
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_workers: int = EMBED_MAX_WORKERS,
+) -> List[Optional[List[float]]]:
+    """
+    Embed many texts with chunked multi-input requests.
+
+    - Each text goes through the same normalization as embed_text()
+    - Cache hits are served locally; only misses hit the provider
+    - Duplicate texts are embedded once
+    - Batches are fanned out over a bounded thread pool
+
+    Returns a list aligned with `texts` (None where the text was empty).
+    """
+    prepared = [_prepare(t) for t in texts]
+    results: List[Optional[List[float]]] = [None] * len(texts)
+
+    model = get_provider().embedding_model
+    cache = get_embedding_cache()
+    pending: Dict[str, List[int]] = {}
+
+    for i, text in enumerate(prepared):
+        if text is None:
+            continue
+        if text in pending:
+            pending[text].append(i)
+            continue
+        cached = cache.get(model, text)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending[text] = [i]
+
+    misses = list(pending.keys())
+    if not misses:
+        return results
+
+    batch_size = max(1, batch_size)
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+
+    def _store(batch: List[str], vectors: List[List[float]]):
+        for text, vector in zip(batch, vectors):
+            cache.put(model, text, vector)
+            for idx in pending[text]:
+                results[idx] = vector
+
+    if len(batches) == 1 or max_workers <= 1:
+        for batch in batches:
+            _store(batch, _embed_batch(batch))
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+        futures = {pool.submit(_embed_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            _store(futures[future], future.result())
+
+    return results
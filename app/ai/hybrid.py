@@ -0,0 +1,151 @@
+# app/ai/hybrid.py
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Sequence
+
+from sqlmodel import Session, select
+
+from app.ai.emb_model import embed_text, embed_text_async
+from app.ai.rag import query_collection, build_where
+from app.ai.vecstore import get_collection
+from app.core.db import engine
+from app.core.logger import get_logger
+from app.core.menu_search import full_text_query, search_terms
+from app.models.postgres.menu import MenuItem
+
+logger = get_logger(__name__)
+
+# Reciprocal rank fusion: score(d) = Σ weight / (HYBRID_RRF_K + rank(d))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+# 0 turns the full-text leg off (vector-only retrieval)
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+
+# Depth of each ranked list before fusion
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+
+# Words that would match nearly every item in an OR query
+STOPWORDS = frozenset("""
+    a an and any are as at be but by can do for from have i im in is it me my
+    of on or please recommend show so some something suggest that the this to
+    want what whats with would you your
+""".split())
+
+EMPTY_RESULT = {"ids": [], "metadatas": [], "distances": [], "scores": []}
+
+
+# ---------------------------------------------------------------
+# FUSION
+# ---------------------------------------------------------------
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Sequence[float],
+    k: int = HYBRID_RRF_K,
+) -> List[tuple]:
+    """Fuse ranked id lists into [(id, score), ...], best first."""
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if not weight:
+            continue
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    # Stable on ties: first-seen order (vector list first)
+    return sorted(scores.items(), key=lambda pair: -pair[1])
+
+
+# ---------------------------------------------------------------
+# LEXICAL LEG (full-text index from migrations/008)
+# ---------------------------------------------------------------
+def lexical_terms(query: str) -> List[str]:
+    return [t for t in search_terms(query) if t not in STOPWORDS and len(t) > 1]
+
+
+def lexical_search(query: str, limit: int = HYBRID_CANDIDATES) -> List[str]:
+    """Ids of available menu items ranked by full-text relevance (any term)."""
+    terms = lexical_terms(query)
+    if not terms:
+        return []
+
+    try:
+        with Session(engine) as session:
+            stmt = full_text_query(
+                select(MenuItem.id).where(MenuItem.is_available == True),  # noqa: E712
+                terms,
+                engine.dialect.name,
+                match_any=True,
+            ).limit(limit)
+            return [str(item_id) for item_id in session.exec(stmt).all()]
+    except Exception as e:
+        # Missing search index / DB hiccup → vector-only rather than failing the request
+        logger.warning(f"Lexical search unavailable, using vector results only: {e}")
+        return []
+
+
+# ---------------------------------------------------------------
+# HYBRID RETRIEVAL
+# ---------------------------------------------------------------
+def _fuse(vector: dict, lexical_ids: List[str], filters: Optional[dict], top_k: int) -> dict:
+    vector_ids = vector.get("ids") or []
+    metadata = dict(zip(vector_ids, vector.get("metadatas") or []))
+    distances = dict(zip(vector_ids, vector.get("distances") or []))
+
+    # Full-text hits the vector leg didn't return: fetch their metadata from
+    # the index, applying the same filters (drops filtered / unindexed items)
+    missing = [doc_id for doc_id in lexical_ids if doc_id not in metadata]
+    if missing:
+        found = get_collection().get(ids=missing, where=build_where(filters), include=["metadatas"])
+        metadata.update(zip(found.get("ids") or [], found.get("metadatas") or []))
+        lexical_ids = [doc_id for doc_id in lexical_ids if doc_id in metadata]
+
+    fused = reciprocal_rank_fusion(
+        [vector_ids, lexical_ids],
+        [HYBRID_VECTOR_WEIGHT, HYBRID_LEXICAL_WEIGHT],
+    )[:top_k]
+
+    return {
+        "ids": [doc_id for doc_id, _ in fused],
+        "metadatas": [metadata[doc_id] for doc_id, _ in fused],
+        # None for items only the full-text leg found
+        "distances": [distances.get(doc_id) for doc_id, _ in fused],
+        "scores": [score for _, score in fused],
+    }
+
+
+def hybrid_retrieve(query: str, filters: dict = None, top_k: int = 5, embedding=None) -> dict:
+    """
+    Vector + full-text retrieval fused with reciprocal rank fusion.
+
+    Same shape as rag.retrieve_with_filters plus `scores` (fused RRF
+    score per item). Pass `embedding` when the caller already has it.
+    """
+    if embedding is None:
+        embedding = embed_text(query)
+    if embedding is None:
+        return dict(EMPTY_RESULT)
+
+    depth = max(top_k, HYBRID_CANDIDATES)
+    vector = query_collection(embedding, filters, depth)
+    lexical_ids = lexical_search(query, depth) if HYBRID_LEXICAL_WEIGHT else []
+    return _fuse(vector, lexical_ids, filters, top_k)
+
+
+async def hybrid_retrieve_async(query: str, filters: dict = None, top_k: int = 5) -> dict:
+    """Async variant: embedding, vector query and full-text query run concurrently."""
+    depth = max(top_k, HYBRID_CANDIDATES)
+
+    async def vector_leg():
+        embedding = await embed_text_async(query)
+        if embedding is None:
+            return None
+        return await asyncio.to_thread(query_collection, embedding, filters, depth)
+
+    async def lexical_leg():
+        if not HYBRID_LEXICAL_WEIGHT:
+            return []
+        return await asyncio.to_thread(lexical_search, query, depth)
+
+    vector, lexical_ids = await asyncio.gather(vector_leg(), lexical_leg())
+    if vector is None:
+        return dict(EMPTY_RESULT)
+    return await asyncio.to_thread(_fuse, vector, lexical_ids, filters, top_k)
@@ -0,0 +1,255 @@
+# app/ai/index_sync.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logger import get_logger
+from app.models.postgres.menu import MenuItem
+
+logger = get_logger(__name__)
+
+# Set VECTOR_INDEX_SYNC=false to disable live index updates from menu writes
+VECTOR_INDEX_SYNC = os.getenv("VECTOR_INDEX_SYNC", "true").lower() in ("1", "true", "yes")
+
+# Seconds to wait after the first queued write so bursts coalesce into one batch
+VECTOR_INDEX_SYNC_DELAY = float(os.getenv("VECTOR_INDEX_SYNC_DELAY", "0.5"))
+
+# Failed writes are retried with exponential backoff, then dropped (logged as an error)
+VECTOR_INDEX_SYNC_MAX_ATTEMPTS = int(os.getenv("VECTOR_INDEX_SYNC_MAX_ATTEMPTS", "5"))
+VECTOR_INDEX_SYNC_RETRY_BASE_SECONDS = float(os.getenv("VECTOR_INDEX_SYNC_RETRY_BASE_SECONDS", "1.0"))
+VECTOR_INDEX_SYNC_RETRY_MAX_SECONDS = float(os.getenv("VECTOR_INDEX_SYNC_RETRY_MAX_SECONDS", "60"))
+
+Document = Tuple[str, str, Dict[str, Any]]
+
+
+# ------------------------------------------------------------------------------
+# DOCUMENT BUILDING (shared by the bulk pipeline and live updates)
+# ------------------------------------------------------------------------------
+def content_hash(text: str, metadata: Dict[str, Any]) -> str:
+    """Stable hash of everything that ends up in the vector index for an item."""
+    payload = json.dumps([text, metadata], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_document(item: MenuItem) -> Optional[Document]:
+    text_parts = [
+        item.title or "",
+        item.description or "",
+        " ".join(item.tags or []),
+        " ".join(item.flavor_profiles or []),
+        " ".join(item.dietary_features or []),
+        item.category or "",
+        item.origin or "",
+        f"price {item.price}" if item.price else "",
+    ]
+
+    # join and clean
+    combined_text = " ".join([p for p in text_parts if p]).lower().strip()
+
+    if not combined_text:
+        logger.warning(f"Skipping item (empty text): {item.title}")
+        return None
+
+    metadata = {
+        "title": item.title,
+        "origin": item.origin or "",
+        "category": item.category or "",
+        "price": float(item.price) if item.price else None,
+        "tags": ",".join(item.tags or []),
+        "flavor_profiles": ",".join(item.flavor_profiles or []),
+        "dietary_features": ",".join(item.dietary_features or []),
+    }
+    # Chroma rejects None metadata values (e.g. items without a price)
+    metadata = {k: v for k, v in metadata.items() if v is not None}
+    metadata["content_hash"] = content_hash(combined_text, metadata)
+
+    return str(item.id), combined_text, metadata
+
+
+def build_documents(items: Iterable[MenuItem]) -> List[Document]:
+    return [doc for doc in (build_document(item) for item in items) if doc]
+
+
+def get_indexed_hashes(collection, page_size: int = 1000) -> Dict[str, Optional[str]]:
+    """Map of id → content_hash for everything currently in the collection."""
+    hashes: Dict[str, Optional[str]] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        ids = page.get("ids") or []
+        for doc_id, meta in zip(ids, page.get("metadatas") or []):
+            hashes[doc_id] = (meta or {}).get("content_hash")
+        if len(ids) < page_size:
+            return hashes
+        offset += page_size
+
+
+# ------------------------------------------------------------------------------
+# LIVE INDEX UPDATES (menu create / update / delete)
+# ------------------------------------------------------------------------------
+class IndexSyncQueue:
+    """
+    Coalescing queue of pending vector-index writes.
+
+    Menu routes enqueue after their DB commit; a daemon thread drains the
+    queue in batches (one embeddings call + one upsert + one delete), so
+    admin requests never wait on OpenAI or Chroma. Multiple writes to the
+    same item collapse into the last one. A failed batch goes back on the
+    queue (a newer write to the same item wins) and is retried with
+    backoff.
+    """
+
+    def __init__(
+        self,
+        delay: float = VECTOR_INDEX_SYNC_DELAY,
+        max_attempts: int = VECTOR_INDEX_SYNC_MAX_ATTEMPTS,
+        retry_base: float = VECTOR_INDEX_SYNC_RETRY_BASE_SECONDS,
+        retry_max: float = VECTOR_INDEX_SYNC_RETRY_MAX_SECONDS,
+    ):
+        self.delay = delay
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._pending: Dict[str, Optional[Document]] = {}
+        # item id → failed attempts so far, for writes waiting on a retry
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue_upsert(self, item: MenuItem):
+        doc = build_document(item)
+        if doc is None:
+            self._put(str(item.id), None)
+        else:
+            self._put(doc[0], doc)
+
+    def enqueue_delete(self, item_id):
+        self._put(str(item_id), None)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _put(self, item_id: str, doc: Optional[Document]):
+        with self._lock:
+            self._pending[item_id] = doc
+            self._attempts.pop(item_id, None)
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="vector-index-sync", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        failures = 0
+        while True:
+            self._wakeup.wait()
+            # Let bursts of admin edits land in the same batch
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Vector index sync failed: {e}", exc_info=True)
+
+            with self._lock:
+                retrying = len(self._attempts)
+            if not retrying:
+                failures = 0
+                continue
+            failures += 1
+            backoff = min(self.retry_max, self.retry_base * 2 ** (failures - 1))
+            logger.warning(f"Vector index sync: retrying {retrying} item(s) in {backoff:.1f}s")
+            time.sleep(backoff)
+            self._wakeup.set()
+
+    def _requeue(self, batch: Dict[str, Optional[Document]]):
+        """Put failed writes back unless a newer write for the item arrived meanwhile."""
+        with self._lock:
+            for item_id, doc in batch.items():
+                if item_id in self._pending:
+                    continue
+                attempts = self._attempts.get(item_id, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(item_id, None)
+                    logger.error(f"Vector index sync: dropping {item_id} after {attempts} attempt(s)")
+                    continue
+                self._attempts[item_id] = attempts
+                self._pending[item_id] = doc
+
+    def flush(self) -> Dict[str, int]:
+        """Apply every pending write now. Returns counts of upserts/deletes."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return {"upserted": 0, "deleted": 0}
+
+        # Lazy imports: keep the menu routes importable without OpenAI/Chroma
+        from app.ai.emb_model import embed_texts
+        from app.ai.vecstore import get_collection
+
+        upserts = [doc for doc in pending.values() if doc is not None]
+        deletes = [item_id for item_id, doc in pending.items() if doc is None]
+        try:
+            collection = get_collection()
+            rows = []
+            if upserts:
+                vectors = embed_texts([text for _, text, _ in upserts])
+                for doc, vec in zip(upserts, vectors):
+                    if vec is None:
+                        # Text normalized to nothing: final, drop any old vector like enqueue_upsert does
+                        logger.warning(f"Vector index sync: no vector for {doc[2].get('title')}, removing it")
+                        deletes.append(doc[0])
+                    else:
+                        rows.append((doc, vec))
+            if rows:
+                collection.upsert(
+                    ids=[doc[0] for doc, _ in rows],
+                    embeddings=[vec for _, vec in rows],
+                    metadatas=[doc[2] for doc, _ in rows],
+                )
+            if deletes:
+                collection.delete(ids=deletes)
+        except Exception:
+            self._requeue(pending)
+            raise
+
+        with self._lock:
+            for doc, _ in rows:
+                self._attempts.pop(doc[0], None)
+            for item_id in deletes:
+                self._attempts.pop(item_id, None)
+
+        logger.info(f"Vector index sync: {len(rows)} upserted, {len(deletes)} deleted")
+        return {"upserted": len(rows), "deleted": len(deletes)}
+
+
+index_sync_queue = IndexSyncQueue()
+
+
+def enqueue_index_upsert(item: MenuItem):
+    if not VECTOR_INDEX_SYNC:
+        return
+    try:
+        index_sync_queue.enqueue_upsert(item)
+    except Exception as e:
+        # Never fail a menu write because the search index is unavailable
+        logger.warning(f"Could not enqueue index update for {item.id}: {e}")
+
+
+def enqueue_index_delete(item_id):
+    if not VECTOR_INDEX_SYNC:
+        return
+    try:
+        index_sync_queue.enqueue_delete(item_id)
+    except Exception as e:
+        logger.warning(f"Could not enqueue index delete for {item_id}: {e}")
@@ -1,10 +1,6 @@
 # app/ai/interpret.py
 
-import os
-import json
-from openai import OpenAI
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app.ai.provider import get_provider
 
 SYSTEM_PROMPT = """
 You convert natural food requests into structured filters.
@@ -19,27 +15,16 @@ Fields:
 """
 
 def interpret_message(message: str) -> dict:
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": message},
-        ],
-        response_format={"type": "json_object"},
-    )
-
-    raw = completion.choices[0].message.content
-
-    # Convert model JSON string → python dict
-    if isinstance(raw, str):
-        raw = json.loads(raw)
-
-    return raw
+    # JSON-mode completion → python dict
+    return get_provider().chat_json([
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": message},
+    ])
 
 
 def parse_query_filters(message: str) -> dict:
     """
-    Converts natural language → structured filters using OpenAI.
+    Converts natural language → structured filters using the AI provider.
     Ensures that the return value is always a valid dict and normalized.
     """
 
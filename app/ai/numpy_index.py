@@ -0,0 +1,525 @@
+# app/ai/numpy_index.py
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Metadata fields stored as comma-separated strings → per-row bitsets
+SET_FIELDS = ("flavor_profiles", "dietary_features", "tags")
+
+# Metadata fields stored as float columns (NaN = missing)
+NUMERIC_FIELDS = ("price",)
+
+# Metadata fields stored as exact-match string columns
+STRING_FIELDS = ("origin", "category", "title")
+
+
+class _Bitset:
+    """Vocabulary → bit mapping over a (rows, words) uint64 matrix."""
+
+    def __init__(self, capacity: int):
+        self.vocab: Dict[str, int] = {}
+        self.bits = np.zeros((capacity, 1), dtype=np.uint64)
+
+    def _bit(self, token: str, create: bool) -> Optional[int]:
+        bit = self.vocab.get(token)
+        if bit is None and create:
+            bit = len(self.vocab)
+            self.vocab[token] = bit
+            words = bit // 64 + 1
+            if words > self.bits.shape[1]:
+                grown = np.zeros((self.bits.shape[0], words), dtype=np.uint64)
+                grown[:, :self.bits.shape[1]] = self.bits
+                self.bits = grown
+        return bit
+
+    def resize(self, capacity: int):
+        grown = np.zeros((capacity, self.bits.shape[1]), dtype=np.uint64)
+        n = min(capacity, self.bits.shape[0])
+        grown[:n] = self.bits[:n]
+        self.bits = grown
+
+    def set_row(self, row: int, tokens: Sequence[str]):
+        self.bits[row] = 0
+        for token in tokens:
+            bit = self._bit(token, create=True)
+            self.bits[row, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    def contains(self, n: int, token: str) -> np.ndarray:
+        bit = self._bit(token, create=False)
+        if bit is None:
+            return np.zeros(n, dtype=bool)
+        return (self.bits[:n, bit // 64] & np.uint64(1 << (bit % 64))) != 0
+
+
+def _split(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip().lower() for v in value if str(v).strip()]
+    return [v.strip().lower() for v in str(value).split(",") if v.strip()]
+
+
+class NumpyCollection:
+    """
+    In-memory vector index with a Chroma-compatible subset of the
+    collection API (query / get / add / upsert / delete / count).
+
+    Vectors live in one contiguous, L2-normalized float32 matrix and
+    metadata in columnar arrays, so a filtered top-k is a single matmul,
+    a boolean mask and an argpartition. Distances are cosine distances
+    (1 - cosine similarity), same as the `hnsw:space=cosine` collection.
+
+    If `path` is given, the index is persisted to an .npz snapshot and
+    reloaded when another process rewrites it. Writers take an exclusive
+    lock on `<path>.lock` and reload a newer snapshot before applying
+    their change, so workers never overwrite each other's writes. Each
+    write rewrites the whole snapshot; wrap bulk writes in deferred() to
+    save once at the end.
+    """
+
+    def __init__(self, dim: Optional[int] = None, path: Optional[str] = None, capacity: int = 1024):
+        self.path = path
+        self._lock = threading.RLock()
+        self._write_lock = threading.RLock()
+        self._deferred_depth = 0
+        self._snapshot_sig: Optional[tuple] = None
+        self._reset(dim, capacity)
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    # ---------------------------------------------------------------
+    # STORAGE
+    # ---------------------------------------------------------------
+    def _reset(self, dim: Optional[int], capacity: int):
+        self.dim = dim
+        self.n = 0
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.metadatas: List[Dict[str, Any]] = []
+        self._capacity = max(1, capacity)
+        self.vectors = np.zeros((self._capacity, dim or 0), dtype=np.float32)
+        self.numeric = {f: np.full(self._capacity, np.nan, dtype=np.float64) for f in NUMERIC_FIELDS}
+        self.strings = {f: np.empty(self._capacity, dtype=object) for f in STRING_FIELDS}
+        self.sets = {f: _Bitset(self._capacity) for f in SET_FIELDS}
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2)
+
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self.n] = self.vectors[:self.n]
+        self.vectors = vectors
+
+        for f, col in self.numeric.items():
+            grown = np.full(capacity, np.nan, dtype=np.float64)
+            grown[:self.n] = col[:self.n]
+            self.numeric[f] = grown
+
+        for f, col in self.strings.items():
+            grown = np.empty(capacity, dtype=object)
+            grown[:self.n] = col[:self.n]
+            self.strings[f] = grown
+
+        for bitset in self.sets.values():
+            bitset.resize(capacity)
+
+        self._capacity = capacity
+
+    def _write_row(self, row: int, vector: np.ndarray, metadata: Dict[str, Any]):
+        self.vectors[row] = vector
+        for f in NUMERIC_FIELDS:
+            value = metadata.get(f)
+            self.numeric[f][row] = float(value) if value is not None else np.nan
+        for f in STRING_FIELDS:
+            self.strings[f][row] = metadata.get(f)
+        for f in SET_FIELDS:
+            self.sets[f].set_row(row, _split(metadata.get(f)))
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        arr = np.asarray(vectors, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return arr / norms
+
+    # ---------------------------------------------------------------
+    # WRITES
+    # ---------------------------------------------------------------
+    def upsert(self, ids: List[str], embeddings, metadatas: Optional[List[Dict[str, Any]]] = None, **_):
+        vectors = self._normalize(embeddings)
+        metadatas = metadatas or [{} for _ in ids]
+        with self._writing():
+            self._upsert_rows(ids, vectors, metadatas)
+
+    def _upsert_rows(self, ids: List[str], vectors: np.ndarray, metadatas: List[Dict[str, Any]]):
+        with self._lock:
+            if self.dim is None or self.n == 0:
+                if self.dim != vectors.shape[1]:
+                    self._reset(vectors.shape[1], self._capacity)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+            new = sum(1 for i in ids if i not in self.id_to_row)
+            self._grow(self.n + new)
+
+            for doc_id, vector, metadata in zip(ids, vectors, metadatas):
+                row = self.id_to_row.get(doc_id)
+                if row is None:
+                    row = self.n
+                    self.n += 1
+                    self.ids.append(doc_id)
+                    self.metadatas.append(dict(metadata or {}))
+                    self.id_to_row[doc_id] = row
+                else:
+                    self.metadatas[row] = dict(metadata or {})
+                self._write_row(row, vector, metadata or {})
+
+    def add(self, ids: List[str], embeddings, metadatas: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        self.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, **kwargs)
+
+    def delete(self, ids: Optional[List[str]] = None, **_):
+        with self._writing(), self._lock:
+            for doc_id in ids or []:
+                row = self.id_to_row.pop(doc_id, None)
+                if row is None:
+                    continue
+                last = self.n - 1
+                if row != last:
+                    # Swap the last row into the hole to keep storage contiguous
+                    moved = self.ids[last]
+                    self.vectors[row] = self.vectors[last]
+                    for col in self.numeric.values():
+                        col[row] = col[last]
+                    for col in self.strings.values():
+                        col[row] = col[last]
+                    for bitset in self.sets.values():
+                        bitset.bits[row] = bitset.bits[last]
+                    self.ids[row] = moved
+                    self.metadatas[row] = self.metadatas[last]
+                    self.id_to_row[moved] = row
+                self.ids.pop()
+                self.metadatas.pop()
+                self.n -= 1
+
+    def count(self) -> int:
+        self._maybe_reload()
+        return self.n
+
+    # ---------------------------------------------------------------
+    # FILTERING
+    # ---------------------------------------------------------------
+    def _mask(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        n = self.n
+        if not where:
+            return np.ones(n, dtype=bool)
+
+        mask = np.ones(n, dtype=bool)
+        for key, value in where.items():
+            if key == "$and":
+                for clause in value:
+                    mask &= self._mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(n, dtype=bool)
+                for clause in value:
+                    any_mask |= self._mask(clause)
+                mask &= any_mask
+            else:
+                mask &= self._field_mask(key, value)
+        return mask
+
+    def _field_mask(self, field: str, cond: Any) -> np.ndarray:
+        n = self.n
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+
+        mask = np.ones(n, dtype=bool)
+        for op, value in cond.items():
+            if field in NUMERIC_FIELDS:
+                col = self.numeric[field][:n]
+                with np.errstate(invalid="ignore"):
+                    if op == "$eq":
+                        mask &= col == value
+                    elif op == "$ne":
+                        mask &= col != value
+                    elif op == "$gt":
+                        mask &= col > value
+                    elif op == "$gte":
+                        mask &= col >= value
+                    elif op == "$lt":
+                        mask &= col < value
+                    elif op == "$lte":
+                        mask &= col <= value
+                    elif op == "$in":
+                        mask &= np.isin(col, value)
+                    elif op == "$nin":
+                        mask &= ~np.isin(col, value)
+                    else:
+                        raise ValueError(f"Unsupported operator {op} for {field}")
+
+            elif field in SET_FIELDS and op in ("$contains", "$eq"):
+                for token in _split(value):
+                    mask &= self.sets[field].contains(n, token)
+
+            elif field in STRING_FIELDS:
+                col = self.strings[field][:n]
+                if op == "$eq":
+                    mask &= col == value
+                elif op == "$ne":
+                    mask &= col != value
+                elif op == "$in":
+                    mask &= np.isin(col, list(value))
+                elif op == "$nin":
+                    mask &= ~np.isin(col, list(value))
+                else:
+                    raise ValueError(f"Unsupported operator {op} for {field}")
+
+            else:
+                # Slow path for fields without a column: evaluate per row
+                mask &= np.fromiter(
+                    (_match_scalar(m.get(field), op, value) for m in self.metadatas[:n]),
+                    dtype=bool, count=n,
+                )
+        return mask
+
+    # ---------------------------------------------------------------
+    # READS
+    # ---------------------------------------------------------------
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        **_,
+    ) -> Dict[str, Any]:
+        self._maybe_reload()
+        include = include or ["metadatas", "distances"]
+        queries = self._normalize(query_embeddings)
+
+        out = {"ids": [], "metadatas": [], "distances": [], "embeddings": None, "documents": None}
+        with self._lock:
+            n = self.n
+            candidates = np.flatnonzero(self._mask(where)) if n else np.empty(0, dtype=np.int64)
+
+            for q in queries:
+                if candidates.size == 0:
+                    out["ids"].append([])
+                    out["metadatas"].append([])
+                    out["distances"].append([])
+                    continue
+
+                scores = self.vectors[candidates] @ q if candidates.size < n else self.vectors[:n] @ q
+                k = min(n_results, candidates.size)
+                if k < candidates.size:
+                    top = np.argpartition(-scores, k - 1)[:k]
+                else:
+                    top = np.arange(candidates.size)
+                top = top[np.argsort(-scores[top], kind="stable")]
+                rows = candidates[top]
+
+                out["ids"].append([self.ids[r] for r in rows])
+                out["metadatas"].append([dict(self.metadatas[r]) for r in rows])
+                out["distances"].append((1.0 - scores[top]).astype(float).tolist())
+
+        if "metadatas" not in include:
+            out["metadatas"] = None
+        if "distances" not in include:
+            out["distances"] = None
+        return out
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        **_,
+    ) -> Dict[str, Any]:
+        self._maybe_reload()
+        include = include or ["metadatas"]
+        with self._lock:
+            if ids is not None:
+                rows = [self.id_to_row[i] for i in ([ids] if isinstance(ids, str) else ids) if i in self.id_to_row]
+                if where:
+                    # Like Chroma, ids and where combine with AND
+                    mask = self._mask(where)
+                    rows = [r for r in rows if mask[r]]
+            else:
+                rows = np.flatnonzero(self._mask(where)).tolist()
+            start = offset or 0
+            rows = rows[start:start + limit] if limit is not None else rows[start:]
+
+            return {
+                "ids": [self.ids[r] for r in rows],
+                "metadatas": [dict(self.metadatas[r]) for r in rows] if "metadatas" in include else None,
+                "embeddings": [self.vectors[r].tolist() for r in rows] if "embeddings" in include else None,
+                "documents": None,
+            }
+
+    # ---------------------------------------------------------------
+    # SNAPSHOT
+    # ---------------------------------------------------------------
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive cross-process lock for snapshot writers (no-op without a path)."""
+        if not self.path or fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self):
+        """Lock, catch up with the snapshot on disk, mutate, save (unless deferred)."""
+        with self._write_lock:
+            if self._deferred_depth:
+                yield
+                return
+            with self._file_lock():
+                self._maybe_reload()
+                yield
+                self._save()
+
+    @contextmanager
+    def deferred(self):
+        """
+        Batch writes into one snapshot save, e.g. for a rebuild:
+
+            with index.deferred():
+                for batch in batches:
+                    index.upsert(...)
+
+        The writer lock is held for the whole block, so other workers'
+        writes wait and then apply on top of the saved result.
+        """
+        with self._write_lock:
+            if self._deferred_depth:
+                self._deferred_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._deferred_depth -= 1
+                return
+            with self._file_lock():
+                self._maybe_reload()
+                self._deferred_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._deferred_depth -= 1
+                    self._save()
+
+    def persist(self):
+        """Write the snapshot now."""
+        with self._write_lock, self._file_lock():
+            self._save()
+
+    @staticmethod
+    def _signature(path: str) -> tuple:
+        # os.replace gives every snapshot a new inode, so this changes even
+        # when two saves land within the filesystem's mtime resolution
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp.npz"
+        with self._lock:
+            np.savez(
+                tmp,
+                ids=np.array(self.ids, dtype=object),
+                vectors=self.vectors[:self.n],
+                metadatas=np.array(self.metadatas, dtype=object),
+            )
+        os.replace(tmp, self.path)
+        self._snapshot_sig = self._signature(self.path)
+
+    def _load(self, path: str):
+        signature = self._signature(path)
+        data = np.load(path, allow_pickle=True)
+        ids = data["ids"].tolist()
+        vectors = data["vectors"]
+        metadatas = data["metadatas"].tolist()
+        with self._lock:
+            self._reset(vectors.shape[1] if vectors.size else None, max(1, len(ids)))
+            if ids:
+                self._upsert_rows(ids, self._normalize(vectors), metadatas)
+            self._snapshot_sig = signature
+        logger.info(f"Loaded numpy vector index: {len(ids)} items from {path}")
+
+    def _maybe_reload(self):
+        """Cheap stat() so other workers' writes become visible."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        if self._signature(self.path) != self._snapshot_sig:
+            self._load(self.path)
+
+    @classmethod
+    def from_collection(cls, collection, path: Optional[str] = None, page_size: int = 1000) -> "NumpyCollection":
+        """Hydrate from any Chroma-style collection (e.g. the persistent one)."""
+        index = cls(path=None)
+        offset = 0
+        while True:
+            page = collection.get(include=["embeddings", "metadatas"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if ids:
+                index.upsert(ids=ids, embeddings=page["embeddings"], metadatas=page["metadatas"])
+            if len(ids) < page_size:
+                break
+            offset += page_size
+        index.path = path
+        index.persist()
+        return index
+
+
+def _match_scalar(actual: Any, op: str, value: Any) -> bool:
+    if op == "$eq":
+        return actual == value
+    if op == "$ne":
+        return actual != value
+    if op == "$in":
+        return actual in value
+    if op == "$nin":
+        return actual not in value
+    if op == "$contains":
+        return value in _split(actual)
+    if actual is None:
+        return False
+    if op == "$gt":
+        return actual > value
+    if op == "$gte":
+        return actual >= value
+    if op == "$lt":
+        return actual < value
+    if op == "$lte":
+        return actual <= value
+    raise ValueError(f"Unsupported operator {op}")
@@ -1,11 +1,12 @@
 # app/ai/preference_extractor.py
 
 import re
-import json
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
 
-client = OpenAI()
+from app.ai.provider import get_provider
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 # Keyword mappings for preference extraction
@@ -51,6 +52,28 @@ CATEGORY_KEYWORDS = {
 }
 
 
+PERSONAL_CONTEXT_PROMPT = """Extract personal information from the user's message.
+Only extract clear, explicit information. Return JSON with these optional fields:
+- "name": user's name if mentioned (e.g., "my name is Spencer" -> "Spencer")
+
+Return empty {} if no personal information is found.
+Examples:
+"hi my name is spencer" -> {"name": "Spencer"}
+"I love chocolate" -> {}
+"call me John" -> {"name": "John"}"""
+
+
+def _personal_context_request(message: str) -> Dict[str, Any]:
+    return dict(
+        messages=[
+            {"role": "system", "content": PERSONAL_CONTEXT_PROMPT},
+            {"role": "user", "content": message},
+        ],
+        temperature=0.3,
+        max_tokens=50,
+    )
+
+
 def extract_personal_context(message: str) -> Dict[str, Any]:
     """
     Extract personal context from message using LLM (names, etc.)
@@ -62,55 +85,34 @@ def extract_personal_context(message: str) -> Dict[str, Any]:
         Dictionary with personal context like {"name": "Spencer"}
     """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """Extract personal information from the user's message.
-Only extract clear, explicit information. Return JSON with these optional fields:
-- "name": user's name if mentioned (e.g., "my name is Spencer" -> "Spencer")
-
-Return empty {} if no personal information is found.
-Examples:
-"hi my name is spencer" -> {"name": "Spencer"}
-"I love chocolate" -> {}
-"call me John" -> {"name": "John"}"""
-                },
-                {
-                    "role": "user",
-                    "content": message
-                }
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,
-            max_tokens=50,
-        )
-
-        result = json.loads(response.choices[0].message.content)
+        result = get_provider().chat_json(**_personal_context_request(message))
         # Only return if there's actual data
         return result if result else {}
     except Exception as e:
-        # Silently fail - personal context extraction is nice-to-have
+        # Personal context extraction is nice-to-have: log and carry on without it
+        logger.error(f"Personal context extraction failed: {e}")
         return {}
 
 
-def extract_preferences(message: str) -> Dict[str, List[str]]:
+async def extract_personal_context_async(message: str) -> Dict[str, Any]:
+    """Async variant of extract_personal_context."""
+    try:
+        result = await get_provider().chat_json_async(**_personal_context_request(message))
+        return result if result else {}
+    except Exception as e:
+        logger.error(f"Personal context extraction failed: {e}")
+        return {}
+
+
+def extract_keyword_preferences(message: str) -> Dict[str, List[str]]:
     """
-    Extract user preferences from a message using keyword matching.
+    Keyword-only part of extract_preferences (no LLM call).
 
     Args:
         message: User message text
 
     Returns:
-        Dictionary with extracted preferences:
-        {
-            "flavors": [...],
-            "dietary": [...],
-            "avoid": [...],
-            "categories": [...],
-            "name": "..." (optional)
-        }
+        Dictionary with flavors/dietary/avoid/categories lists (empty ones removed)
     """
     message_lower = message.lower()
     preferences = {
@@ -140,15 +142,47 @@ def extract_preferences(message: str) -> Dict[str, List[str]]:
         if any(keyword in message_lower for keyword in keywords):
             preferences["categories"].append(category)
 
+    # Remove empty lists
+    return {k: v for k, v in preferences.items() if v}
+
+
+def extract_preferences(message: str) -> Dict[str, List[str]]:
+    """
+    Extract user preferences from a message using keyword matching.
+
+    Args:
+        message: User message text
+
+    Returns:
+        Dictionary with extracted preferences:
+        {
+            "flavors": [...],
+            "dietary": [...],
+            "avoid": [...],
+            "categories": [...],
+            "name": "..." (optional)
+        }
+    """
+    preferences = extract_keyword_preferences(message)
+
     # Extract personal context (name, etc.) using LLM
     personal_context = extract_personal_context(message)
     if personal_context:
         preferences.update(personal_context)
 
-    # Remove empty lists (but keep string values like name)
-    preferences = {k: v for k, v in preferences.items() if v}
+    # Remove empty values (but keep string values like name)
+    return {k: v for k, v in preferences.items() if v}
+
+
+async def extract_preferences_async(message: str) -> Dict[str, Any]:
+    """Async variant of extract_preferences (LLM call is awaited)."""
+    preferences = extract_keyword_preferences(message)
+
+    personal_context = await extract_personal_context_async(message)
+    if personal_context:
+        preferences.update(personal_context)
 
-    return preferences
+    return {k: v for k, v in preferences.items() if v}
 
 
 def format_preferences_for_context(preferences: Dict[str, Any]) -> str:
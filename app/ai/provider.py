@@ -0,0 +1,292 @@
+# app/ai/provider.py
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# "openai" (default) or "fake" for a deterministic, offline stand-in
+AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").lower()
+
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
+EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+
+# Fake backend: vector size (matches text-embedding-3-small so an index
+# built with one backend still loads with the other) and simulated latency
+FAKE_EMBED_DIM = int(os.getenv("FAKE_EMBED_DIM", "1536"))
+FAKE_EMBED_LATENCY_MS = float(os.getenv("FAKE_EMBED_LATENCY_MS", "0"))
+FAKE_CHAT_LATENCY_MS = float(os.getenv("FAKE_CHAT_LATENCY_MS", "0"))
+FAKE_TOKEN_LATENCY_MS = float(os.getenv("FAKE_TOKEN_LATENCY_MS", "0"))
+
+Messages = List[Dict[str, Any]]
+
+
+# ------------------------------------------------------------------------------
+# OPENAI
+# ------------------------------------------------------------------------------
+class OpenAIProvider:
+    """
+    Embeddings, chat, JSON-mode chat and vision over the OpenAI API.
+
+    Clients are created on first use, so importing the AI modules never
+    needs an API key.
+    """
+
+    name = "openai"
+
+    def __init__(self, chat_model: str = CHAT_MODEL, embedding_model: str = EMBED_MODEL):
+        self.chat_model = chat_model
+        self.embedding_model = embedding_model
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI()
+        return self._async_client
+
+    # ---------------------------------------------------------------
+    # EMBEDDINGS
+    # ---------------------------------------------------------------
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        resp = self.client.embeddings.create(model=self.embedding_model, input=texts)
+        # The API returns one entry per input; sort by index to be safe
+        return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+
+    async def embed_async(self, texts: List[str]) -> List[List[float]]:
+        resp = await self.async_client.embeddings.create(model=self.embedding_model, input=texts)
+        return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+
+    # ---------------------------------------------------------------
+    # CHAT
+    # ---------------------------------------------------------------
+    def chat(self, messages: Messages, **params) -> str:
+        completion = self.client.chat.completions.create(
+            model=self.chat_model, messages=messages, **params
+        )
+        return completion.choices[0].message.content.strip()
+
+    async def chat_async(self, messages: Messages, **params) -> str:
+        completion = await self.async_client.chat.completions.create(
+            model=self.chat_model, messages=messages, **params
+        )
+        return completion.choices[0].message.content.strip()
+
+    async def chat_stream(self, messages: Messages, **params) -> AsyncIterator[str]:
+        stream = await self.async_client.chat.completions.create(
+            model=self.chat_model, messages=messages, stream=True, **params
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    def chat_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        completion = self.client.chat.completions.create(
+            model=self.chat_model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            **params,
+        )
+        return json.loads(completion.choices[0].message.content or "{}")
+
+    async def chat_json_async(self, messages: Messages, **params) -> Dict[str, Any]:
+        completion = await self.async_client.chat.completions.create(
+            model=self.chat_model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            **params,
+        )
+        return json.loads(completion.choices[0].message.content or "{}")
+
+    # ---------------------------------------------------------------
+    # VISION
+    # ---------------------------------------------------------------
+    def vision(self, prompt: str, image_url: str, **params) -> str:
+        return self.chat(
+            [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": image_url}},
+                ],
+            }],
+            **params,
+        )
+
+
+# ------------------------------------------------------------------------------
+# FAKE (offline, deterministic)
+# ------------------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _token_bucket(token: str, dim: int):
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if (value >> 63) & 1 else -1.0
+
+
+def hashed_bow_embedding(text: str, dim: int = FAKE_EMBED_DIM) -> List[float]:
+    """
+    Signed hashed bag-of-words vector, L2-normalized.
+
+    Texts that share words land close together under cosine/L2 distance,
+    which is enough for retrieval to return plausible neighbours.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        index, sign = _token_bucket(token, dim)
+        vector[index] += sign
+
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector.tolist()
+
+
+class FakeProvider:
+    """
+    Drop-in replacement for OpenAIProvider with no network.
+
+    - Embeddings: hashed bag-of-words (deterministic, FAKE_EMBED_DIM wide)
+    - Chat: a templated reply echoing the last user message
+    - JSON chat: `json_reply` (empty object by default)
+    - Vision: a canned pastry description
+
+    Every call sleeps for the configured latency (FAKE_*_LATENCY_MS) so
+    load tests see realistic concurrency without calling OpenAI.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        dim: int = FAKE_EMBED_DIM,
+        embed_latency_ms: float = FAKE_EMBED_LATENCY_MS,
+        chat_latency_ms: float = FAKE_CHAT_LATENCY_MS,
+        token_latency_ms: float = FAKE_TOKEN_LATENCY_MS,
+        reply_template: str = "Woof! Yorkie here. You asked about: {message}",
+        json_reply: Optional[Dict[str, Any]] = None,
+        vision_reply: str = "A golden, flaky, crescent-shaped pastry similar to a butter croissant.",
+    ):
+        self.dim = dim
+        self.embedding_model = f"fake-bow-{dim}"
+        self.chat_model = "fake-chat"
+        self.embed_latency = embed_latency_ms / 1000.0
+        self.chat_latency = chat_latency_ms / 1000.0
+        self.token_latency = token_latency_ms / 1000.0
+        self.reply_template = reply_template
+        self.json_reply = json_reply or {}
+        self.vision_reply = vision_reply
+
+    def _reply(self, messages: Messages) -> str:
+        message = ""
+        for msg in reversed(messages):
+            if msg.get("role") == "user" and isinstance(msg.get("content"), str):
+                message = msg["content"]
+                break
+        # Keep templated replies short even when the "message" is a full RAG prompt
+        return self.reply_template.format(message=" ".join(message.split())[:200])
+
+    # ---------------------------------------------------------------
+    # EMBEDDINGS
+    # ---------------------------------------------------------------
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if self.embed_latency:
+            time.sleep(self.embed_latency)
+        return [hashed_bow_embedding(text, self.dim) for text in texts]
+
+    async def embed_async(self, texts: List[str]) -> List[List[float]]:
+        if self.embed_latency:
+            await asyncio.sleep(self.embed_latency)
+        return [hashed_bow_embedding(text, self.dim) for text in texts]
+
+    # ---------------------------------------------------------------
+    # CHAT
+    # ---------------------------------------------------------------
+    def chat(self, messages: Messages, **params) -> str:
+        if self.chat_latency:
+            time.sleep(self.chat_latency)
+        return self._reply(messages)
+
+    async def chat_async(self, messages: Messages, **params) -> str:
+        if self.chat_latency:
+            await asyncio.sleep(self.chat_latency)
+        return self._reply(messages)
+
+    async def chat_stream(self, messages: Messages, **params) -> AsyncIterator[str]:
+        if self.chat_latency:
+            await asyncio.sleep(self.chat_latency)
+        words = self._reply(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield word if i == len(words) - 1 else word + " "
+
+    def chat_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        if self.chat_latency:
+            time.sleep(self.chat_latency)
+        return dict(self.json_reply)
+
+    async def chat_json_async(self, messages: Messages, **params) -> Dict[str, Any]:
+        if self.chat_latency:
+            await asyncio.sleep(self.chat_latency)
+        return dict(self.json_reply)
+
+    # ---------------------------------------------------------------
+    # VISION
+    # ---------------------------------------------------------------
+    def vision(self, prompt: str, image_url: str, **params) -> str:
+        if self.chat_latency:
+            time.sleep(self.chat_latency)
+        return self.vision_reply
+
+
+# ------------------------------------------------------------------------------
+# SELECTION
+# ------------------------------------------------------------------------------
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "fake": FakeProvider,
+}
+
+_provider = None
+
+
+def get_provider():
+    """Process-wide provider selected by AI_PROVIDER (created on first use)."""
+    global _provider
+    if _provider is None:
+        if AI_PROVIDER not in PROVIDERS:
+            raise ValueError(f"Unknown AI_PROVIDER '{AI_PROVIDER}' (expected one of {sorted(PROVIDERS)})")
+        _provider = PROVIDERS[AI_PROVIDER]()
+        logger.info(f"AI provider: {_provider.name}")
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the process-wide provider (benchmarks, tests). Returns the previous one."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
@@ -1,7 +1,8 @@
 # app/ai/rag.py
 
+import asyncio
 from typing import Dict, Any, Optional, List
-from app.ai.emb_model import embed_text
+from app.ai.emb_model import embed_text, embed_text_async
 from app.ai.vecstore import get_collection
 
 
@@ -49,17 +50,7 @@ def build_where(filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 # ---------------------------------------------------------------
 # MAIN RAG RETRIEVAL FUNCTION
 # ---------------------------------------------------------------
-def retrieve_with_filters(query: str, filters: dict = None, top_k: int = 5):
-    """
-    Vector retrieval with optional filters.
-    Returns: dict with ids, metadatas, distances
-    """
-
-    # Compute vector
-    embedding = embed_text(query)
-    if embedding is None:
-        return {"ids": [], "metadatas": [], "distances": []}
-
+def query_collection(embedding, filters: dict = None, top_k: int = 5):
     collection = get_collection()
     where = build_where(filters)
 
@@ -68,7 +59,7 @@ def retrieve_with_filters(query: str, filters: dict = None, top_k: int = 5):
         query_embeddings=[embedding],
         n_results=top_k,
         where=where,
-        include=["ids", "metadatas", "distances"],
+        include=["metadatas", "distances"],  # ids are always returned
     )
 
     # Guarantee consistent shape
@@ -76,4 +67,30 @@ def retrieve_with_filters(query: str, filters: dict = None, top_k: int = 5):
         "ids": results.get("ids", [[]])[0],
         "metadatas": results.get("metadatas", [[]])[0],
         "distances": results.get("distances", [[]])[0],
-    }
\ No newline at end of file
+    }
+
+
+def retrieve_with_filters(query: str, filters: dict = None, top_k: int = 5):
+    """
+    Vector retrieval with optional filters.
+    Returns: dict with ids, metadatas, distances
+    """
+
+    # Compute vector
+    embedding = embed_text(query)
+    if embedding is None:
+        return {"ids": [], "metadatas": [], "distances": []}
+
+    return query_collection(embedding, filters, top_k)
+
+
+async def retrieve_with_filters_async(query: str, filters: dict = None, top_k: int = 5):
+    """
+    Async variant: awaits the embedding call, then runs the (blocking)
+    vector query in a worker thread so the event loop stays free.
+    """
+    embedding = await embed_text_async(query)
+    if embedding is None:
+        return {"ids": [], "metadatas": [], "distances": []}
+
+    return await asyncio.to_thread(query_collection, embedding, filters, top_k)
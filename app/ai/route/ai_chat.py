@@ -1,22 +1,21 @@
 # app/ai/route/ai_chat.py
 
+import asyncio
+import json
+
+import anyio
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 
-from app.ai.rag import retrieve_with_filters
-from app.ai.chat_model import chat_response
+from app.ai.hybrid import hybrid_retrieve_async
+from app.ai.chat_model import chat_response_async, chat_response_stream
 from app.ai.vecstore import get_collection
-from app.ai.emb_model import embed_text
-from app.ai.session_manager import (
-    get_or_create_session,
-    add_message,
-    get_conversation_history,
-    update_preferences,
-    get_session_preferences,
-)
+from app.ai.emb_model import embed_text_async
+from app.ai.session_manager import ChatTurn, chat_turn_async
 from app.ai.preference_extractor import (
-    extract_preferences,
+    extract_preferences_async,
     format_preferences_for_context,
     merge_preferences,
 )
@@ -98,106 +97,210 @@ Reply as Yorkie:
 """.strip()
 
 
-@router.post("/chat")
-def chat(req: ChatRequest):
-    """
-    Chatbot RAG endpoint with session memory and preference tracking.
-    """
+YORKIE_SYSTEM_PROMPT = """You are Yorkie 🐶, the friendly pastry assistant for Yorkie Bakery.
 
-    # 1. Get or create session
-    session = get_or_create_session(session_id=req.session_id)
-    session_id = session.session_id
+Your personality:
+- Warm, helpful, and enthusiastic about pastries
+- Remember personal details users share (names, occasions, preferences)
+- Reference previous conversations naturally
+- Be conversational and genuine
 
-    # 2. Extract preferences from user message
-    new_prefs = extract_preferences(req.message)
-    if new_prefs:
-        update_preferences(session_id, new_prefs)
+Your responsibilities:
+- Help customers find the perfect pastries based on their preferences
+- Remember what they've viewed and discussed before
+- Suggest items that match their tastes and needs
+- Keep responses concise (2-3 sentences max)
 
-    # 3. Get current preferences
-    current_prefs = get_session_preferences(session_id)
+Important: Pay attention to the conversation history and user preferences provided. Use this context to give personalized, relevant recommendations."""
 
-    # 4. Get conversation history (increased from 10 to 20 for better context)
-    history = get_conversation_history(session_id, limit=20)
 
-    # 5. Retrieve menu items using RAG
+async def retrieve_for_chat(req: ChatRequest):
+    """RAG retrieval with the same safe fallback as /ai/demo. Returns (rag_results, items)."""
     try:
-        # Normal path — exact same rag.py behavior
-        rag_results = retrieve_with_filters(req.message, req.filters, top_k=req.top_k)
-        items = rag_results.get("metadatas", [])
+        # Normal path — vector + full-text fused (hybrid.py)
+        rag_results = await hybrid_retrieve_async(req.message, req.filters, top_k=req.top_k)
+        return rag_results, rag_results.get("metadatas", [])
     except Exception as e:
         logger.warning(f"RAG fallback - include issue: {e}")
 
-        # SAFE fallback (same as /ai/demo)
-        embedding = embed_text(req.message)
-        col = get_collection()
+    # SAFE fallback (same as /ai/demo)
+    embedding = await embed_text_async(req.message)
+    col = get_collection()
 
-        qr = col.query(
-            query_embeddings=[embedding],
-            n_results=req.top_k,
-            include=["metadatas", "distances"],  # SAFE
-        )
+    qr = await asyncio.to_thread(
+        col.query,
+        query_embeddings=[embedding],
+        n_results=req.top_k,
+        include=["metadatas", "distances"],  # SAFE
+    )
 
-        items = qr.get("metadatas", [[]])[0]
-        rag_results = {
-            "ids": [],
-            "metadatas": items,
-            "distances": qr.get("distances", [[]])[0]
-        }
+    items = qr.get("metadatas", [[]])[0]
+    rag_results = {
+        "ids": [],
+        "metadatas": items,
+        "distances": qr.get("distances", [[]])[0]
+    }
+    return rag_results, items
 
-    # 6. Track viewed items
-    item_titles = [item.get("title") for item in items if item.get("title")]
+
+def track_viewed_items(prefs: dict, item_titles: list) -> dict:
+    """Append newly shown titles to last_viewed (unique, last 10)."""
     if item_titles:
-        if "last_viewed" not in current_prefs:
-            current_prefs["last_viewed"] = []
-        # Keep only unique + last 10 items
+        if "last_viewed" not in prefs:
+            prefs["last_viewed"] = []
         for title in item_titles:
-            if title not in current_prefs["last_viewed"]:
-                current_prefs["last_viewed"].append(title)
-        current_prefs["last_viewed"] = current_prefs["last_viewed"][-10:]
-        update_preferences(session_id, current_prefs)
+            if title not in prefs["last_viewed"]:
+                prefs["last_viewed"].append(title)
+        prefs["last_viewed"] = prefs["last_viewed"][-10:]
+    return prefs
 
-    # 7. Convert items → text context
-    context = format_yorkie_context(items)
 
-    # 8. Format preferences for context
-    preferences_text = format_preferences_for_context(current_prefs)
+async def prepare_chat_turn(req: ChatRequest, turn) -> dict:
+    """
+    Everything before the final completion, shared by /chat and /chat/stream.
 
-    # 9. Create final Yorkie prompt
+    Independent upstream calls run concurrently:
+      - preference extraction (LLM personal-context call)
+      - conversation history (indexed range read)
+      - embedding + vector retrieval
+    """
+    # 2-4. Fan out the independent stages
+    # (history increased from 10 to 20 for better context)
+    new_prefs, history, (rag_results, items) = await asyncio.gather(
+        extract_preferences_async(req.message),
+        turn.history_async(20),
+        retrieve_for_chat(req),
+    )
+
+    # 5-6. Merge preferences in memory + track viewed items
+    if new_prefs:
+        turn.update_preferences(new_prefs)
+    item_titles = [item.get("title") for item in items if item.get("title")]
+    current_prefs = track_viewed_items(turn.preferences, item_titles)
+    turn.update_preferences(current_prefs)
+
+    # 7-9. Build the prompt
+    context = format_yorkie_context(items)
+    preferences_text = format_preferences_for_context(current_prefs)
     prompt = yorkie_prompt(req.message, context, preferences_text)
 
     # 10. Save user message to history
-    add_message(session_id, "user", req.message)
+    turn.add_message("user", req.message)
 
-    # 11. LLM response with conversation history
-    reply = chat_response(
-        system_prompt="""You are Yorkie 🐶, the friendly pastry assistant for Yorkie Bakery.
+    return {
+        "prompt": prompt,
+        "history": history,
+        "rag_results": rag_results,
+        "item_titles": item_titles,
+        "preferences": current_prefs,
+    }
 
-Your personality:
-- Warm, helpful, and enthusiastic about pastries
-- Remember personal details users share (names, occasions, preferences)
-- Reference previous conversations naturally
-- Be conversational and genuine
 
-Your responsibilities:
-- Help customers find the perfect pastries based on their preferences
-- Remember what they've viewed and discussed before
-- Suggest items that match their tastes and needs
-- Keep responses concise (2-3 sentences max)
+@router.post("/chat")
+async def chat(req: ChatRequest):
+    """
+    Chatbot RAG endpoint with session memory and preference tracking.
 
-Important: Pay attention to the conversation history and user preferences provided. Use this context to give personalized, relevant recommendations.""",
-        user_message=prompt,
-        conversation_history=history,
-    )
+    The session is read once and written once (see chat_turn_async).
+    Only the final completion waits on the concurrent stages in
+    prepare_chat_turn.
+    """
+
+    # 1. Load the session (one SELECT) — flushed once when the block exits
+    async with chat_turn_async(req.session_id) as turn:
+        session_id = turn.session_id
+        prepared = await prepare_chat_turn(req, turn)
+
+        # 11. LLM response with conversation history
+        reply = await chat_response_async(
+            system_prompt=YORKIE_SYSTEM_PROMPT,
+            user_message=prepared["prompt"],
+            conversation_history=prepared["history"],
+        )
 
-    # 12. Save AI response to history
-    add_message(session_id, "assistant", reply, metadata={
-        "items_shown": item_titles[:5],  # Top 5 items
-        "filters_used": req.filters,
-    })
+        # 12. Save AI response to history
+        turn.add_message("assistant", reply, metadata={
+            "items_shown": prepared["item_titles"][:5],  # Top 5 items
+            "filters_used": req.filters,
+        })
 
     return {
         "reply": reply,
-        "results": rag_results,
+        "results": prepared["rag_results"],
         "session_id": session_id,
-        "preferences": current_prefs,
-    }
\ No newline at end of file
+        "preferences": prepared["preferences"],
+    }
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """
+    Streaming variant of /ai/chat over Server-Sent Events.
+
+    Events, in order:
+      meta  → {"session_id", "results", "preferences"} as soon as retrieval is done
+      token → {"delta": "..."} for every completion chunk
+      done  → {"reply": "..."} with the full text
+      error → {"detail": "..."} if the turn can't be prepared or the
+              completion fails mid-stream
+
+    The turn (user message + whatever assistant text was produced) is
+    persisted once the stream closes, including on client disconnect.
+    """
+
+    async def events():
+        turn, prepared, parts = None, None, []
+        try:
+            # Headers are already sent: failures from here on become an error event
+            try:
+                turn = await ChatTurn.load_async(req.session_id)
+                prepared = await prepare_chat_turn(req, turn)
+            except Exception as e:
+                logger.error(f"Chat stream setup failed: {e}", exc_info=True)
+                if turn is not None:
+                    turn.add_message("user", req.message)
+                yield sse_event("error", {"detail": "Chat failed"})
+                return
+
+            yield sse_event("meta", {
+                "session_id": turn.session_id,
+                "results": prepared["rag_results"],
+                "preferences": prepared["preferences"],
+            })
+
+            try:
+                async for delta in chat_response_stream(
+                    system_prompt=YORKIE_SYSTEM_PROMPT,
+                    user_message=prepared["prompt"],
+                    conversation_history=prepared["history"],
+                ):
+                    parts.append(delta)
+                    yield sse_event("token", {"delta": delta})
+            except Exception as e:
+                logger.error(f"Chat stream failed: {e}", exc_info=True)
+                yield sse_event("error", {"detail": "Completion failed"})
+            else:
+                yield sse_event("done", {"reply": "".join(parts).strip()})
+        finally:
+            # Keep whatever was streamed, even if the client went away mid-reply
+            reply = "".join(parts).strip()
+            if reply:
+                turn.add_message("assistant", reply, metadata={
+                    "items_shown": prepared["item_titles"][:5],
+                    "filters_used": req.filters,
+                })
+            if turn is not None:
+                # Shielded so a disconnect-triggered cancel can't drop the write
+                with anyio.CancelScope(shield=True):
+                    await turn.flush_async()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
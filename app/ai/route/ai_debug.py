@@ -3,15 +3,14 @@ from typing import List, Dict, Optional
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from openai import OpenAI
 
 from app.ai.emb_model import embed_text
+from app.ai.emb_cache import get_embedding_cache
+from app.ai.provider import get_provider
 from app.ai.rag import get_collection
 
 router = APIRouter(prefix="/ai", tags=["AI Debug"])
 
-client = OpenAI()
-
 
 class EmbedTestRequest(BaseModel):
     text: str
@@ -73,6 +72,12 @@ def embed_test(request: EmbedTestRequest):
     )
 
 
+@router.get("/embed-cache/stats")
+def embed_cache_stats():
+    """Hit/miss counters for the embedding cache (memory + disk tiers)."""
+    return get_embedding_cache().stats()
+
+
 class ExplainItem(BaseModel):
     title: str
     origin: Optional[str]
@@ -133,21 +138,10 @@ def explain_recommendations(request: ExplainRequest):
         "Do not include anything else."
     )
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        response_format={"type": "json_object"},
-    )
-
-    content = completion.choices[0].message.content
-    try:
-        data = client._client._json_loads(content)  # if this doesn't work, use normal json.loads
-    except Exception:
-        import json
-        data = json.loads(content)
+    data = get_provider().chat_json([
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ])
 
     explanations = data.get("explanations", {})
 
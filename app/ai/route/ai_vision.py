@@ -6,15 +6,13 @@ from typing import List, Optional
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
 from pydantic import BaseModel
-from openai import OpenAI
 
 from app.ai.emb_model import embed_text
-from app.ai.rag import get_collection
+from app.ai.provider import get_provider
+from app.ai.hybrid import hybrid_retrieve
 
 router = APIRouter(prefix="/ai", tags=["AI Vision"])
 
-client = OpenAI()
-
 
 class VisionMatch(BaseModel):
     id: Optional[str]
@@ -25,7 +23,7 @@ class VisionMatch(BaseModel):
     tags: List[str]
     flavor_profiles: List[str]
     dietary_features: List[str]
-    distance: Optional[float]   # NEW
+    distance: Optional[float]   # None when only the full-text search matched
 
 
 class VisionResponse(BaseModel):
@@ -59,32 +57,21 @@ async def analyze_image(file: UploadFile = File(...)):
     # CALL VISION MODEL (YOUR ORIGINAL PROMPT — UNMODIFIED)
     # ---------------------------------------------------------------
     try:
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": (
-                                "You are Yorkie Bakery’s friendly vision assistant. "
-                                "Look at the image and describe what type of food it MOST resembles. "
-                                "You do NOT need to reject the image, even if it contains meat or is not a bakery item. "
-                                "Describe it in bakery terms (shape, color, filling, texture, size) and guess what pastry or dessert it is closest to. "
-                                "Examples: "
-                                "- If you see a pork bun, describe it as a soft steamed or baked bun similar to Japanese or Chinese bakery buns. "
-                                "- If you see a savory food, describe its closest pastry equivalent. "
-                                "- If you see fruit, describe the flavor profile. "
-
-                                "Never say “I can't assist.” "
-                                "Always give a helpful 1–2 sentence bakery-style interpretation."
-                            ),
-                        },
-                        {"type": "image_url", "image_url": {"url": data_url}},
-                    ],
-                }
-            ],
+        vision_text = get_provider().vision(
+            (
+                "You are Yorkie Bakery’s friendly vision assistant. "
+                "Look at the image and describe what type of food it MOST resembles. "
+                "You do NOT need to reject the image, even if it contains meat or is not a bakery item. "
+                "Describe it in bakery terms (shape, color, filling, texture, size) and guess what pastry or dessert it is closest to. "
+                "Examples: "
+                "- If you see a pork bun, describe it as a soft steamed or baked bun similar to Japanese or Chinese bakery buns. "
+                "- If you see a savory food, describe its closest pastry equivalent. "
+                "- If you see fruit, describe the flavor profile. "
+
+                "Never say “I can't assist.” "
+                "Always give a helpful 1–2 sentence bakery-style interpretation."
+            ),
+            data_url,
         )
     except Exception as e:
         raise HTTPException(
@@ -92,8 +79,6 @@ async def analyze_image(file: UploadFile = File(...)):
             detail=f"Vision model error: {e}",
         )
 
-    vision_text = completion.choices[0].message.content.strip()
-
     # ---------------------------------------------------------------
     # NORMALIZE VISION TEXT BEFORE EMBEDDING (Critical Fix)
     # ---------------------------------------------------------------
@@ -111,32 +96,25 @@ async def analyze_image(file: UploadFile = File(...)):
         )
 
     # ---------------------------------------------------------------
-    # VECTOR SEARCH (with distances!)
+    # HYBRID SEARCH (vector + full-text, fused by rank)
     # ---------------------------------------------------------------
-    collection = get_collection()
-    result = collection.query(
-        query_embeddings=[vec],
-        n_results=5,
-        include=["metadatas", "distances"],
-    )
-
-    metadatas = result["metadatas"][0]
-    ids = result["ids"][0]
-    distances = result["distances"][0]
+    # Titles named in the description ("croissant", "macarons") are
+    # ranked by the full-text leg instead of an ad-hoc distance boost
+    result = hybrid_retrieve(normalized, top_k=5, embedding=vec)
 
     matches: List[VisionMatch] = []
 
     # ---------------------------------------------------------------
     # BUILD RESULTS
     # ---------------------------------------------------------------
-    for i, meta in enumerate(metadatas):
+    for doc_id, meta, distance in zip(result["ids"], result["metadatas"], result["distances"]):
         tags = (meta.get("tags") or "").split(",") if meta.get("tags") else []
         flavors = (meta.get("flavor_profiles") or "").split(",") if meta.get("flavor_profiles") else []
         diet = (meta.get("dietary_features") or "").split(",") if meta.get("dietary_features") else []
 
         matches.append(
             VisionMatch(
-                id=ids[i],
+                id=doc_id,
                 title=meta.get("title", "Unknown"),
                 origin=meta.get("origin"),
                 category=meta.get("category"),
@@ -144,25 +122,10 @@ async def analyze_image(file: UploadFile = File(...)):
                 tags=[t for t in tags if t],
                 flavor_profiles=[f for f in flavors if f],
                 dietary_features=[d for d in diet if d],
-                distance=float(distances[i]),
+                distance=float(distance) if distance is not None else None,
             )
         )
 
-    # ---------------------------------------------------------------
-    # OPTIONAL: Boost exact keyword matches for accuracy
-    # ---------------------------------------------------------------
-    key_terms = normalized.split()
-
-    for m in matches:
-        title = m.title.lower()
-
-        # if the title contains any word from the description, boost it
-        if any(k in title for k in key_terms):
-            m.distance *= 0.5  # reduce distance → higher rank
-
-    # re-sort
-    matches = sorted(matches, key=lambda x: x.distance)
-
     return VisionResponse(
         vision_description=vision_text,
         matches=matches,
@@ -1,13 +1,24 @@
 # app/ai/run_embeddings.py
 
 import os
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
 from dotenv import load_dotenv
-from chromadb import PersistentClient
 from sqlmodel import Session, select
 
 from app.core.db import engine
+from app.core.logger import get_logger
 from app.models.postgres.menu import MenuItem
-from app.ai.emb_model import embed_text
+from app.ai.emb_model import embed_texts
+from app.ai.index_sync import Document, build_documents, get_indexed_hashes
+from app.ai.vecstore import CHROMA_PATH, get_collection, reset_collection
+
+logger = get_logger(__name__)
 
 
 # ------------------------------------------------------------------------------
@@ -18,103 +29,129 @@ ENV_PATH = os.path.join(BASE_DIR, ".env")
 
 if os.path.exists(ENV_PATH):
     load_dotenv(dotenv_path=ENV_PATH)
-    print(f"🔑 Loaded .env from: {ENV_PATH}")
+    logger.info(f"Loaded .env from: {ENV_PATH}")
 else:
-    print(f"⚠️ .env NOT FOUND at: {ENV_PATH}")
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-print("DEBUG OPENAI KEY:", OPENAI_API_KEY)
+    logger.info(f".env NOT FOUND at: {ENV_PATH}")
 
 
 # ------------------------------------------------------------------------------
-# CHROMA CONFIG
+# PIPELINE CONFIG
 # ------------------------------------------------------------------------------
-CHROMA_PATH = "app/ai/vector_store"
-COLLECTION_NAME = "menu_items"
+# Rows per pipeline batch (DB fetch → text → embed → collection.add)
+EMBED_PIPELINE_BATCH_SIZE = int(os.getenv("EMBED_PIPELINE_BATCH_SIZE", "128"))
 
+# Batches allowed to be embedding at once while the next ones are read
+EMBED_PIPELINE_IN_FLIGHT = int(os.getenv("EMBED_PIPELINE_IN_FLIGHT", "4"))
 
-def build_embeddings():
-    print("\n📦 Loading menu items from database...")
 
+# ------------------------------------------------------------------------------
+# STAGE 1 — STREAM MENU ITEMS FROM THE DB
+# ------------------------------------------------------------------------------
+def iter_menu_item_batches(batch_size: int) -> Iterator[List[MenuItem]]:
+    """Yield menu items in batches using a server-side cursor (yield_per)."""
     with Session(engine) as session:
-        items = session.exec(select(MenuItem)).all()
-
-    print(f"🔄 Processing {len(items)} items for vector embeddings...\n")
-
-    client = PersistentClient(path=CHROMA_PATH)
-
-    # Safely delete old collection
-    try:
-        client.delete_collection(COLLECTION_NAME)
-        print("🗑️ Old vector collection removed.")
-    except Exception as e:
-        print(f"ℹ️ No previous collection to remove: {e}")
-
-    # Create new collection
-    collection = client.get_or_create_collection(COLLECTION_NAME)
-
-    ids = []
-    vectors = []
-    metadatas = []
-
-    for item in items:
-
-        # -------------------------------
-        # BUILD RICH SEMANTIC TEXT
-        # -------------------------------
-        text_parts = [
-            item.title or "",
-            item.description or "",
-            " ".join(item.tags or []),
-            " ".join(item.flavor_profiles or []),
-            " ".join(item.dietary_features or []),
-            item.category or "",
-            item.origin or "",
-            f"price {item.price}" if item.price else "",
-        ]
-
-        # join and clean
-        combined_text = " ".join([p for p in text_parts if p]).lower().strip()
-
-        if not combined_text:
-            print(f"⚠️ Skipping item (empty text): {item.title}")
-            continue
+        result = session.exec(
+            select(MenuItem).execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions(batch_size):
+            yield list(partition)
 
-        # LOG DETAILS FOR DEBUG
-        print("--------------------------------------------------")
-        print(f"🍰 ITEM: {item.title}")
-        print(f"🔤 Text used for embedding:\n{combined_text}\n")
 
-        vector = embed_text(combined_text)
+# ------------------------------------------------------------------------------
+# STAGE 2 — EMBED A BATCH
+# ------------------------------------------------------------------------------
+def embed_documents(docs: List[Document]) -> Tuple[List[str], List[List[float]], List[Dict[str, Any]]]:
+    vectors = embed_texts([text for _, text, _ in docs])
 
+    ids, kept_vectors, metadatas = [], [], []
+    for (doc_id, _, metadata), vector in zip(docs, vectors):
         if vector is None:
-            print(f"⚠️ Skipping item (no vector): {item.title}")
+            logger.warning(f"Skipping item (no vector): {metadata.get('title')}")
             continue
+        ids.append(doc_id)
+        kept_vectors.append(vector)
+        metadatas.append(metadata)
+
+    return ids, kept_vectors, metadatas
 
-        ids.append(str(item.id))
-        vectors.append(vector)
-
-        metadatas.append({
-            "title": item.title,
-            "origin": item.origin or "",
-            "category": item.category or "",
-            "price": float(item.price) if item.price else None,
-            "tags": ",".join(item.tags or []),
-            "flavor_profiles": ",".join(item.flavor_profiles or []),
-            "dietary_features": ",".join(item.dietary_features or []),
-        })
-
-    # Add vectors to Chroma
-    collection.add(
-        ids=ids,
-        embeddings=vectors,
-        metadatas=metadatas
-    )
 
-    print("\n✅ Embeddings built successfully!")
-    print(f"📌 Total embedded items: {len(ids)}")
-    print(f"💾 Stored at: {CHROMA_PATH}\n")
+# ------------------------------------------------------------------------------
+# PIPELINE
+# ------------------------------------------------------------------------------
+def build_embeddings(
+    full: bool = False,
+    batch_size: int = EMBED_PIPELINE_BATCH_SIZE,
+    max_in_flight: int = EMBED_PIPELINE_IN_FLIGHT,
+) -> Dict[str, int]:
+    """
+    Sync the vector collection with the menu table as a streamed pipeline.
+
+    Incremental by default: every document carries a content hash in its
+    metadata, so only new/changed rows are re-embedded and upserted, and
+    ids that no longer exist in the DB are deleted. `full=True` drops the
+    collection and re-embeds everything.
+
+    While batch N is being embedded in the background, batch N+1 is read
+    from the DB and turned into documents; finished batches are written to
+    Chroma in order. Memory is bounded by `batch_size * max_in_flight`.
+    The numpy index saves its snapshot once, after the last write.
+    """
+    started = time.perf_counter()
+
+    if full:
+        collection = reset_collection()
+        indexed: Dict[str, Any] = {}
+        logger.info("Full rebuild: old vector collection removed.")
+    else:
+        collection = get_collection()
+        indexed = get_indexed_hashes(collection)
+
+    seen = set()
+    stats = {"items": 0, "unchanged": 0, "upserted": 0, "deleted": 0}
+    in_flight = deque()
+
+    def _drain_one():
+        ids, vectors, metadatas = in_flight.popleft().result()
+        if ids:
+            collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+            stats["upserted"] += len(ids)
+
+    deferred = getattr(collection, "deferred", nullcontext)
+    with deferred():
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+            for items in iter_menu_item_batches(batch_size):
+                stats["items"] += len(items)
+                changed = []
+                for doc in build_documents(items):
+                    seen.add(doc[0])
+                    if indexed.get(doc[0]) == doc[2]["content_hash"]:
+                        stats["unchanged"] += 1
+                    else:
+                        changed.append(doc)
+
+                if not changed:
+                    continue
+
+                in_flight.append(pool.submit(embed_documents, changed))
+                if len(in_flight) >= max_in_flight:
+                    _drain_one()
+
+            while in_flight:
+                _drain_one()
+
+        stale = [doc_id for doc_id in indexed if doc_id not in seen]
+        if stale:
+            collection.delete(ids=stale)
+            stats["deleted"] = len(stale)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Embeddings synced in {elapsed:.2f}s → {CHROMA_PATH}: "
+        f"{stats['items']} items, {stats['upserted']} upserted, "
+        f"{stats['unchanged']} unchanged, {stats['deleted']} deleted"
+    )
+    return stats
 
 
 if __name__ == "__main__":
-    build_embeddings()
\ No newline at end of file
+    build_embeddings(full="--full" in sys.argv)
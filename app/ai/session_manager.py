@@ -1,12 +1,17 @@
 # app/ai/session_manager.py
 
+import copy
+from contextlib import contextmanager, asynccontextmanager
 from sqlmodel import Session, select
+from sqlalchemy import update, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, Dict, List, Any
 from uuid import uuid4
 from datetime import datetime, timedelta
 
 from app.models.postgres.chat_session import ChatSession
-from app.core.db import engine
+from app.models.postgres.chat_message import ChatMessage
+from app.core.db import async_engine, engine
 
 
 def get_or_create_session(session_id: Optional[str] = None, user_id: Optional[str] = None) -> ChatSession:
@@ -30,7 +35,7 @@ def get_or_create_session(session_id: Optional[str] = None, user_id: Optional[st
                 # Check if expired
                 if chat_session.is_expired():
                     # Delete expired session and create new one
-                    db.delete(chat_session)
+                    _delete_sessions(db, [chat_session])
                     db.commit()
                     chat_session = None
                 else:
@@ -54,14 +59,37 @@ def get_or_create_session(session_id: Optional[str] = None, user_id: Optional[st
         return new_session
 
 
+def _delete_sessions(db: Session, chat_sessions: List[ChatSession]):
+    """Delete sessions together with their messages."""
+    session_ids = [cs.session_id for cs in chat_sessions]
+    if session_ids:
+        db.exec(delete(ChatMessage).where(ChatMessage.session_id.in_(session_ids)))
+    for chat_session in chat_sessions:
+        db.delete(chat_session)
+
+
+def _read_messages(db: Session, session_id: str, limit: int) -> List[Dict[str, Any]]:
+    """Range-read the newest `limit` messages via the (session_id, seq) index."""
+    rows = db.exec(
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.seq.desc())
+        .limit(limit)
+    ).all()
+    return [m.to_dict() for m in reversed(rows)]
+
+
 def add_message(
     session_id: str,
     role: str,
     content: str,
     metadata: Optional[Dict[str, Any]] = None
-) -> ChatSession:
+) -> ChatMessage:
     """
-    Add a message to the conversation history.
+    Append a message to the conversation history.
+
+    O(1): bumps chat_session.message_count (UPDATE ... RETURNING) and
+    inserts one chat_message row — no history rewrite.
 
     Args:
         session_id: The session ID
@@ -70,20 +98,31 @@ def add_message(
         metadata: Optional metadata (e.g., items_shown, filters_used)
 
     Returns:
-        Updated ChatSession object
+        The new ChatMessage
     """
-    with Session(engine) as db:
-        statement = select(ChatSession).where(ChatSession.session_id == session_id)
-        chat_session = db.exec(statement).first()
-
-        if not chat_session:
+    with Session(engine, expire_on_commit=False) as db:
+        now = datetime.utcnow()
+        seq = db.exec(
+            update(ChatSession)
+            .where(ChatSession.session_id == session_id)
+            .values(message_count=ChatSession.message_count + 1, last_message_at=now)
+            .returning(ChatSession.message_count)
+        ).scalar_one_or_none()
+
+        if seq is None:
             raise ValueError(f"Session {session_id} not found")
 
-        chat_session.add_message(role, content, metadata)
-        db.add(chat_session)
+        message = ChatMessage(
+            session_id=session_id,
+            seq=seq,
+            role=role,
+            content=content,
+            meta=metadata,
+            created_at=now,
+        )
+        db.add(message)
         db.commit()
-        db.refresh(chat_session)
-        return chat_session
+        return message
 
 
 def get_conversation_history(session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -95,16 +134,10 @@ def get_conversation_history(session_id: str, limit: int = 10) -> List[Dict[str,
         limit: Number of recent messages to return
 
     Returns:
-        List of message dictionaries
+        List of message dictionaries (oldest first)
     """
     with Session(engine) as db:
-        statement = select(ChatSession).where(ChatSession.session_id == session_id)
-        chat_session = db.exec(statement).first()
-
-        if not chat_session:
-            return []
-
-        return chat_session.get_recent_messages(limit)
+        return _read_messages(db, session_id, limit)
 
 
 def update_preferences(session_id: str, new_preferences: Dict[str, Any]) -> ChatSession:
@@ -164,8 +197,230 @@ def cleanup_expired_sessions() -> int:
         expired_sessions = db.exec(statement).all()
 
         count = len(expired_sessions)
-        for session in expired_sessions:
-            db.delete(session)
+        _delete_sessions(db, expired_sessions)
 
         db.commit()
         return count
+
+
+# ---------------------------------------------------------------
+# UNIT OF WORK: one read + one write per chat turn
+# ---------------------------------------------------------------
+def _apply_preference_changes(
+    stored: Optional[Dict[str, Any]],
+    loaded: Dict[str, Any],
+    current: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Re-apply one turn's preference edits (loaded → current) on top of the
+    row as it is now. Only keys the turn changed are written; for lists,
+    the items the turn added or removed are applied, so concurrent turns
+    on the same session don't drop each other's additions.
+    """
+    merged = copy.deepcopy(stored or {})
+    for key, value in current.items():
+        before = loaded.get(key)
+        if before == value:
+            continue
+        now = merged.get(key)
+        if isinstance(value, list) and isinstance(now, list):
+            before = before if isinstance(before, list) else []
+            removed = [v for v in before if v not in value]
+            added = [v for v in value if v not in before]
+            merged[key] = [v for v in now if v not in removed] + [v for v in added if v not in now]
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class ChatTurn:
+    """
+    In-memory view of a chat session for the duration of one turn.
+
+    `load()` does a single SELECT of the session row (the expired-session
+    cleanup is the only extra work, and it is rare); history is range-read
+    from chat_message on first use. Preference merges go through the
+    model's own method, new messages are buffered, and `flush()` writes
+    everything in one transaction: the session INSERT/UPDATE plus one
+    multi-row INSERT of the new messages.
+
+    Other turns on the same session may flush in between, so `flush()`
+    re-reads the stored preferences under a row lock and applies only
+    this turn's changes, and message seqs are allocated by the UPDATE.
+    """
+
+    def __init__(self, chat_session: ChatSession, is_new: bool):
+        self._chat_session = chat_session
+        self._loaded_preferences = copy.deepcopy(chat_session.preferences or {})
+        self._history: Optional[List[Dict[str, Any]]] = [] if is_new else None
+        self._history_limit = 0
+        self._new_messages: List[ChatMessage] = []
+        self.is_new = is_new
+        self.dirty = is_new
+
+    @classmethod
+    def load(cls, session_id: Optional[str] = None, user_id: Optional[str] = None) -> "ChatTurn":
+        with Session(engine) as db:
+            return cls._load(db, session_id, user_id)
+
+    @classmethod
+    async def load_async(cls, session_id: Optional[str] = None, user_id: Optional[str] = None) -> "ChatTurn":
+        async with AsyncSession(async_engine) as db:
+            return await db.run_sync(cls._load, session_id, user_id)
+
+    @classmethod
+    def _load(cls, db: Session, session_id: Optional[str], user_id: Optional[str]) -> "ChatTurn":
+        if session_id:
+            chat_session = db.exec(
+                select(ChatSession).where(ChatSession.session_id == session_id)
+            ).first()
+
+            if chat_session and chat_session.is_expired():
+                # Delete expired session and start over with the same id
+                _delete_sessions(db, [chat_session])
+                db.commit()
+            elif chat_session:
+                db.expunge(chat_session)
+                # Copy the JSON column so in-place edits never alias loaded state
+                chat_session.preferences = dict(chat_session.preferences or {})
+                return cls(chat_session, is_new=False)
+
+        new_session = ChatSession(
+            session_id=session_id or str(uuid4()),
+            user_id=user_id,
+            conversation_history=[],
+            message_count=0,
+            preferences={},
+        )
+        return cls(new_session, is_new=True)
+
+    @property
+    def session_id(self) -> str:
+        return self._chat_session.session_id
+
+    @property
+    def preferences(self) -> Dict[str, Any]:
+        return self._chat_session.preferences or {}
+
+    def _needs_history(self, limit: int) -> bool:
+        return self._history is None or self._history_limit < limit
+
+    def _recent(self, limit: int) -> List[Dict[str, Any]]:
+        messages = self._history + [m.to_dict() for m in self._new_messages]
+        return messages[-limit:]
+
+    def history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        if self._needs_history(limit):
+            with Session(engine) as db:
+                self._history = _read_messages(db, self.session_id, limit)
+            self._history_limit = limit
+        return self._recent(limit)
+
+    async def history_async(self, limit: int = 10) -> List[Dict[str, Any]]:
+        if self._needs_history(limit):
+            async with AsyncSession(async_engine) as db:
+                self._history = await db.run_sync(_read_messages, self.session_id, limit)
+            self._history_limit = limit
+        return self._recent(limit)
+
+    def add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+        chat_session = self._chat_session
+        chat_session.message_count = (chat_session.message_count or 0) + 1
+        chat_session.last_message_at = datetime.utcnow()
+        self._new_messages.append(ChatMessage(
+            session_id=chat_session.session_id,
+            seq=chat_session.message_count,
+            role=role,
+            content=content,
+            meta=metadata,
+            created_at=chat_session.last_message_at,
+        ))
+        self.dirty = True
+
+    def update_preferences(self, new_preferences: Dict[str, Any]):
+        self._chat_session.update_preferences(new_preferences)
+        self.dirty = True
+
+    def flush(self):
+        """Persist the turn in one transaction (and extend expiry)."""
+        with Session(engine, expire_on_commit=False) as db:
+            self._flush(db)
+        self._flushed()
+
+    async def flush_async(self):
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            await db.run_sync(self._flush)
+        self._flushed()
+
+    def _flush(self, db: Session):
+        chat_session = self._chat_session
+        chat_session.expires_at = datetime.utcnow() + timedelta(hours=24)
+
+        if self.is_new:
+            db.add(chat_session)
+        else:
+            values = {"expires_at": chat_session.expires_at}
+            if self.dirty:
+                values["last_message_at"] = chat_session.last_message_at
+                if chat_session.preferences != self._loaded_preferences:
+                    stored = db.exec(
+                        select(ChatSession.preferences)
+                        .where(ChatSession.id == chat_session.id)
+                        .with_for_update()
+                    ).first()
+                    chat_session.preferences = _apply_preference_changes(
+                        stored, self._loaded_preferences, chat_session.preferences
+                    )
+                    values["preferences"] = chat_session.preferences
+
+            statement = update(ChatSession).where(ChatSession.id == chat_session.id).values(**values)
+            if self._new_messages:
+                # Take the next seqs from the row itself, not the count read at load
+                added = len(self._new_messages)
+                count = db.exec(
+                    statement
+                    .values(message_count=ChatSession.message_count + added)
+                    .returning(ChatSession.message_count)
+                ).scalar_one()
+                for seq, message in enumerate(self._new_messages, start=count - added + 1):
+                    message.seq = seq
+                chat_session.message_count = count
+            else:
+                db.exec(statement)
+
+        db.add_all(self._new_messages)
+        db.commit()
+
+        if self.is_new:
+            db.expunge(chat_session)
+        for message in self._new_messages:
+            db.expunge(message)
+
+    def _flushed(self):
+        self._loaded_preferences = copy.deepcopy(self._chat_session.preferences or {})
+        if self._history is not None:
+            self._history.extend(m.to_dict() for m in self._new_messages)
+        self._new_messages = []
+        self.is_new = False
+        self.dirty = False
+
+
+@contextmanager
+def chat_turn(session_id: Optional[str] = None, user_id: Optional[str] = None):
+    """
+    with chat_turn(session_id) as turn:
+        turn.update_preferences(...)
+        turn.add_message("user", ...)
+    # → flushed once here (skipped if the block raises)
+    """
+    turn = ChatTurn.load(session_id, user_id)
+    yield turn
+    turn.flush()
+
+
+@asynccontextmanager
+async def chat_turn_async(session_id: Optional[str] = None, user_id: Optional[str] = None):
+    """Async chat_turn on the async engine (no worker threads)."""
+    turn = await ChatTurn.load_async(session_id, user_id)
+    yield turn
+    await turn.flush_async()
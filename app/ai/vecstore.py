@@ -9,6 +9,10 @@ from chromadb.config import Settings
 
 CHROMA_PATH = os.getenv("CHROMA_PATH", "app/ai/vector_store")
 
+# "chroma" (default) or "numpy" (in-memory matrix index, see numpy_index.py)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+NUMPY_INDEX_PATH = os.getenv("NUMPY_INDEX_PATH", os.path.join(CHROMA_PATH, "menu_items.npz"))
+
 _client = chromadb.PersistentClient(
     path=CHROMA_PATH,
     settings=Settings(
@@ -17,9 +21,53 @@ _client = chromadb.PersistentClient(
     )
 )
 
-def get_collection():
+COLLECTION_NAME = "menu_items"
+
+_numpy_collection = None
+
+
+def get_chroma_collection():
     return _client.get_or_create_collection(
-        name="menu_items",
+        name=COLLECTION_NAME,
         metadata={"hnsw:space": "cosine"},
         embedding_function=None,
-    )
\ No newline at end of file
+    )
+
+
+def _get_numpy_collection():
+    global _numpy_collection
+    if _numpy_collection is None:
+        from app.ai.numpy_index import NumpyCollection
+
+        if os.path.exists(NUMPY_INDEX_PATH):
+            _numpy_collection = NumpyCollection(path=NUMPY_INDEX_PATH)
+        else:
+            # First start: hydrate from the persistent Chroma collection
+            _numpy_collection = NumpyCollection.from_collection(
+                get_chroma_collection(), path=NUMPY_INDEX_PATH
+            )
+    return _numpy_collection
+
+
+def get_collection():
+    if VECTOR_BACKEND == "numpy":
+        return _get_numpy_collection()
+    return get_chroma_collection()
+
+
+def reset_collection():
+    """Drop and recreate the menu collection (full rebuilds only)."""
+    global _numpy_collection
+    if VECTOR_BACKEND == "numpy":
+        from app.ai.numpy_index import NumpyCollection
+
+        if os.path.exists(NUMPY_INDEX_PATH):
+            os.remove(NUMPY_INDEX_PATH)
+        _numpy_collection = NumpyCollection(path=NUMPY_INDEX_PATH)
+        return _numpy_collection
+
+    try:
+        _client.delete_collection(COLLECTION_NAME)
+    except Exception:
+        pass
+    return get_chroma_collection()
@@ -1,6 +1,14 @@
 # app/core/db.py
+import json
 import os
+import sqlite3
+
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
 from app.core.logger import get_logger
 
@@ -16,12 +24,54 @@ if not DATABASE_URL:
 
 logger.info(f"Using DATABASE_URL: {DATABASE_URL}")
 
+# Async drivers for the same database (see async_database_url)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """
+    DATABASE_URL with its async driver: postgresql(+psycopg2) → +asyncpg,
+    sqlite → +aiosqlite. asyncpg spells libpq's `sslmode` as `ssl`.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    parsed = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    if backend == "postgresql" and "sslmode" in parsed.query:
+        parsed = parsed.update_query_dict({"ssl": parsed.query["sslmode"]}).difference_update_query(["sslmode"])
+    return parsed.render_as_string(hide_password=False)
+
+
+# Override when the async driver needs different connection settings
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+
+def enable_sqlite_arrays():
+    """
+    Let SQLite (tests/dev/benchmarks) store the Postgres ARRAY columns.
+
+    They are declared as JSONARRAY and kept as JSON text; the converter
+    decodes them back to lists for connections opened with
+    detect_types=PARSE_DECLTYPES. Postgres-only array operators still
+    need Postgres.
+    """
+    compiles(ARRAY, "sqlite")(lambda type_, compiler, **kw: "JSONARRAY")
+    sqlite3.register_adapter(list, json.dumps)
+    sqlite3.register_converter("JSONARRAY", json.loads)
+
+
 if DATABASE_URL.startswith("sqlite"):
+    enable_sqlite_arrays()
     # SQLite (tests/dev) doesn't support the pooling args above
     engine = create_engine(
         DATABASE_URL,
         echo=False,
-        connect_args={"check_same_thread": False},
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+    )
+    # Note: an in-memory URL gives the async engine its own, separate database
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
     )
 else:
     engine = create_engine(
@@ -33,7 +83,28 @@ else:
         pool_recycle=1800,
         pool_pre_ping=True,
     )
+    # Separate pool: async handlers don't compete with the threadpool for slots
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    )
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    AsyncSession for `async def` handlers (asyncpg / aiosqlite).
+
+    Objects aren't expired on commit: lazy reloads would need I/O outside
+    an await. Reuse sync helpers with `await session.run_sync(fn, ...)`.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
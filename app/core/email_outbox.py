@@ -0,0 +1,272 @@
+# app/core/email_outbox.py
+
+import heapq
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Set EMAIL_OUTBOX=false to send inline (the request waits on SES)
+EMAIL_OUTBOX = os.getenv("EMAIL_OUTBOX", "true").lower() in ("1", "true", "yes")
+
+# Worker threads draining the outbox = max SES calls in flight
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "4"))
+
+# Attempts per message before it is dropped (logged as an error)
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+
+# First retry delay; doubles per attempt (with jitter), capped at EMAIL_RETRY_MAX_SECONDS
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "1.0"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "60"))
+
+# Account-wide SES send rate (messages/second, SES sandbox default 14); 0 = unlimited
+EMAIL_MAX_SEND_RATE = float(os.getenv("EMAIL_MAX_SEND_RATE", "14"))
+
+# SES error codes worth retrying; anything else (MessageRejected, ...) is permanent
+RETRYABLE_ERROR_CODES = {
+    "Throttling", "ThrottlingException", "TooManyRequestsException",
+    "ServiceUnavailable", "InternalFailure", "RequestTimeout",
+}
+
+
+def error_code(error: Exception) -> Optional[str]:
+    """SES error code of a botocore ClientError (None for anything else)."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+def is_retryable(error: Exception) -> bool:
+    """botocore ClientErrors are retried only for throttling/5xx codes; other errors (network) always."""
+    code = error_code(error)
+    return code is None or code in RETRYABLE_ERROR_CODES
+
+
+# ---------------------------------------------
+# LOCAL SES: offline stand-in for benchmarks / dev
+# ---------------------------------------------
+def ses_error(code: str, message: str = "") -> Exception:
+    """An exception shaped like botocore's ClientError (what is_retryable inspects)."""
+    error = RuntimeError(message or code)
+    error.response = {"Error": {"Code": code, "Message": message}}
+    return error
+
+
+class LocalSES:
+    """
+    Accepts the SES calls the app makes (send_email, templates,
+    send_bulk_templated_email) without the network: sleeps `latency_ms`
+    per call (like a real SES round trip) and keeps what was sent, bulk
+    destinations rendered one message each. `fail_every=n` throttles
+    every n-th call to exercise retries.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, fail_every: int = 0):
+        self.latency_ms = latency_ms
+        self.fail_every = fail_every
+        self.sent: List[Dict[str, Any]] = []
+        self.templates: Dict[str, Dict[str, str]] = {}
+        self._calls = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _call(self):
+        call = next(self._calls)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.fail_every and call % self.fail_every == 0:
+            raise ses_error("Throttling", "Maximum sending rate exceeded.")
+
+    def send_email(self, **message) -> Dict[str, str]:
+        self._call()
+        with self._lock:
+            self.sent.append(message)
+        return {"MessageId": str(uuid.uuid4())}
+
+    def create_template(self, Template: Dict[str, str]):
+        if Template["TemplateName"] in self.templates:
+            raise ses_error("AlreadyExists", f"Template {Template['TemplateName']} already exists.")
+        self.templates[Template["TemplateName"]] = Template
+
+    def update_template(self, Template: Dict[str, str]):
+        if Template["TemplateName"] not in self.templates:
+            raise ses_error("TemplateDoesNotExist", f"Template {Template['TemplateName']} does not exist.")
+        self.templates[Template["TemplateName"]] = Template
+
+    def send_bulk_templated_email(self, **request) -> Dict[str, list]:
+        self._call()
+        template = self.templates.get(request["Template"])
+        if template is None:
+            raise ses_error("TemplateDoesNotExist", f"Template {request['Template']} does not exist.")
+        defaults = json.loads(request.get("DefaultTemplateData") or "{}")
+
+        statuses = []
+        for destination in request["Destinations"]:
+            data = {**defaults, **json.loads(destination.get("ReplacementTemplateData") or "{}")}
+            with self._lock:
+                self.sent.append({
+                    "Source": request["Source"],
+                    "Destination": destination["Destination"],
+                    "Message": {
+                        "Subject": {"Data": _render(template["SubjectPart"], data)},
+                        "Body": {"Text": {"Data": _render(template["TextPart"], data)}},
+                    },
+                })
+            statuses.append({"Status": "Success", "MessageId": str(uuid.uuid4())})
+        return {"Status": statuses}
+
+
+def _render(part: str, data: Dict[str, Any]) -> str:
+    """Enough of SES's Handlebars for LocalSES: {{name}} / {{{name}}} substitution."""
+    return re.sub(r"\{\{\{?\s*(\w+)\s*\}?\}\}", lambda m: str(data.get(m.group(1), "")), part)
+
+
+# ---------------------------------------------
+# OUTBOX
+# ---------------------------------------------
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all workers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class EmailOutbox:
+    """
+    In-process outbound email queue.
+
+    Request handlers enqueue an SES send_email payload and return; a pool
+    of daemon threads (started on first use) delivers it through `send`.
+    Transient failures are retried with exponential backoff and jitter
+    without holding a worker; at most `workers` sends are in flight and
+    they are paced to `max_rate` per second.
+
+    The queue lives in memory only. main.py drains it on shutdown
+    (EMAIL_DRAIN_SECONDS), so a clean stop or redeploy delivers what was
+    queued. If the process dies without running shutdown (crash, OOM kill,
+    SIGKILL, or a drain that times out), every message not yet sent is
+    lost. That includes messages waiting on a retry, which can sit for up
+    to EMAIL_RETRY_MAX_SECONDS per attempt. Set EMAIL_OUTBOX=false to send
+    inline from the request instead, trading latency for delivery before
+    the response.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Any],
+        workers: int = EMAIL_WORKERS,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        retry_base: float = EMAIL_RETRY_BASE_SECONDS,
+        retry_max: float = EMAIL_RETRY_MAX_SECONDS,
+        max_rate: float = EMAIL_MAX_SEND_RATE,
+    ):
+        self.send = send
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._limiter = RateLimiter(max_rate)
+        # (ready_at, seq, attempt, message); retries sit here until ready_at
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self.stats = {"queued": 0, "sent": 0, "retried": 0, "failed": 0}
+
+    def enqueue(self, message: Dict[str, Any]):
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic(), next(self._seq), 1, message))
+            self.stats["queued"] += 1
+            self._ensure_workers()
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._heap) + self._in_flight
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message is sent or dropped. False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._heap or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for i in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._heap:
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, _, attempt, message = heapq.heappop(self._heap)
+                        self._in_flight += 1
+                        return attempt, message
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def _run(self):
+        while True:
+            attempt, message = self._next_job()
+            try:
+                self._deliver(attempt, message)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _deliver(self, attempt: int, message: Dict[str, Any]):
+        to = ", ".join(message.get("Destination", {}).get("ToAddresses", []))
+        self._limiter.wait()
+        try:
+            self.send(message)
+        except Exception as e:
+            if attempt >= self.max_attempts or not is_retryable(e):
+                self._count("failed")
+                logger.error(f"Email to {to} dropped after {attempt} attempt(s): {e}")
+                return
+            delay = min(self.retry_max, self.retry_base * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning(f"Email to {to} failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+            with self._cond:
+                self.stats["retried"] += 1
+                heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), attempt + 1, message))
+                self._cond.notify()
+            return
+        self._count("sent")
+
+    def _count(self, key: str):
+        with self._cond:
+            self.stats[key] += 1
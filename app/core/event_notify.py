@@ -0,0 +1,172 @@
+# app/core/event_notify.py
+
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core import send_email
+from app.core.email_outbox import (
+    EMAIL_MAX_ATTEMPTS, EMAIL_RETRY_BASE_SECONDS, EMAIL_RETRY_MAX_SECONDS, error_code, is_retryable,
+)
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Recipients per send_bulk_templated_email call (SES allows at most 50)
+EVENT_NOTIFY_CHUNK_SIZE = min(
+    int(os.getenv("EVENT_NOTIFY_CHUNK_SIZE", "50")), send_email.SES_BULK_MAX_DESTINATIONS,
+)
+
+# Bulk calls in flight per job
+EVENT_NOTIFY_PARALLEL = int(os.getenv("EVENT_NOTIFY_PARALLEL", "4"))
+
+# Finished jobs kept for status polling (oldest dropped first)
+EVENT_NOTIFY_KEEP_JOBS = int(os.getenv("EVENT_NOTIFY_KEEP_JOBS", "200"))
+
+# Per-recipient bulk statuses worth another attempt; the rest (Failed,
+# MessageRejected, ...) are permanent for that destination
+RETRYABLE_STATUSES = {"TransientFailure", "AccountThrottled"}
+
+Recipient = Tuple[str, Optional[str]]
+
+
+# ---------------------------------------------
+# JOB: progress of one event's notice fan-out
+# ---------------------------------------------
+class NotifyJob:
+    def __init__(self, event_id, event_title: str, message: str, recipients: List[Recipient]):
+        self.id = uuid.uuid4().hex
+        self.event_id = str(event_id)
+        self.event_title = event_title
+        self.message = message
+        self.recipients = recipients
+        self.status = "queued"
+        self.sent = 0
+        self.failed = 0
+        self.chunks_done = 0
+        self.errors: Dict[str, int] = {}
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return len(self.recipients)
+
+    @property
+    def chunks(self) -> List[List[Recipient]]:
+        size = EVENT_NOTIFY_CHUNK_SIZE
+        return [self.recipients[i:i + size] for i in range(0, self.total, size)]
+
+    def record(self, sent: int, failures: List[str]):
+        with self._lock:
+            self.sent += sent
+            self.failed += len(failures)
+            self.chunks_done += 1
+            for reason in failures:
+                self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "event_id": self.event_id,
+                "status": self.status,
+                "total": self.total,
+                "sent": self.sent,
+                "failed": self.failed,
+                "progress": round((self.sent + self.failed) / self.total, 3) if self.total else 1.0,
+                "chunks": len(self.chunks),
+                "chunks_done": self.chunks_done,
+                "errors": dict(self.errors),
+                "created_at": self.created_at.isoformat(),
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            }
+
+
+# ---------------------------------------------
+# FAN-OUT: parallel bulk templated sends
+# ---------------------------------------------
+def send_chunk(job: NotifyJob, chunk: List[Recipient], max_attempts: int = EMAIL_MAX_ATTEMPTS):
+    """
+    One bulk call for the chunk; recipients SES reports as transient
+    failures, and the whole call on throttling/5xx, are retried with
+    exponential backoff up to max_attempts.
+    """
+    pending, sent, failures = list(chunk), 0, []
+    for attempt in range(1, max_attempts + 1):
+        try:
+            results = send_email.send_event_notice_batch(pending, job.event_title, job.message)
+        except Exception as e:
+            if attempt == max_attempts or not is_retryable(e):
+                logger.error(f"Notify job {job.id}: bulk send of {len(pending)} failed: {e}")
+                failures += [error_code(e) or type(e).__name__] * len(pending)
+                break
+            retry = pending
+        else:
+            retry = []
+            for recipient, status in zip(pending, results):
+                if status is None:
+                    sent += 1
+                elif status in RETRYABLE_STATUSES and attempt < max_attempts:
+                    retry.append(recipient)
+                else:
+                    failures.append(status)
+        pending = retry
+        if not pending:
+            break
+        delay = min(EMAIL_RETRY_MAX_SECONDS, EMAIL_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        time.sleep(delay * random.uniform(0.5, 1.0))
+    job.record(sent, failures)
+
+
+def run_job(job: NotifyJob, parallel: int = EVENT_NOTIFY_PARALLEL):
+    job.status = "running"
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel), thread_name_prefix=f"notify-{job.id[:8]}") as pool:
+            list(pool.map(lambda chunk: send_chunk(job, chunk), job.chunks))
+        job.status = "done"
+    except Exception as e:
+        logger.error(f"Notify job {job.id} failed: {e}", exc_info=True)
+        job.status = "failed"
+    job.finished_at = datetime.utcnow()
+    logger.info(
+        f"Notify job {job.id} ({job.event_title}): {job.sent}/{job.total} sent, "
+        f"{job.failed} failed in {len(job.chunks)} bulk calls"
+    )
+
+
+class NotifyJobs:
+    """Process-local registry of fan-out jobs; each runs on its own daemon thread."""
+
+    def __init__(self, keep: int = EVENT_NOTIFY_KEEP_JOBS):
+        self.keep = keep
+        self._jobs: "OrderedDict[str, NotifyJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, event_id, event_title: str, message: str, recipients: List[Recipient]) -> NotifyJob:
+        # One notice per address, whichever RSVP name comes first
+        unique: Dict[str, Recipient] = {}
+        for email, name in recipients:
+            unique.setdefault(email.strip().lower(), (email.strip(), name))
+        job = NotifyJob(event_id, event_title, message, list(unique.values()))
+
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.keep:
+                self._jobs.popitem(last=False)
+        threading.Thread(target=run_job, args=(job,), name=f"notify-job-{job.id[:8]}", daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[NotifyJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+notify_jobs = NotifyJobs()
@@ -0,0 +1,124 @@
+# app/core/featured.py
+
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import select
+
+from app.core.logger import get_logger
+from app.core.menu_catalog import menu_catalog
+from app.core.rating_stats import get_rating_stats
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.music import MusicTrack
+
+logger = get_logger(__name__)
+
+# Seconds a loaded pool is served before it is re-read (bounds staleness
+# for review stats and for writes made by other worker processes)
+FEATURED_TTL_SECONDS = float(os.getenv("FEATURED_TTL_SECONDS", "300"))
+
+# How many pastries / tracks the home page shows (0 = the whole pool, shuffled)
+FEATURED_MENU_ITEMS = int(os.getenv("FEATURED_MENU_ITEMS", "12"))
+FEATURED_TRACKS = int(os.getenv("FEATURED_TRACKS", "12"))
+
+
+class FeaturedPool:
+    """
+    In-memory pools of featured content for the home page.
+
+    - menu: available items in the "pastry" category
+    - tracks: music tracks with an audio file
+    - review_stats: {str(menu_item_id): {"count", "avg"}} for the menu pool
+
+    The pools are loaded with three plain SELECTs (no ORDER BY random())
+    and kept until FEATURED_TTL_SECONDS pass or invalidate() is called by a
+    menu/music write. Each page view then samples k entries in memory.
+    """
+
+    def __init__(self, ttl: float = FEATURED_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+        # Bumped by invalidate() so a load racing with a write isn't kept
+        self._generation = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _fresh(self) -> Optional[Dict[str, Any]]:
+        if self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return self._snapshot
+        return None
+
+    def load_menu(self, session) -> List[MenuItem]:
+        return list(menu_catalog.list_available(session, category="pastry"))
+
+    def load_tracks(self, session) -> List[MusicTrack]:
+        return list(session.exec(select(MusicTrack).where(MusicTrack.file_url != "")).all())
+
+    def _load(self, session) -> Dict[str, Any]:
+        menu = self.load_menu(session)
+        review_stats = {
+            menu_id: {"count": row.review_count, "avg": row.rating_avg}
+            for menu_id, row in get_rating_stats(session, [m.id for m in menu]).items()
+        }
+        return {"menu": menu, "review_stats": review_stats, "tracks": self.load_tracks(session)}
+
+    def snapshot(self, session) -> Dict[str, Any]:
+        """Current pools, loading them with `session` if missing or expired."""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            # Another request may have reloaded while we waited
+            snapshot = self._fresh()
+            if snapshot is not None:
+                return snapshot
+            generation = self._generation
+
+        snapshot = self._load(session)
+        logger.info(f"Featured pools loaded: {len(snapshot['menu'])} pastries, {len(snapshot['tracks'])} tracks")
+
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        return snapshot
+
+    def sample(
+        self,
+        session,
+        menu_k: int = FEATURED_MENU_ITEMS,
+        track_k: int = FEATURED_TRACKS,
+        rng: random.Random = random,
+    ) -> Dict[str, Any]:
+        """Random featured pastries + tracks (and their review stats) for one page view."""
+        snapshot = self.snapshot(session)
+        menu = _sample(snapshot["menu"], menu_k, rng)
+        all_stats = snapshot["review_stats"]
+        return {
+            "menu_items": menu,
+            "review_stats": {str(m.id): all_stats[str(m.id)] for m in menu if str(m.id) in all_stats},
+            "tracks": _sample(snapshot["tracks"], track_k, rng),
+        }
+
+
+def _sample(pool: List[Any], k: int, rng) -> List[Any]:
+    if k <= 0 or k >= len(pool):
+        return rng.sample(pool, len(pool))
+    return rng.sample(pool, k)
+
+
+featured_pool = FeaturedPool()
+
+
+def invalidate_featured():
+    """Drop the cached pools; the next home page view reloads them."""
+    featured_pool.invalidate()
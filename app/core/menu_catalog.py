@@ -0,0 +1,235 @@
+# app/core/menu_catalog.py
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.core.logger import get_logger
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.menu_catalog_version import MenuCatalogVersion
+
+logger = get_logger(__name__)
+
+# Set MENU_CACHE=false to read the menu straight from the database
+MENU_CACHE = os.getenv("MENU_CACHE", "true").lower() in ("1", "true", "yes")
+
+# How often (seconds) a worker compares its snapshot with menu_catalog_version;
+# bounds how long writes made through another worker stay invisible
+MENU_CACHE_CHECK_SECONDS = float(os.getenv("MENU_CACHE_CHECK_SECONDS", "1.0"))
+
+
+# ---------------------------------------------
+# VERSION: one row, bumped with every menu write
+# ---------------------------------------------
+def bump_catalog_version(session):
+    """Increment menu_catalog_version in the caller's transaction (before commit)."""
+    table = MenuCatalogVersion.__table__
+    insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+    stmt = insert(table).values(id=1, version=1, updated_at=now).on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={"version": table.c.version + 1, "updated_at": now},
+    )
+    session.exec(stmt)
+
+
+def read_catalog_version(session) -> int:
+    row = session.exec(select(MenuCatalogVersion.version).where(MenuCatalogVersion.id == 1)).first()
+    return int(row or 0)
+
+
+# ---------------------------------------------
+# SNAPSHOT: immutable once built
+# ---------------------------------------------
+class CatalogSnapshot:
+    """
+    Every menu item keyed by id, plus secondary indexes over the
+    available items (by category, tag, dietary feature, flavor), all in
+    created_at order.
+    """
+
+    def __init__(self, version: int, items: Sequence[MenuItem]):
+        self.version = version
+        self.by_id: Dict[str, MenuItem] = {str(item.id): item for item in items}
+        self.available: List[MenuItem] = [item for item in items if item.is_available]
+        self.by_category: Dict[str, List[MenuItem]] = {}
+        self.by_tag: Dict[str, List[MenuItem]] = {}
+        self.by_dietary: Dict[str, List[MenuItem]] = {}
+        self.by_flavor: Dict[str, List[MenuItem]] = {}
+
+        for item in self.available:
+            if item.category:
+                self.by_category.setdefault(item.category, []).append(item)
+            for index, values in (
+                (self.by_tag, item.tags),
+                (self.by_dietary, item.dietary_features),
+                (self.by_flavor, item.flavor_profiles),
+            ):
+                for value in set(values or []):
+                    index.setdefault(value, []).append(item)
+
+    def filter(
+        self,
+        category: Optional[str] = None,
+        tags: Iterable[str] = (),
+        dietary: Iterable[str] = (),
+        flavors: Iterable[str] = (),
+    ) -> List[MenuItem]:
+        """Available items matching the category and containing every tag/dietary/flavor value."""
+        postings = []
+        if category:
+            postings.append(self.by_category.get(category, []))
+        for index, values in ((self.by_tag, tags), (self.by_dietary, dietary), (self.by_flavor, flavors)):
+            for value in values or ():
+                postings.append(index.get(value, []))
+
+        if not postings:
+            return list(self.available)
+
+        # Walk the shortest posting list, probe the others by id
+        postings.sort(key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            ids = {item.id for item in other}
+            result = [item for item in result if item.id in ids]
+        return list(result)
+
+
+# ---------------------------------------------
+# CACHE
+# ---------------------------------------------
+def _as_uuid(value) -> Optional[UUID]:
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+class MenuCatalog:
+    """
+    Process-local read-through cache of the whole menu.
+
+    The snapshot is rebuilt when this process writes (invalidate()) or
+    when menu_catalog_version in the database moves, which is checked at
+    most every MENU_CACHE_CHECK_SECONDS, so other workers' writes show
+    up within that window. With MENU_CACHE off, every read goes to the DB.
+    """
+
+    def __init__(self, enabled: bool = MENU_CACHE, check_seconds: float = MENU_CACHE_CHECK_SECONDS):
+        self.enabled = enabled
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        # Bumped by invalidate() so a load racing with a write isn't kept
+        self._generation = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _load(self, session) -> CatalogSnapshot:
+        # Own session: cached instances must not belong to (and be expired by) a request session
+        with Session(session.get_bind()) as load_session:
+            version = read_catalog_version(load_session)
+            items = load_session.exec(select(MenuItem).order_by(MenuItem.created_at, MenuItem.id)).all()
+        logger.info(f"Menu catalog loaded: {len(items)} items (version {version})")
+        return CatalogSnapshot(version, items)
+
+    def snapshot(self, session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return snapshot
+
+        # The lock never spans a query: under AsyncSession.run_sync the query
+        # yields to the event loop, and a coroutine on the same thread
+        # waiting for the lock would block the loop for good
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return snapshot
+            generation = self._generation
+            if snapshot is not None:
+                # Concurrent callers keep serving this snapshot while we check
+                self._checked_at = time.monotonic()
+
+        if snapshot is not None and read_catalog_version(session) == snapshot.version:
+            return snapshot
+
+        snapshot = self._load(session)
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._checked_at = time.monotonic()
+        return snapshot
+
+    # ---------------------------------------------
+    # READS
+    # ---------------------------------------------
+    def get(self, session, item_id) -> Optional[MenuItem]:
+        """One item by id (available or not), like session.get(MenuItem, id)."""
+        if not self.enabled:
+            item_uuid = _as_uuid(item_id)
+            return session.get(MenuItem, item_uuid) if item_uuid else None
+        return self.snapshot(session).by_id.get(str(item_id))
+
+    def get_many(self, session, item_ids: Iterable) -> List[MenuItem]:
+        """Items for the ids that exist, in the order given."""
+        ids = [str(item_id) for item_id in item_ids]
+        if not ids:
+            return []
+        if not self.enabled:
+            uuids = [u for u in (_as_uuid(i) for i in ids) if u]
+            rows = session.exec(select(MenuItem).where(MenuItem.id.in_(uuids))).all() if uuids else []
+            by_id = {str(item.id): item for item in rows}
+        else:
+            by_id = self.snapshot(session).by_id
+        return [by_id[i] for i in ids if i in by_id]
+
+    def list_available(
+        self,
+        session,
+        category: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
+        dietary: Optional[Sequence[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[MenuItem]:
+        """Available items in a category / containing every tag and dietary feature."""
+        if not self.enabled:
+            query = select(MenuItem).where(MenuItem.is_available == True)  # noqa: E712
+            if category:
+                query = query.where(MenuItem.category == category)
+            # Array containment (@>) so Postgres answers from the GIN indexes
+            if tags:
+                query = query.where(MenuItem.tags.contains(list(tags)))
+            if dietary:
+                query = query.where(MenuItem.dietary_features.contains(list(dietary)))
+            if offset:
+                query = query.offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
+            return session.exec(query).all()
+
+        items = self.snapshot(session).filter(category=category, tags=tags or (), dietary=dietary or ())
+        end = offset + limit if limit is not None else None
+        return items[offset:end]
+
+
+menu_catalog = MenuCatalog()
+
+
+def invalidate_catalog():
+    """Drop this worker's snapshot; call after committing a menu write."""
+    menu_catalog.invalidate()
@@ -0,0 +1,147 @@
+# app/core/menu_search.py
+
+import os
+import re
+from typing import List
+
+from sqlalchemy import column, func, literal_column, table, text
+
+from app.core.db import engine
+from app.core.logger import get_logger
+from app.models.postgres.menu import MenuItem
+
+logger = get_logger(__name__)
+
+# Retry with pg_trgm similarity on the title when full-text finds nothing (typos)
+MENU_SEARCH_TRIGRAM = os.getenv("MENU_SEARCH_TRIGRAM", "true").lower() in ("1", "true", "yes")
+MENU_SEARCH_TRIGRAM_THRESHOLD = float(os.getenv("MENU_SEARCH_TRIGRAM_THRESHOLD", "0.3"))
+
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+# Postgres: weighted tsvector column maintained by trigger (migration 008)
+search_vector = literal_column("menu_item.search_vector")
+
+# SQLite: FTS5 table kept in sync with menu_item by triggers (ensure_search_index)
+menu_item_fts = table(
+    "menu_item_fts",
+    column("menu_item_id"),
+    column("menu_item_fts"),
+    column("rank"),
+)
+
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS menu_item_fts USING fts5(
+        menu_item_id UNINDEXED, title, tags, description,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    # Same weighting as Postgres: title > tags > description
+    "INSERT INTO menu_item_fts(menu_item_fts, rank) VALUES ('rank', 'bm25(0.0, 10.0, 4.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_item_fts_insert AFTER INSERT ON menu_item BEGIN
+        INSERT INTO menu_item_fts (menu_item_id, title, tags, description)
+        VALUES (new.id, new.title, (SELECT group_concat(value, ' ') FROM json_each(new.tags)), new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_item_fts_update AFTER UPDATE OF title, tags, description ON menu_item BEGIN
+        DELETE FROM menu_item_fts WHERE menu_item_id = old.id;
+        INSERT INTO menu_item_fts (menu_item_id, title, tags, description)
+        VALUES (new.id, new.title, (SELECT group_concat(value, ' ') FROM json_each(new.tags)), new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_item_fts_delete AFTER DELETE ON menu_item BEGIN
+        DELETE FROM menu_item_fts WHERE menu_item_id = old.id;
+    END
+    """,
+    # Backfill rows created before the index existed
+    """
+    INSERT INTO menu_item_fts (menu_item_id, title, tags, description)
+    SELECT id, title, (SELECT group_concat(value, ' ') FROM json_each(menu_item.tags)), description
+    FROM menu_item
+    WHERE id NOT IN (SELECT menu_item_id FROM menu_item_fts)
+    """,
+]
+
+
+def ensure_search_index(bind=engine):
+    """Create the SQLite FTS5 index + triggers (Postgres uses migrations/008)."""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as conn:
+        for ddl in SQLITE_FTS_DDL:
+            conn.execute(text(ddl))
+
+
+def _dialect(session) -> str:
+    get_bind = getattr(session, "get_bind", None)
+    return (get_bind() if get_bind else engine).dialect.name
+
+
+def search_terms(q: str) -> List[str]:
+    """Lowercase alphanumeric terms; everything else is dropped so input can't break query syntax."""
+    return _TERM_RE.findall((q or "").lower())
+
+
+# ---------------------------------------------
+# QUERY BUILDERS
+# ---------------------------------------------
+def full_text_query(query, terms: List[str], dialect: str, match_any: bool = False):
+    """
+    Restrict `query` to items matching the terms, best rank first.
+
+    By default every term must match as a prefix (search-box behaviour).
+    With match_any=True any whole (stemmed) term is enough, which suits
+    free-form sentences such as chat messages.
+    """
+    if dialect == "postgresql":
+        if match_any:
+            tsquery = func.to_tsquery("english", " | ".join(terms))
+        else:
+            tsquery = func.to_tsquery("english", " & ".join(f"{t}:*" for t in terms))
+        return (
+            query.where(search_vector.op("@@")(tsquery))
+            .order_by(func.ts_rank(search_vector, tsquery).desc(), MenuItem.title)
+        )
+
+    if match_any:
+        match = " OR ".join(f'"{t}"' for t in terms)
+    else:
+        match = " ".join(f'"{t}"*' for t in terms)
+    return (
+        query.where(MenuItem.id == menu_item_fts.c.menu_item_id)
+        .where(menu_item_fts.c.menu_item_fts.op("MATCH")(match))
+        .order_by(menu_item_fts.c.rank, MenuItem.title)
+    )
+
+
+def trigram_query(query, q: str, threshold: float = MENU_SEARCH_TRIGRAM_THRESHOLD):
+    """Fuzzy title match (pg_trgm), most similar first."""
+    similarity = func.similarity(MenuItem.title, q)
+    return query.where(similarity >= threshold).order_by(similarity.desc(), MenuItem.title)
+
+
+# ---------------------------------------------
+# SEARCH
+# ---------------------------------------------
+def search_menu(session, query, q: str, limit: int, offset: int = 0, fuzzy: bool = MENU_SEARCH_TRIGRAM) -> List[MenuItem]:
+    """
+    Ranked, paginated text search on top of an already-filtered select(MenuItem).
+
+    Postgres ranks with ts_rank over the weighted search_vector (GIN index)
+    and falls back to trigram similarity when the first page is empty.
+    SQLite uses the FTS5 index with bm25 and has no fuzzy fallback.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return session.exec(query.order_by(MenuItem.title).offset(offset).limit(limit)).all()
+
+    dialect = _dialect(session)
+    items = session.exec(full_text_query(query, terms, dialect).offset(offset).limit(limit)).all()
+
+    if not items and offset == 0 and fuzzy and dialect == "postgresql":
+        items = session.exec(trigram_query(query, q.strip()).limit(limit)).all()
+
+    return items
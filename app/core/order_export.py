@@ -0,0 +1,125 @@
+# app/core/order_export.py
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.core.logger import get_logger
+from app.core.order_history import encode_cursor
+from app.models.postgres.order import Order
+
+logger = get_logger(__name__)
+
+# Orders per GET /orders/ page (the `limit` query param can lower it)
+ORDER_LIST_PAGE_SIZE = int(os.getenv("ORDER_LIST_PAGE_SIZE", "50"))
+
+# Rows fetched per server-side cursor round trip by GET /orders/export
+ORDER_EXPORT_BATCH_SIZE = int(os.getenv("ORDER_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = ["id", "user_id", "status", "created_at", "total"]
+
+
+def _filtered(query, status: Optional[str], created_from: Optional[datetime], created_to: Optional[datetime]):
+    """status equality and a [created_from, created_to) window; see migration 012 for the indexes."""
+    if status:
+        query = query.where(Order.status == status)
+    if created_from:
+        query = query.where(Order.created_at >= created_from)
+    if created_to:
+        query = query.where(Order.created_at < created_to)
+    return query
+
+
+# ---------------------------------------------
+# LISTING: keyset pages, newest first
+# ---------------------------------------------
+def order_list_query(
+    limit: int,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, UUID]] = None,
+):
+    """
+    limit + 1 orders (to detect a next page) older than the (created_at, id)
+    keyset `before`, so every page is an index range scan.
+    """
+    query = _filtered(select(Order), status, created_from, created_to)
+    if before is not None:
+        created_at, order_id = before
+        query = query.where(or_(
+            Order.created_at < created_at,
+            and_(Order.created_at == created_at, Order.id < order_id),
+        ))
+    return query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+
+
+def order_list_page(orders, limit: int) -> Tuple[List[Order], Optional[str]]:
+    orders = list(orders)
+    if len(orders) <= limit:
+        return orders, None
+    orders = orders[:limit]
+    return orders, encode_cursor(orders[-1].created_at, orders[-1].id)
+
+
+# ---------------------------------------------
+# EXPORT: stream every matching order
+# ---------------------------------------------
+def iter_order_rows(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_size: int = ORDER_EXPORT_BATCH_SIZE,
+) -> Iterator[List[tuple]]:
+    """
+    Batches of (id, user_id, status, created_at, total) oldest first,
+    read through a server-side cursor (yield_per) so only one batch is
+    held in memory however many orders match.
+    """
+    query = _filtered(
+        select(Order.id, Order.user_id, Order.status, Order.created_at, Order.total),
+        status, created_from, created_to,
+    ).order_by(Order.created_at, Order.id)
+
+    # Own session: the response streams after request dependencies have closed
+    with Session(engine) as session:
+        result = session.exec(query.execution_options(yield_per=batch_size))
+        for partition in result.partitions(batch_size):
+            yield list(partition)
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def export_lines(fmt: str, batches: Iterator[List[tuple]]) -> Iterator[str]:
+    """ndjson: one JSON object per order; csv: header row then one row per order. One chunk per batch."""
+    count = 0
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_as_text(value) for value in row] for row in batch)
+            count += len(batch)
+            yield buffer.getvalue()
+    else:
+        for batch in batches:
+            count += len(batch)
+            yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_as_text) + "\n" for row in batch)
+    logger.info(f"Order export ({fmt}): {count} rows")
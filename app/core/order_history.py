@@ -0,0 +1,101 @@
+# app/core/order_history.py
+
+import base64
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+
+from app.models.postgres.order import Order
+from app.models.postgres.order_item import OrderItem
+
+# Orders per /orders/view page (the `limit` query param can lower it)
+ORDER_HISTORY_PAGE_SIZE = int(os.getenv("ORDER_HISTORY_PAGE_SIZE", "20"))
+
+
+# ---------------------------------------------
+# CURSOR: (created_at, id) of the last order shown
+# ---------------------------------------------
+def encode_cursor(created_at: datetime, order_id) -> str:
+    raw = f"{created_at.isoformat()}|{order_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, UUID]]:
+    """(created_at, id) from a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, order_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(order_id)
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------
+# QUERY: one page of orders + their items, one round trip
+# ---------------------------------------------
+def order_history_query(user_id: UUID, limit: int, before: Optional[Tuple[datetime, UUID]] = None):
+    """
+    Newest-first page of a user's orders joined to their items.
+
+    The page (limit + 1 rows, to detect a next page) is picked in a
+    subquery walking idx_order_user_created_at from the keyset
+    (created_at, id) < before, so deep pages cost the same as the first.
+    """
+    page = select(Order).where(Order.user_id == user_id)
+    if before is not None:
+        created_at, order_id = before
+        page = page.where(or_(
+            Order.created_at < created_at,
+            and_(Order.created_at == created_at, Order.id < order_id),
+        ))
+    page = page.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).subquery()
+
+    paged_order = aliased(Order, page)
+    return (
+        select(paged_order, OrderItem)
+        .outerjoin(OrderItem, OrderItem.order_id == paged_order.id)
+        .order_by(paged_order.created_at.desc(), paged_order.id.desc(), OrderItem.title)
+    )
+
+
+def group_order_rows(rows, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    [(order, item-or-None), ...] → ([{"order", "items"}, ...], next_cursor),
+    with UUIDs as strings for the template.
+    """
+    orders: Dict[Any, Dict[str, Any]] = {}
+    for order, item in rows:
+        entry = orders.get(order.id)
+        if entry is None:
+            entry = orders[order.id] = {
+                "order": {
+                    "id": str(order.id),
+                    "user_id": str(order.user_id),
+                    "status": order.status,
+                    "created_at": order.created_at,
+                    "total": order.total,
+                },
+                "items": [],
+            }
+        if item is not None:
+            entry["items"].append({
+                "id": str(item.id),
+                "order_id": str(item.order_id),
+                "menu_item_id": str(item.menu_item_id),
+                "title": item.title,
+                "unit_price": item.unit_price,
+                "quantity": item.quantity,
+            })
+
+    page = list(orders.values())
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]["order"]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return page, next_cursor
@@ -0,0 +1,104 @@
+# app/core/order_writer.py
+
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.core.logger import get_logger
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.order import Order
+from app.models.postgres.order_item import OrderItem
+
+logger = get_logger(__name__)
+
+
+class UnknownMenuItem(LookupError):
+    """An order line names a menu item that does not exist."""
+
+    def __init__(self, menu_item_id):
+        super().__init__(f"Menu item not found: {menu_item_id}")
+        self.menu_item_id = menu_item_id
+
+
+def _as_uuid(value) -> Optional[UUID]:
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------
+# PRICING: every line from one IN query
+# ---------------------------------------------
+def price_lines(session, lines: Iterable[Tuple[object, int]], ignore_missing: bool = False) -> List[OrderItem]:
+    """
+    (menu_item_id, quantity) pairs → unsaved OrderItems carrying the
+    current title and price. All ids are resolved with a single IN query
+    on the caller's session, inside the order's transaction. The menu
+    cache is not used here: another worker's snapshot can lag behind a
+    price change or deletion by up to MENU_CACHE_CHECK_SECONDS.
+
+    Unknown ids raise UnknownMenuItem, or are dropped with ignore_missing.
+    """
+    lines = [(str(menu_item_id), int(quantity)) for menu_item_id, quantity in lines]
+    uuids = list({u for u in (_as_uuid(i) for i, _ in lines) if u})
+    rows = session.exec(select(MenuItem).where(MenuItem.id.in_(uuids))).all() if uuids else []
+    by_id = {str(item.id): item for item in rows}
+
+    items = []
+    for menu_item_id, quantity in lines:
+        menu_item = by_id.get(menu_item_id)
+        if menu_item is None:
+            if ignore_missing:
+                continue
+            raise UnknownMenuItem(menu_item_id)
+        items.append(OrderItem(
+            order_id=None,
+            menu_item_id=menu_item.id,
+            title=menu_item.title,
+            unit_price=menu_item.price,
+            quantity=quantity,
+        ))
+    return items
+
+
+# ---------------------------------------------
+# WRITE: order + items, two statements, caller commits
+# ---------------------------------------------
+def insert_order(session, order: Order, items: List[OrderItem]):
+    """
+    INSERT the order, then all of its items as one multi-row INSERT, in the
+    caller's transaction. Ids are generated client-side (uuid4 defaults),
+    so nothing has to be read back and no refresh is needed after commit.
+    """
+    session.exec(insert(Order.__table__).values(order.model_dump()))
+    if items:
+        for item in items:
+            item.order_id = order.id
+        session.exec(insert(OrderItem.__table__).values([item.model_dump() for item in items]))
+
+
+def create_order(
+        session,
+        user_id: UUID,
+        lines: Iterable[Tuple[object, int]],
+        status: str = "pending",
+        total: Optional[float] = None,
+        ignore_missing: bool = False,
+) -> Tuple[Order, List[OrderItem]]:
+    """
+    Price `lines` and write the order with its items; commit once afterwards.
+
+    `total` defaults to the sum of the priced lines.
+    """
+    items = price_lines(session, lines, ignore_missing=ignore_missing)
+    if total is None:
+        total = sum(item.unit_price * item.quantity for item in items)
+    order = Order(user_id=user_id, status=status, total=total)
+    insert_order(session, order, items)
+    logger.info(f"Order {order.id} written with {len(items)} items")
+    return order, items
@@ -0,0 +1,69 @@
+# app/core/rating_stats.py
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+
+from app.core.db import engine
+from app.models.postgres.menu_item_rating_stats import MenuItemRatingStats
+
+
+# ---------------------------------------------
+# WRITE: called inside the review transaction
+# ---------------------------------------------
+def record_rating(session, menu_item_id: UUID, rating: int, previous_rating: Optional[int] = None):
+    """
+    Fold one review write into menu_item_rating_stats.
+
+    New review → count +1, sum +rating. Edited review → count unchanged,
+    sum +(rating - previous_rating). Runs as a single INSERT ... ON CONFLICT
+    DO UPDATE in the caller's session, so it commits (or rolls back) with
+    the review itself and concurrent reviews can't lose updates.
+    """
+    count_delta = 0 if previous_rating is not None else 1
+    sum_delta = rating - (previous_rating or 0)
+    if count_delta == 0 and sum_delta == 0:
+        return
+
+    table = MenuItemRatingStats.__table__
+    insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+
+    new_count = table.c.review_count + count_delta
+    new_sum = table.c.rating_sum + sum_delta
+
+    stmt = insert(table).values(
+        menu_item_id=menu_item_id,
+        review_count=count_delta,
+        rating_sum=sum_delta,
+        rating_avg=float(sum_delta) if count_delta else 0.0,
+        updated_at=now,
+    ).on_conflict_do_update(
+        index_elements=[table.c.menu_item_id],
+        set_={
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "rating_avg": func.coalesce(new_sum * 1.0 / func.nullif(new_count, 0), 0.0),
+            "updated_at": now,
+        },
+    )
+    session.exec(stmt)
+
+
+# ---------------------------------------------
+# READ: one query for any number of items
+# ---------------------------------------------
+def get_rating_stats(session, menu_item_ids: Iterable[UUID]) -> Dict[str, MenuItemRatingStats]:
+    """Map of str(menu_item_id) → stats row; items without reviews are absent."""
+    ids = list(menu_item_ids)
+    if not ids:
+        return {}
+    rows = session.exec(
+        select(MenuItemRatingStats).where(MenuItemRatingStats.menu_item_id.in_(ids))
+    ).all()
+    return {str(row.menu_item_id): row for row in rows}
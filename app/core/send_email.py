@@ -1,6 +1,10 @@
+import json
+import os
+import threading
 import boto3
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from starlette.config import Config
+from app.core.email_outbox import EMAIL_OUTBOX, EmailOutbox, LocalSES, error_code
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,7 +15,33 @@ AWS_REGION = "us-west-2"
 SES_SENDER = f"Yorkie Bakery <noreply@yorkiebakery.com>"
 SES_CONFIG_SET = "my-first-configuration-set"
 
-ses = boto3.client("ses", region_name=AWS_REGION)
+# EMAIL_BACKEND=local swaps SES for an offline stand-in (dev, benchmarks)
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "ses").lower()
+LOCAL_SES_LATENCY_MS = float(os.getenv("LOCAL_SES_LATENCY_MS", "0"))
+
+if EMAIL_BACKEND == "local":
+    ses = LocalSES(latency_ms=LOCAL_SES_LATENCY_MS)
+else:
+    ses = boto3.client("ses", region_name=AWS_REGION)
+
+
+# ---------------------------------------------
+# DELIVERY: request paths only enqueue
+# ---------------------------------------------
+def deliver(message: Dict[str, Any]):
+    """One SES send_email call (run by the outbox workers)."""
+    ses.send_email(**message)
+    logger.info(f"Email sent to {', '.join(message['Destination']['ToAddresses'])}")
+
+
+email_outbox = EmailOutbox(send=deliver)
+
+
+def _send(**message):
+    if EMAIL_OUTBOX:
+        email_outbox.enqueue(message)
+    else:
+        deliver(message)
 
 
 def _format_price(amount: Optional[Union[float, int]]) -> str:
@@ -24,7 +54,7 @@ def send_email(to: str, subject: str, body: str):
     logger.debug(f"Subject: {subject}")
     logger.debug(f"Body preview: {body[:80]}...")
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [to]},
         Message={
@@ -33,7 +63,6 @@ def send_email(to: str, subject: str, body: str):
         },
         ConfigurationSetName=SES_CONFIG_SET
     )
-    logger.info(f"Email sent successfully to {to}")
 
 def send_event_notice(email: str, event_title: str, message: str):
     subject = f"⚠️ Yorkie Bakery - Event Update for {event_title}"
@@ -45,7 +74,7 @@ def send_event_notice(email: str, event_title: str, message: str):
         f"— Yorkie Bakery Customer Service 🐶"
     )
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [email]},
         Message={
@@ -55,11 +84,76 @@ def send_event_notice(email: str, event_title: str, message: str):
         ConfigurationSetName=SES_CONFIG_SET
     )
 
+# ---------------------------------------------
+# BULK EVENT NOTICES: one SES call per ≤50 recipients
+# ---------------------------------------------
+EVENT_NOTICE_TEMPLATE = "yorkie-event-notice"
+EVENT_NOTICE_TEMPLATE_PARTS = {
+    "SubjectPart": "⚠️ Yorkie Bakery - Event Update for {{{event_title}}}",
+    "TextPart": (
+        "Hello {{{name}}},\n\n"
+        "There is an update regarding the event:\n"
+        "📌 {{{event_title}}}\n\n"
+        "{{{message}}}\n\n"
+        "— Yorkie Bakery Customer Service 🐶"
+    ),
+}
+
+# SES caps send_bulk_templated_email at 50 destinations per call
+SES_BULK_MAX_DESTINATIONS = 50
+
+_template_lock = threading.Lock()
+_event_notice_template_ready = False
+
+
+def ensure_event_notice_template():
+    """Create or refresh the SES template behind send_event_notice_batch (once per process)."""
+    global _event_notice_template_ready
+    with _template_lock:
+        if _event_notice_template_ready:
+            return
+        template = {"TemplateName": EVENT_NOTICE_TEMPLATE, **EVENT_NOTICE_TEMPLATE_PARTS}
+        try:
+            ses.update_template(Template=template)
+        except Exception as e:
+            if error_code(e) != "TemplateDoesNotExist":
+                raise
+            ses.create_template(Template=template)
+        _event_notice_template_ready = True
+
+
+def send_event_notice_batch(
+    recipients: List[Tuple[str, Optional[str]]], event_title: str, message: str,
+) -> List[Optional[str]]:
+    """
+    Send the event notice to up to 50 (email, name) recipients with one
+    send_bulk_templated_email call. Returns one entry per recipient:
+    None if SES accepted it, otherwise its SES status (e.g. "MessageRejected").
+    """
+    if len(recipients) > SES_BULK_MAX_DESTINATIONS:
+        raise ValueError(f"At most {SES_BULK_MAX_DESTINATIONS} recipients per bulk send")
+    ensure_event_notice_template()
+
+    response = ses.send_bulk_templated_email(
+        Source=SES_SENDER,
+        Template=EVENT_NOTICE_TEMPLATE,
+        DefaultTemplateData=json.dumps({"name": "there", "event_title": event_title, "message": message}),
+        Destinations=[
+            {
+                "Destination": {"ToAddresses": [email]},
+                "ReplacementTemplateData": json.dumps({"name": name or "there"}),
+            }
+            for email, name in recipients
+        ],
+        ConfigurationSetName=SES_CONFIG_SET,
+    )
+    return [None if status.get("Status") == "Success" else status.get("Status") for status in response["Status"]]
+
 def send_verification_email(email: str, verify_url: str):  # Changed parameter name
     logger.info(f"Sending verification email to {email}")
     logger.info(f"Verification URL: {verify_url}")
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [email]},
         Message={
@@ -99,7 +193,7 @@ def send_password_changed_email(email: str, first_name: Optional[str] = None):
         "Yorkie Bakery Security Team 🐶"
     )
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [email]},
         Message={
@@ -181,7 +275,7 @@ def send_order_confirmation_email(
     logger.debug(f"Order confirmation subject suffix: {order_ref}")
     logger.debug(f"Order confirmation body preview: {body[:160]}...")
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [email]},
         Message={
@@ -246,7 +340,7 @@ def send_owner_new_order_email(
     logger.debug(f"Owner email subject suffix: {order_ref}")
     logger.debug(f"Owner email body preview: {order_summary[:160]}...")
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": ["yorkiebakery@gmail.com"]},
         Message={
@@ -274,7 +368,7 @@ def send_password_reset_email(email: str, reset_url: str):
 
     subject = "🔐 Yorkie Bakery - Reset Your Password"
 
-    ses.send_email(
+    _send(
         Source=SES_SENDER,
         Destination={"ToAddresses": [email]},
         Message={
@@ -302,4 +396,3 @@ def send_password_reset_email(email: str, reset_url: str):
         },
         ConfigurationSetName=SES_CONFIG_SET
     )
-    logger.info(f"Password reset email sent successfully to {email}")
@@ -0,0 +1,111 @@
+# app/core/user_cache.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.core.logger import get_logger
+from app.models.postgres.user import User
+
+logger = get_logger(__name__)
+
+# Seconds a profile is reused before it is re-read (bounds staleness for
+# edits made through another worker process); 0 disables the cache
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Path prefixes that never need the logged-in user (see skip_user_hydration)
+_skip_prefixes = set()
+
+
+def skip_user_hydration(*prefixes: str):
+    """Opt routes/mounts out of attach_user: requests under these paths skip the profile lookup."""
+    _skip_prefixes.update(prefixes)
+
+
+def wants_user(path: str) -> bool:
+    return not any(path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in _skip_prefixes)
+
+
+def user_profile(user: User) -> Dict[str, Any]:
+    """The fields pages show for the logged-in user (same keys as request.session["user"])."""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_admin": bool(user.is_admin),
+        "avatar_url": user.avatar_url,
+    }
+
+
+class UserCache:
+    """Short-TTL LRU of user profiles by id; writers call invalidate(user_id)."""
+
+    def __init__(self, ttl: float = USER_CACHE_TTL_SECONDS, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, profile = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return profile
+
+    def set(self, user_id: str, profile: Dict[str, Any]):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def load(self, user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            user_uuid = UUID(user_id)
+        except ValueError:
+            return None
+        async with AsyncSession(async_engine) as session:
+            user = await session.get(User, user_uuid)
+        return user_profile(user) if user else None
+
+    async def profile(self, user_id) -> Optional[Dict[str, Any]]:
+        """Cached profile for user_id, loading it on a miss (None if the user is gone)."""
+        user_id = str(user_id)
+        profile = self.get(user_id)
+        if profile is None:
+            profile = await self.load(user_id)
+            if profile is not None:
+                self.set(user_id, profile)
+        return profile
+
+
+user_cache = UserCache()
+
+
+def invalidate_user(user_id):
+    """Drop the cached profile; call after committing a change to the user row."""
+    user_cache.invalidate(user_id)
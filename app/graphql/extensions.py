@@ -0,0 +1,291 @@
+# app/graphql/extensions.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from graphql import (
+    ExecutionResult as GraphQLExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    get_named_type,
+    get_nullable_type,
+    value_from_ast,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.execute import parse_document, validate_document
+from strawberry.types.graphql import OperationType
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Cost = 1 per field; fields under a list are multiplied by its `limit` argument
+GRAPHQL_MAX_COST = int(os.getenv("GRAPHQL_MAX_COST", "5000"))
+GRAPHQL_MAX_DEPTH = int(os.getenv("GRAPHQL_MAX_DEPTH", "8"))
+# Multiplier for list fields that have no `limit` argument
+GRAPHQL_DEFAULT_LIST_SIZE = int(os.getenv("GRAPHQL_DEFAULT_LIST_SIZE", "10"))
+
+# Parsed/validated documents kept per process (keyed by query text)
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "256"))
+
+# Optional JSON file {sha256: query} of queries known ahead of time
+GRAPHQL_PERSISTED_QUERIES_FILE = os.getenv("GRAPHQL_PERSISTED_QUERIES_FILE", "")
+GRAPHQL_PERSISTED_QUERIES_MAX = int(os.getenv("GRAPHQL_PERSISTED_QUERIES_MAX", "1000"))
+
+# Anonymous read-only responses; 0 disables the cache
+GRAPHQL_CACHE_TTL_SECONDS = float(os.getenv("GRAPHQL_CACHE_TTL_SECONDS", "5"))
+GRAPHQL_CACHE_MAX_ENTRIES = int(os.getenv("GRAPHQL_CACHE_MAX_ENTRIES", "1000"))
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _rejected(message: str) -> GraphQLExecutionResult:
+    return GraphQLExecutionResult(data=None, errors=[GraphQLError(message)])
+
+
+# ------------------------------------------------------------------------------
+# COST ANALYSIS
+# ------------------------------------------------------------------------------
+def _list_size(node: FieldNode, field_def, variables: Dict[str, Any]) -> int:
+    limit_def = field_def.args.get("limit")
+    if limit_def is None:
+        return GRAPHQL_DEFAULT_LIST_SIZE
+    for arg in node.arguments or ():
+        if arg.name.value == "limit":
+            value = value_from_ast(arg.value, limit_def.type, variables)
+            return max(0, int(value)) if isinstance(value, int) else GRAPHQL_DEFAULT_LIST_SIZE
+    default = limit_def.default_value
+    return max(0, int(default)) if isinstance(default, int) else GRAPHQL_DEFAULT_LIST_SIZE
+
+
+def _selection_cost(schema, parent_type, selection_set, fragments, variables, depth) -> Tuple[int, int]:
+    cost, max_depth = 0, depth
+    fields = getattr(parent_type, "fields", {})
+
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            field_def = fields.get(selection.name.value)
+            if field_def is None:
+                # __typename / introspection
+                continue
+            child_cost, child_depth = 0, depth + 1
+            if selection.selection_set:
+                child_cost, child_depth = _selection_cost(
+                    schema, get_named_type(field_def.type), selection.selection_set, fragments, variables, depth + 1
+                )
+                if isinstance(get_nullable_type(field_def.type), GraphQLList):
+                    child_cost *= _list_size(selection, field_def, variables)
+            cost += 1 + child_cost
+            max_depth = max(max_depth, child_depth)
+
+        elif isinstance(selection, InlineFragmentNode):
+            fragment_type = (
+                schema.get_type(selection.type_condition.name.value) if selection.type_condition else parent_type
+            )
+            sub_cost, sub_depth = _selection_cost(
+                schema, fragment_type, selection.selection_set, fragments, variables, depth
+            )
+            cost, max_depth = cost + sub_cost, max(max_depth, sub_depth)
+
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                sub_cost, sub_depth = _selection_cost(
+                    schema, schema.get_type(fragment.type_condition.name.value),
+                    fragment.selection_set, fragments, variables, depth,
+                )
+                cost, max_depth = cost + sub_cost, max(max_depth, sub_depth)
+
+    return cost, max_depth
+
+
+def query_cost(schema, document, variables: Optional[Dict[str, Any]] = None,
+               operation_name: Optional[str] = None) -> Tuple[int, int]:
+    """(cost, depth) of the operation that will run, worst case for list sizes."""
+    fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if operation_name:
+        operations = [op for op in operations if op.name and op.name.value == operation_name]
+    if not operations:
+        return 0, 0
+
+    operation = operations[0]
+    root_type = schema.get_root_type(operation.operation)
+    return _selection_cost(schema, root_type, operation.selection_set, fragments, variables or {}, 0)
+
+
+class QueryCostLimiter(SchemaExtension):
+    """Reject operations above GRAPHQL_MAX_COST / GRAPHQL_MAX_DEPTH before any resolver runs."""
+
+    def on_execute(self) -> Iterator[None]:
+        ctx = self.execution_context
+        if ctx.result is None and ctx.graphql_document is not None:
+            cost, depth = query_cost(ctx.schema._schema, ctx.graphql_document, ctx.variables, ctx.operation_name)
+            if depth > GRAPHQL_MAX_DEPTH:
+                ctx.result = _rejected(f"Query depth {depth} exceeds the limit of {GRAPHQL_MAX_DEPTH}.")
+            elif cost > GRAPHQL_MAX_COST:
+                ctx.result = _rejected(
+                    f"Query cost {cost} exceeds the limit of {GRAPHQL_MAX_COST}; lower the `limit` arguments."
+                )
+        yield
+
+
+# ------------------------------------------------------------------------------
+# DOCUMENT CACHE (skip parsing + validation for repeated query text)
+# ------------------------------------------------------------------------------
+# Extensions are instantiated per request, so the caches live at module level
+_parse_cached = lru_cache(maxsize=GRAPHQL_DOCUMENT_CACHE_SIZE)(parse_document)
+_validate_cached = lru_cache(maxsize=GRAPHQL_DOCUMENT_CACHE_SIZE)(validate_document)
+
+
+class DocumentCache(SchemaExtension):
+    """LRU-cached parse and validation, keyed by query text (persisted queries always hit)."""
+
+    def on_parse(self) -> Iterator[None]:
+        ctx = self.execution_context
+        if ctx.graphql_document is None and ctx.query:
+            ctx.graphql_document = _parse_cached(ctx.query)
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        ctx = self.execution_context
+        ctx.errors = _validate_cached(ctx.schema._schema, ctx.graphql_document, tuple(ctx.validation_rules))
+        yield
+
+
+# ------------------------------------------------------------------------------
+# PERSISTED QUERIES (sha256 → document)
+# ------------------------------------------------------------------------------
+class PersistedQueryNotFound(Exception):
+    pass
+
+
+class PersistedQueryStore:
+    """
+    Known queries by sha256 of their text.
+
+    Entries come from GRAPHQL_PERSISTED_QUERIES_FILE (kept forever) or are
+    registered on first use by clients following the automatic persisted
+    query protocol (LRU-bounded).
+    """
+
+    def __init__(self, path: str = GRAPHQL_PERSISTED_QUERIES_FILE, max_entries: int = GRAPHQL_PERSISTED_QUERIES_MAX):
+        self.max_entries = max_entries
+        self._pinned: Dict[str, str] = {}
+        self._registered: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    def load(self, path: str):
+        with open(path) as f:
+            queries = json.load(f)
+        for digest, query in queries.items():
+            if query_hash(query) != digest:
+                raise ValueError(f"Persisted query {digest} does not match its sha256")
+            self._pinned[digest] = query
+        logger.info(f"Loaded {len(queries)} persisted GraphQL queries from {path}")
+
+    def get(self, digest: str) -> Optional[str]:
+        query = self._pinned.get(digest)
+        if query is not None:
+            return query
+        with self._lock:
+            query = self._registered.get(digest)
+            if query is not None:
+                self._registered.move_to_end(digest)
+            return query
+
+    def register(self, digest: str, query: str):
+        if query_hash(query) != digest:
+            raise ValueError("provided sha does not match query")
+        if digest in self._pinned:
+            return
+        with self._lock:
+            self._registered[digest] = query
+            self._registered.move_to_end(digest)
+            while len(self._registered) > self.max_entries:
+                self._registered.popitem(last=False)
+
+
+persisted_queries = PersistedQueryStore()
+
+
+# ------------------------------------------------------------------------------
+# RESPONSE CACHE (anonymous, read-only)
+# ------------------------------------------------------------------------------
+class ResponseCache:
+    """Short-TTL LRU of execution results; cleared by writes (add_review)."""
+
+    def __init__(self, ttl: float = GRAPHQL_CACHE_TTL_SECONDS, max_entries: int = GRAPHQL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[float, GraphQLExecutionResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[GraphQLExecutionResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def set(self, key, result: GraphQLExecutionResult):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+class AnonymousResponseCache(SchemaExtension):
+    """Serve repeated anonymous queries from response_cache for GRAPHQL_CACHE_TTL_SECONDS."""
+
+    def _key(self):
+        ctx = self.execution_context
+        if response_cache.ttl <= 0 or ctx.result is not None or not ctx.query:
+            return None
+        if ctx.operation_type != OperationType.QUERY:
+            return None
+        request = (ctx.context or {}).get("request")
+        if request is None or request.session.get("user"):
+            return None
+        variables = json.dumps(ctx.variables or {}, sort_keys=True, default=str)
+        return query_hash(ctx.query), variables, ctx.operation_name
+
+    def on_execute(self) -> Iterator[None]:
+        ctx = self.execution_context
+        key = self._key()
+        if key is not None:
+            cached = response_cache.get(key)
+            if cached is not None:
+                ctx.result = cached
+                key = None
+        yield
+        if key is not None and ctx.result is not None and not ctx.result.errors:
+            response_cache.set(key, ctx.result)
@@ -1,15 +1,33 @@
 import strawberry
-from typing import List, Optional
+import json
+import os
+from collections import defaultdict
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 
 from sqlmodel import Session, select
-from sqlalchemy import literal
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from strawberry.dataloader import DataLoader
 from strawberry.fastapi import GraphQLRouter
 from strawberry.exceptions import GraphQLError
+from strawberry.http.exceptions import HTTPException
 from fastapi import Request
+from fastapi.responses import JSONResponse
 
 from app.core.db import engine
+from app.core.menu_catalog import menu_catalog
+from app.core.rating_stats import record_rating
+from app.graphql.extensions import (
+    AnonymousResponseCache,
+    DocumentCache,
+    PersistedQueryNotFound,
+    QueryCostLimiter,
+    persisted_queries,
+    response_cache,
+)
 from app.models.postgres.menu import MenuItem
 from app.models.postgres.review import Review
 from app.models.postgres.user import User
@@ -51,28 +69,67 @@ class MenuItemType:
     image_url: Optional[str]
 
     @strawberry.field
-    def reviews(self, info, limit: int = 10, offset: int = 0) -> List[ReviewType]:
-        with Session(engine) as session:
-            rows = session.exec(
-                select(Review, User)
-                .join(User, User.id == Review.user_id, isouter=True)
-                .where(Review.menu_item_id == UUID(str(self.id)))
-                .order_by(Review.created_at.desc())
-                .offset(offset)
-                .limit(limit)
-            ).all()
-            results: List[ReviewType] = []
-            for review, user in rows:
-                results.append(
-                    ReviewType(
-                        id=str(review.id),
-                        rating=review.rating,
-                        comment=review.comment,
-                        created_at=review.created_at,
-                        user=UserLite(id=str(user.id), email=user.email, name=_user_name(user)) if user else UserLite(id="unknown", email="", name="Guest"),
-                    )
-                )
-            return results
+    async def reviews(self, info, limit: int = 10, offset: int = 0) -> List[ReviewType]:
+        # Batched: every menu item in the response shares one windowed query
+        return await info.context["review_loader"].load((str(self.id), limit, offset))
+
+
+def _to_review(review: Review, user: Optional[User]) -> ReviewType:
+    return ReviewType(
+        id=str(review.id),
+        rating=review.rating,
+        comment=review.comment,
+        created_at=review.created_at,
+        user=UserLite(id=str(user.id), email=user.email, name=_user_name(user)) if user else UserLite(id="unknown", email="", name="Guest"),
+    )
+
+
+def fetch_reviews(session, menu_item_ids: Sequence[UUID], limit: int, offset: int) -> Dict[str, List[ReviewType]]:
+    """
+    Newest-first reviews for many menu items in one query.
+
+    ROW_NUMBER() OVER (PARTITION BY menu_item_id ORDER BY created_at DESC)
+    applies limit/offset per item instead of per result set.
+    """
+    position = func.row_number().over(
+        partition_by=Review.menu_item_id,
+        order_by=(Review.created_at.desc(), Review.id),
+    ).label("position")
+    ranked = (
+        select(Review, position)
+        .where(Review.menu_item_id.in_(list(menu_item_ids)))
+        .subquery()
+    )
+    ranked_review = aliased(Review, ranked)
+
+    rows = session.exec(
+        select(ranked_review, User)
+        .join(User, User.id == ranked_review.user_id, isouter=True)
+        .where(ranked.c.position > offset, ranked.c.position <= offset + limit)
+        .order_by(ranked.c.menu_item_id, ranked.c.position)
+    ).all()
+
+    grouped: Dict[str, List[ReviewType]] = defaultdict(list)
+    for review, user in rows:
+        grouped[str(review.menu_item_id)].append(_to_review(review, user))
+    return grouped
+
+
+ReviewKey = Tuple[str, int, int]  # (menu_item_id, limit, offset)
+
+
+async def load_reviews(session, keys: List[ReviewKey]) -> List[List[ReviewType]]:
+    """DataLoader batch function: one query per distinct (limit, offset) pair."""
+    by_page: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+    for menu_item_id, limit, offset in keys:
+        by_page[(limit, offset)].append(menu_item_id)
+
+    results: Dict[ReviewKey, List[ReviewType]] = {}
+    for (limit, offset), ids in by_page.items():
+        grouped = fetch_reviews(session, [UUID(i) for i in ids], limit, offset)
+        for menu_item_id in ids:
+            results[(menu_item_id, limit, offset)] = grouped.get(menu_item_id, [])
+    return [results[key] for key in keys]
 
 
 def _to_menu_item(mi: MenuItem) -> MenuItemType:
@@ -92,60 +149,36 @@ def _to_menu_item(mi: MenuItem) -> MenuItemType:
 @strawberry.type
 class Query:
     @strawberry.field
-    def menu_item(self, id: strawberry.ID) -> Optional[MenuItemType]:
-        with Session(engine) as session:
-            mi = session.get(MenuItem, UUID(str(id)))
-            if not mi:
-                return None
-            return _to_menu_item(mi)
+    def menu_item(self, info, id: strawberry.ID) -> Optional[MenuItemType]:
+        mi = menu_catalog.get(info.context["session"], UUID(str(id)))
+        if not mi:
+            return None
+        return _to_menu_item(mi)
 
     @strawberry.field
     def menu_items(
         self,
+        info,
         category: Optional[str] = None,
         tags: Optional[List[str]] = None,
         limit: int = 20,
         offset: int = 0,
     ) -> List[MenuItemType]:
-        with Session(engine) as session:
-            query = select(MenuItem).where(MenuItem.is_available == True)  # noqa: E712
-            if category:
-                query = query.where(MenuItem.category == category)
-            if tags:
-                # Require each tag to be present; use ANY for compatibility
-                for tag in tags:
-                    query = query.where(MenuItem.tags.any(tag))
-            items = session.exec(query.offset(offset).limit(limit)).all()
-            return [_to_menu_item(mi) for mi in items]
+        # Require every tag to be present (catalog index, or tags @> ARRAY[...] on the GIN index)
+        items = menu_catalog.list_available(
+            info.context["session"], category=category, tags=tags, offset=offset, limit=limit
+        )
+        return [_to_menu_item(mi) for mi in items]
 
     @strawberry.field
-    def reviews(
+    async def reviews(
         self,
+        info,
         menu_item_id: strawberry.ID,
         limit: int = 20,
         offset: int = 0,
     ) -> List[ReviewType]:
-        with Session(engine) as session:
-            rows = session.exec(
-                select(Review, User)
-                .join(User, User.id == Review.user_id, isouter=True)
-                .where(Review.menu_item_id == UUID(str(menu_item_id)))
-                .order_by(Review.created_at.desc())
-                .offset(offset)
-                .limit(limit)
-            ).all()
-            results: List[ReviewType] = []
-            for review, user in rows:
-                results.append(
-                    ReviewType(
-                        id=str(review.id),
-                        rating=review.rating,
-                        comment=review.comment,
-                        created_at=review.created_at,
-                        user=UserLite(id=str(user.id), email=user.email, name=_user_name(user)) if user else UserLite(id="unknown", email="", name="Guest"),
-                    )
-                )
-            return results
+        return await info.context["review_loader"].load((str(UUID(str(menu_item_id))), limit, offset))
 
 
 @strawberry.type
@@ -160,59 +193,135 @@ class Mutation:
         if rating < 1 or rating > 5:
             raise GraphQLError("Rating must be between 1 and 5.")
 
-        with Session(engine) as session:
-            mi = session.get(MenuItem, UUID(str(menu_item_id)))
-            if not mi:
-                raise GraphQLError("Menu item not found.")
-
-            user = session.get(User, UUID(str(user_session["id"])))
-            if not user:
-                raise GraphQLError("User not found.")
-
-            # Upsert: update existing review if present
-            existing = session.exec(
-                select(Review).where(
-                    Review.user_id == user.id,
-                    Review.menu_item_id == mi.id
-                )
-            ).first()
-
-            if existing:
-                existing.rating = rating
-                existing.comment = comment
-                existing.created_at = datetime.utcnow()
-                review_obj = existing
-            else:
-                review_obj = Review(
-                    user_id=user.id,
-                    menu_item_id=mi.id,
-                    rating=rating,
-                    comment=comment,
-                    created_at=datetime.utcnow(),
-                )
-                session.add(review_obj)
-
-            session.commit()
-            session.refresh(review_obj)
-
-            return ReviewType(
-                id=str(review_obj.id),
-                rating=review_obj.rating,
-                comment=review_obj.comment,
-                created_at=review_obj.created_at,
-                user=UserLite(id=str(user.id), email=user.email, name=_user_name(user)),
-            )
+        session = info.context["session"]
+        mi = session.get(MenuItem, UUID(str(menu_item_id)))
+        if not mi:
+            raise GraphQLError("Menu item not found.")
 
+        user = session.get(User, UUID(str(user_session["id"])))
+        if not user:
+            raise GraphQLError("User not found.")
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+        # Upsert: update existing review if present
+        existing = session.exec(
+            select(Review).where(
+                Review.user_id == user.id,
+                Review.menu_item_id == mi.id
+            )
+        ).first()
+
+        if existing:
+            previous_rating = existing.rating
+            existing.rating = rating
+            existing.comment = comment
+            existing.created_at = datetime.utcnow()
+            review_obj = existing
+        else:
+            previous_rating = None
+            review_obj = Review(
+                user_id=user.id,
+                menu_item_id=mi.id,
+                rating=rating,
+                comment=comment,
+                created_at=datetime.utcnow(),
+            )
+            session.add(review_obj)
+
+        record_rating(session, mi.id, rating, previous_rating)
+        session.commit()
+        session.refresh(review_obj)
+        # Cached anonymous responses may embed the old reviews
+        response_cache.clear()
+
+        return ReviewType(
+            id=str(review_obj.id),
+            rating=review_obj.rating,
+            comment=review_obj.comment,
+            created_at=review_obj.created_at,
+            user=UserLite(id=str(user.id), email=user.email, name=_user_name(user)),
+        )
+
+
+# Serve GraphiQL on GET /graphql (set GRAPHQL_GRAPHIQL=false in production)
+GRAPHQL_GRAPHIQL = os.getenv("GRAPHQL_GRAPHIQL", "true").lower() in ("1", "true", "yes")
+
+# Extension classes (not instances): strawberry creates them per request
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[DocumentCache, QueryCostLimiter, AnonymousResponseCache],
+)
 
 
 async def get_context(request: Request):
-    return {"request": request}
-
-
-graphql_router = GraphQLRouter(
+    """
+    Per-request context: one Session for every resolver and a review
+    DataLoader bound to it (closed when the response is done).
+    """
+    with Session(engine) as session:
+        yield {
+            "request": request,
+            "session": session,
+            "review_loader": DataLoader(load_fn=partial(load_reviews, session)),
+        }
+
+
+class PersistedQueryRouter(GraphQLRouter):
+    """
+    GraphQLRouter with automatic persisted queries.
+
+    Clients send {"extensions": {"persistedQuery": {"version": 1,
+    "sha256Hash": "..."}}} without a query. Unknown hashes answer
+    PersistedQueryNotFound, and the client retries once with the full
+    query, which registers it.
+    """
+
+    async def _request_extensions(self, request) -> dict:
+        if "application/json" in (request.content_type or ""):
+            data = self.parse_json(await request.get_body())
+            extensions = data.get("extensions") if isinstance(data, dict) else None
+        else:
+            extensions = request.query_params.get("extensions")
+        if isinstance(extensions, str):
+            extensions = json.loads(extensions)
+        return extensions or {}
+
+    def should_render_graphiql(self, request) -> bool:
+        # A hash-only GET has no `query` param but is not a browser visit
+        return request.query_params.get("extensions") is None and super().should_render_graphiql(request)
+
+    async def parse_http_body(self, request):
+        request_data = await super().parse_http_body(request)
+        persisted = (await self._request_extensions(request)).get("persistedQuery")
+        if not persisted:
+            return request_data
+
+        digest = persisted.get("sha256Hash") or ""
+        if request_data.query:
+            try:
+                persisted_queries.register(digest, request_data.query)
+            except ValueError as e:
+                raise HTTPException(400, str(e))
+            return request_data
+
+        query = persisted_queries.get(digest)
+        if query is None:
+            raise PersistedQueryNotFound(digest)
+        request_data.query = query
+        return request_data
+
+    async def run(self, request, context=None, root_value=None, **kwargs):
+        try:
+            return await super().run(request, context=context, root_value=root_value, **kwargs)
+        except PersistedQueryNotFound:
+            return JSONResponse({"errors": [{
+                "message": "PersistedQueryNotFound",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }]})
+
+
+graphql_router = PersistedQueryRouter(
     schema,
     context_getter=get_context,
-    graphiql=True,
+    graphiql=GRAPHQL_GRAPHIQL,
 )
@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import JSON, Index
+from typing import Optional, Dict, Any
+from uuid import UUID, uuid4
+from datetime import datetime
+
+
+class ChatMessage(SQLModel, table=True):
+    """One row per chat message; appended with a per-session sequence number."""
+    __tablename__ = "chat_message"
+    __table_args__ = (
+        Index("idx_chat_message_session_seq", "session_id", "seq", unique=True),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    session_id: str = Field(foreign_key="chat_session.session_id", nullable=False)
+    seq: int = Field(nullable=False)
+    role: str = Field(nullable=False)
+    content: str = Field(nullable=False)
+    # "metadata" is reserved on SQLModel classes, so map it under another attribute name
+    meta: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column("metadata", JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape the JSON conversation_history used to store."""
+        message = {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.created_at.isoformat(),
+        }
+        if self.meta:
+            message["metadata"] = self.meta
+        return message
@@ -10,33 +10,15 @@ class ChatSession(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     session_id: str = Field(index=True, unique=True, nullable=False)
     user_id: Optional[UUID] = Field(default=None, foreign_key="user_account.id")
+    # Legacy JSON history — messages now live in chat_message (see migration 005)
     conversation_history: List[Dict[str, Any]] = Field(default=[], sa_column=Column(JSON))
+    # Highest chat_message.seq for this session, so appends need no MAX() lookup
+    message_count: int = Field(default=0, nullable=False)
     preferences: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
     last_message_at: datetime = Field(default_factory=datetime.utcnow)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(hours=24))
 
-    def add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None):
-        """Add a message to conversation history and keep only last 10 turns (20 messages)"""
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        if metadata:
-            message["metadata"] = metadata
-
-        # Add new message
-        if not self.conversation_history:
-            self.conversation_history = []
-        self.conversation_history.append(message)
-
-        # Keep only last 20 messages (10 turns)
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
-
-        self.last_message_at = datetime.utcnow()
-
     def update_preferences(self, new_prefs: Dict[str, Any]):
         """Merge new preferences with existing ones"""
         if not self.preferences:
@@ -56,12 +38,6 @@ class ChatSession(SQLModel, table=True):
             else:
                 self.preferences[key] = value
 
-    def get_recent_messages(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent conversation messages (returns last N messages)"""
-        if not self.conversation_history:
-            return []
-        return self.conversation_history[-limit:]
-
     def is_expired(self) -> bool:
         """Check if session has expired"""
         return datetime.utcnow() > self.expires_at
@@ -1,12 +1,18 @@
 from sqlmodel import SQLModel, Field
 from typing import List, Optional
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime
 
 class MenuItem(SQLModel, table=True):
     __tablename__ = "menu_item"
+    # GIN indexes for array containment filters (@>), see migration 007
+    __table_args__ = (
+        Index("idx_menu_item_dietary_features_gin", "dietary_features", postgresql_using="gin"),
+        Index("idx_menu_item_flavor_profiles_gin", "flavor_profiles", postgresql_using="gin"),
+        Index("idx_menu_item_tags_gin", "tags", postgresql_using="gin"),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     title: str
     description: str
@@ -0,0 +1,11 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class MenuCatalogVersion(SQLModel, table=True):
+    """Single-row counter bumped by every menu write (see app/core/menu_catalog.py)."""
+    __tablename__ = "menu_catalog_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import datetime
+
+
+class MenuItemRatingStats(SQLModel, table=True):
+    """Per-item review aggregate, maintained by the review write paths (see app/core/rating_stats.py)."""
+    __tablename__ = "menu_item_rating_stats"
+
+    menu_item_id: UUID = Field(primary_key=True, foreign_key="menu_item.id", ondelete="CASCADE")
+    review_count: int = Field(default=0, nullable=False)
+    rating_sum: int = Field(default=0, nullable=False)
+    rating_avg: float = Field(default=0.0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {"count": self.review_count, "sum": self.rating_sum, "avg": round(self.rating_avg, 1)}
@@ -2,11 +2,19 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class Order(SQLModel, table=True):
     __tablename__ = "order"
+    # Keyset-paginated order history (/orders/view), see migration 011
+    __table_args__ = (
+        Index("idx_order_user_created_at", "user_id", "created_at", "id"),
+        # Admin listing / export (GET /orders/, /orders/export), see migration 012
+        Index("idx_order_created_at", "created_at", "id"),
+        Index("idx_order_status_created_at", "status", "created_at", "id"),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: Optional[UUID] = Field(default=None, foreign_key="user_account.id", index=True)
     status: str = Field(default="pending", index=True)
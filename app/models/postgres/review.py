@@ -1,9 +1,14 @@
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from uuid import UUID, uuid4
 
 class Review(SQLModel, table=True):
+    # Newest-first reviews per item (GraphQL batch loader, item page), see migration 010
+    __table_args__ = (
+        Index("idx_review_menu_item_created_at", "menu_item_id", "created_at"),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(nullable=False)
     menu_item_id: UUID = Field(nullable=False)
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel, EmailStr
 from starlette.templating import Jinja2Templates
 from starlette.config import Config
 from datetime import datetime, timedelta
+import asyncio
 import secrets
 
-from app.core.db import get_session
+from app.core.db import get_async_session, get_session
 from app.core.logger import get_logger
+from app.core.user_cache import invalidate_user
 
 logger = get_logger(__name__)
 from app.core.security import (
@@ -152,6 +155,7 @@ def login_form(
     session.commit()
 
     # Set session
+    invalidate_user(user.id)
     request.session["user"] = {
         "id": str(user.id),
         "email": user.email,
@@ -289,6 +293,7 @@ def verify_email(request: Request, token: str, session: Session = Depends(get_se
         session.commit()
 
     # Auto-login
+    invalidate_user(user.id)
     request.session["user"] = {
         "id": str(user.id),
         "email": user.email,
@@ -368,6 +373,7 @@ def api_login(payload: UserLoginRequest, request: Request, session: Session = De
 
     token = create_access_token({"sub": str(user.id), "email": user.email})
 
+    invalidate_user(user.id)
     request.session["user"] = {
         "id": str(user.id),
         "email": user.email,
@@ -431,6 +437,7 @@ async def google_callback(request: Request, session: Session = Depends(get_sessi
     session.add(user)
     session.commit()
 
+    invalidate_user(user.id)
     request.session["user"] = {
         "id": str(user.id),
         "email": user.email,
@@ -529,6 +536,7 @@ async def facebook_callback(request: Request, session: Session = Depends(get_ses
         session.commit()
 
         # Set session
+        invalidate_user(user.id)
         request.session["user"] = {
             "id": str(user.id),
             "email": user.email,
@@ -556,7 +564,7 @@ async def facebook_callback(request: Request, session: Session = Depends(get_ses
 @router.post("/forgot_password")
 async def forgot_password(
         request: Request,
-        session: Session = Depends(get_session)
+        session: AsyncSession = Depends(get_async_session)
 ):
     try:
         data = await request.json()
@@ -570,7 +578,7 @@ async def forgot_password(
 
         logger.debug(f"Password reset requested for: {email}")
 
-        user = session.exec(select(User).where(User.email == email)).first()
+        user = (await session.exec(select(User).where(User.email == email))).first()
 
         if user:
             logger.debug(f"User found: {user.email}")
@@ -587,7 +595,7 @@ async def forgot_password(
             )
 
             session.add(reset_token_record)
-            session.commit()  # ✅ CRITICAL: COMMIT THE TRANSACTION
+            await session.commit()  # ✅ CRITICAL: COMMIT THE TRANSACTION
             logger.debug("Reset token created and committed to database")
 
             # Create reset URL
@@ -596,7 +604,7 @@ async def forgot_password(
 
             # Send email
             try:
-                send_password_reset_email(user.email, reset_url)
+                await asyncio.to_thread(send_password_reset_email, user.email, reset_url)
                 logger.info(f"Password reset email sent to {user.email}")
             except Exception as email_error:
                 logger.warning(f"Failed to send email: {email_error}")
@@ -614,7 +622,7 @@ async def forgot_password(
     except Exception as e:
         logger.error(f"Error in forgot_password: {e}", exc_info=True)
 
-        session.rollback()
+        await session.rollback()
         return JSONResponse({
             "success": True,  # Still return success for security
             "message": "If an account exists with this email, a reset link has been sent."
@@ -683,7 +691,7 @@ async def reset_password(
         request: Request,
         token: str = Form(...),
         new_password: str = Form(...),
-        session: Session = Depends(get_session)
+        session: AsyncSession = Depends(get_async_session)
 ):
     try:
         logger.debug(f"Password reset attempt with token: {token}")
@@ -695,12 +703,12 @@ async def reset_password(
             }, status_code=400)
 
         # Find valid reset token
-        reset_token_record = session.exec(
+        reset_token_record = (await session.exec(
             select(PasswordResetToken)
             .where(PasswordResetToken.token == token)
             .where(PasswordResetToken.is_used == False)
             .where(PasswordResetToken.expires_at > datetime.utcnow())
-        ).first()
+        )).first()
 
         if not reset_token_record:
             logger.warning("Invalid or expired reset token")
@@ -710,7 +718,7 @@ async def reset_password(
             }, status_code=400)
 
         # Get user
-        user = session.get(User, reset_token_record.user_id)
+        user = await session.get(User, reset_token_record.user_id)
         if not user:
             logger.warning("User not found for reset token")
             return JSONResponse({
@@ -726,22 +734,22 @@ async def reset_password(
                 status_code=400,
             )
 
-        # Update password
-        user.password_hash = hash_password(new_password)
+        # Update password (bcrypt is CPU-bound; keep it off the event loop)
+        user.password_hash = await asyncio.to_thread(hash_password, new_password)
 
         # Mark token as used
         reset_token_record.is_used = True
 
         session.add(user)
         session.add(reset_token_record)
-        session.commit()
+        await session.commit()
 
         logger.info("Password reset successful")
 
         # Send confirmation email (best-effort)
         try:
             logger.info(f"Sending password-changed email to {user.email}")
-            send_password_changed_email(user.email, user.first_name)
+            await asyncio.to_thread(send_password_changed_email, user.email, user.first_name)
         except Exception as email_error:
             logger.warning(f"Failed to send password change email: {email_error}")
 
@@ -755,7 +763,7 @@ async def reset_password(
 
     except Exception as e:
         logger.error(f"Error in reset_password: {e}", exc_info=True)
-        session.rollback()
+        await session.rollback()
         return templates.TemplateResponse("reset_password.html", {
             "request": request,
             "token": token,
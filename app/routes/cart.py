@@ -1,17 +1,14 @@
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlmodel import Session, select
-from uuid import uuid4
-from datetime import datetime
+from sqlmodel import Session
 
 from app.core.db import engine
 from app.core.logger import get_logger
+from app.core import order_writer
+from app.core.menu_catalog import menu_catalog
 
 logger = get_logger(__name__)
-from app.models.postgres.menu import MenuItem
-from app.models.postgres.order import Order
-from app.models.postgres.order_item import OrderItem
 from app.models.postgres.user import User
 from app.core.send_email import (
     send_order_confirmation_email,
@@ -65,9 +62,7 @@ def view_cart_page(request: Request):
 
     if item_ids:
         with Session(engine) as session:
-            results = session.exec(
-                select(MenuItem).where(MenuItem.id.in_(item_ids))
-            ).all()
+            results = menu_catalog.get_many(session, item_ids)
 
             for item in results:
                 qty = cart.get(str(item.id), 0)
@@ -176,9 +171,7 @@ def checkout_page(request: Request):
         return RedirectResponse("/menu/view", status_code=303)
 
     with Session(engine) as session:
-        items = session.exec(
-            select(MenuItem).where(MenuItem.id.in_(cart.keys()))
-        ).all()
+        items = menu_catalog.get_many(session, cart.keys())
 
         detailed_cart = [
             {"title": i.title, "price": i.price, "qty": cart.get(str(i.id), 0)}
@@ -294,55 +287,31 @@ def process_checkout(
             user.default_phone = phone_clean
         session.add(user)
 
-        items = session.exec(
-            select(MenuItem).where(MenuItem.id.in_(cart.keys()))
-        ).all()
-
-        cart_items = []
-        original_total = 0
-        total = 0  # after 100% discount
-
-        for item in items:
-            qty = cart.get(str(item.id), 0)
-            subtotal = item.price * qty
-            original_total += subtotal
-
-            cart_items.append({
-                "title": item.title,
-                "qty": qty,
-                "price": item.price,
-                "subtotal": subtotal,
-                "menu_item_id": str(item.id)
-            })
-
-        # Create order
-        order = Order(
-            id=uuid4(),
-            user_id=user_id,
-            total=total,
+        # Items that left the menu since they were carted are dropped
+        order, order_items = order_writer.create_order(
+            session,
+            user.id,
+            cart.items(),
             status="confirmed",
-            created_at=datetime.utcnow()
+            total=0,  # after 100% discount
+            ignore_missing=True,
         )
-
-        session.add(order)
-        session.commit()  # Commit to get order ID
-        session.refresh(order)
-        order_id = str(order.id)
-
-        # Create order items individually (FIXED - no relationship assignment)
-        for ci in cart_items:
-            order_item = OrderItem(
-                id=uuid4(),
-                order_id=order.id,
-                menu_item_id=ci["menu_item_id"],
-                title=ci["title"],
-                unit_price=ci["price"],
-                quantity=ci["qty"]
-            )
-            session.add(order_item)
-
-        # Commit all order items
+        # User defaults, order and items land in one commit
         session.commit()
+        order_id = str(order.id)
+        total = order.total
+
+    cart_items = [
+        {
+            "title": oi.title,
+            "qty": oi.quantity,
+            "price": oi.unit_price,
+            "subtotal": oi.unit_price * oi.quantity,
+            "menu_item_id": str(oi.menu_item_id),
+        }
+        for oi in order_items
+    ]
+    original_total = sum(ci["subtotal"] for ci in cart_items)
 
     # Build order link for emails
     base_url = str(request.base_url).rstrip("/")
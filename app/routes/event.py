@@ -15,6 +15,7 @@ from app.core.logger import get_logger
 logger = get_logger(__name__)
 
 from app.core.db import engine
+from app.core.event_notify import notify_jobs
 from app.core.send_email import send_email
 from app.models.postgres.event import Event, EventRSVP
 from app.utils.s3_util import upload_file_to_s3
@@ -205,21 +206,26 @@ def notify_event_attendees(
         if not event:
             raise HTTPException(404, "Event not found")
 
-        rsvps = session.exec(
-            select(EventRSVP).where(EventRSVP.event_id == event_id)
+        recipients = session.exec(
+            select(EventRSVP.email, EventRSVP.name).where(EventRSVP.event_id == event_id)
         ).all()
 
-    # Send email to each RSVP
-    from app.core.send_email import send_event_notice
-
-    sent = 0
-    for r in rsvps:
-        try:
-            send_event_notice(r.email, event.title, message)
-            sent += 1
-        except Exception as e:
-            logger.warning(f"Failed to send to {r.email}: {e}")
+    # Bulk templated sends run in the background; poll /events/notify/jobs/{id}
+    job = notify_jobs.start(event.id, event.title, message, recipients)
     return RedirectResponse(
-        f"/events?notified={sent}",
+        f"/events?update_sent={job.total}&notify_job={job.id}",
         status_code=303
     )
+
+
+# ======================================================
+# Admin: Poll an Update Fan-out Job
+# ======================================================
+@router.get("/notify/jobs/{job_id}")
+def notify_job_status(job_id: str, request: Request):
+    require_admin(request)
+
+    job = notify_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Notify job not found")
+    return job.to_dict()
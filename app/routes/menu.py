@@ -11,9 +11,9 @@ from fastapi import (
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy import any_
 
 from app.core.logger import get_logger
 
@@ -22,10 +22,15 @@ logger = get_logger(__name__)
 from app.models.postgres.menu import MenuItem
 from app.models.postgres.review import Review
 from app.models.postgres.user import User
-from app.core.db import get_session
+from app.core.db import get_async_session, get_session
 from app.core.security import require_admin
 from app.core.cart_utils import get_cart_count
+from app.core.rating_stats import get_rating_stats
+from app.core.menu_search import search_menu
 from app.utils.s3_util import upload_file_to_s3
+from app.ai.index_sync import enqueue_index_upsert, enqueue_index_delete
+from app.core.featured import invalidate_featured
+from app.core.menu_catalog import bump_catalog_version, invalidate_catalog, menu_catalog
 import os
 
 templates = Jinja2Templates(directory="app/templates")
@@ -39,46 +44,25 @@ S3_BUCKET_IMAGE = os.getenv("S3_BUCKET_IMAGE", "yorkiebakery-image")
 # Public menu view (HTML Page)
 # -------------------------------
 @router.get("/view")
-def view_menu_page(
+async def view_menu_page(
         request: Request,
-        session: Session = Depends(get_session),
+        session: AsyncSession = Depends(get_async_session),
         dietary: List[str] = Query(None)
 ):
     try:
-        # Get all items first
-        all_items = session.exec(select(MenuItem).where(MenuItem.is_available == True)).all()
-
-        # Apply dietary filters in Python if provided
-        if dietary:
-            filtered_items = []
-            for item in all_items:
-                # Check if item has ALL of the requested dietary features (AND logic)
-                if item.dietary_features and all(diet in item.dietary_features for diet in dietary):
-                    filtered_items.append(item)
-            items = filtered_items
-        else:
-            items = all_items
+        # Dietary filters (AND logic): catalog cache index, or
+        # dietary_features @> ARRAY[...] on the GIN index when the cache is off
+        items = await session.run_sync(lambda s: menu_catalog.list_available(s, dietary=dietary))
 
-        # Get review counts and average ratings for all items
+        # Review count + average for every item in one query (menu_item_rating_stats)
+        stats = await session.run_sync(get_rating_stats, [item.id for item in items])
         review_stats = {}
         for item in items:
-            reviews = session.exec(
-                select(Review)
-                .where(Review.menu_item_id == item.id)
-            ).all()
-
-            if reviews:
-                total_rating = sum(r.rating for r in reviews)
-                avg_rating = round(total_rating / len(reviews), 1)
-                review_stats[str(item.id)] = {
-                    "count": len(reviews),
-                    "avg_rating": avg_rating
-                }
-            else:
-                review_stats[str(item.id)] = {
-                    "count": 0,
-                    "avg_rating": 0
-                }
+            row = stats.get(str(item.id))
+            review_stats[str(item.id)] = {
+                "count": row.review_count if row else 0,
+                "avg_rating": round(row.rating_avg, 1) if row else 0,
+            }
 
         cart = request.session.get("cart", {})
         cart_count = sum(cart.values())
@@ -182,8 +166,12 @@ def create_menu_item(
     )
 
     session.add(item)
+    bump_catalog_version(session)
     session.commit()
     session.refresh(item)
+    enqueue_index_upsert(item)
+    invalidate_catalog()
+    invalidate_featured()
 
     # Browser redirect
     if "multipart/form-data" in request.headers.get("content-type", ""):
@@ -196,16 +184,15 @@ def create_menu_item(
 # List menu items (API JSON)
 # -------------------------------
 @router.get("/", response_model=List[MenuItem])
-def list_menu_items(
+async def list_menu_items(
     skip: int = 0,
     limit: int = 20,
     tag: Optional[str] = Query(None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    query = select(MenuItem).where(MenuItem.is_available == True)
-    if tag:
-        query = query.where(MenuItem.tags.contains([tag]))
-    return session.exec(query.offset(skip).limit(limit)).all()
+    return await session.run_sync(
+        lambda s: menu_catalog.list_available(s, tags=[tag] if tag else None, offset=skip, limit=limit)
+    )
 
 
 # -------------------------------
@@ -221,28 +208,27 @@ def search_menu_items(
     flavor: Optional[str] = Query(None),
     min_price: Optional[float] = Query(None),
     max_price: Optional[float] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
 ):
     query = select(MenuItem).where(MenuItem.is_available == True)
 
-    if q:
-        query = query.where(
-            MenuItem.title.ilike(f"%{q}%") |
-            MenuItem.description.ilike(f"%{q}%")
-        )
     if origin:
         query = query.where(MenuItem.origin == origin)
     if category:
         query = query.where(MenuItem.category == category)
+    # Containment (@>) instead of = ANY(...) so the GIN indexes apply
     if dietary:
-        query = query.where(dietary == any_(MenuItem.dietary_features))
+        query = query.where(MenuItem.dietary_features.contains([dietary]))
     if flavor:
-        query = query.where(flavor == any_(MenuItem.flavor_profiles))
+        query = query.where(MenuItem.flavor_profiles.contains([flavor]))
     if min_price is not None:
         query = query.where(MenuItem.price >= min_price)
     if max_price is not None:
         query = query.where(MenuItem.price <= max_price)
 
-    return session.exec(query).all()
+    # Full-text (tsvector / FTS5) ranked by relevance, paginated
+    return search_menu(session, query, q, limit=limit, offset=offset)
 
 
 # -------------------------------
@@ -257,26 +243,25 @@ def admin_new_menu_page(request: Request, user=Depends(require_admin)):
 # Individual menu item detail page (HTML)
 # -------------------------------
 @router.get("/item/{item_id}")
-def view_menu_item_page(
+async def view_menu_item_page(
     item_id: UUID,
     request: Request,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     # Get menu item
-    item = session.get(MenuItem, item_id)
+    item = await session.run_sync(menu_catalog.get, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     # Get reviews with user info
-    reviews_query = session.exec(
+    reviews_query = (await session.exec(
         select(Review, User)
         .join(User, Review.user_id == User.id)
         .where(Review.menu_item_id == item_id)
         .order_by(Review.created_at.desc())
-    ).all()
+    )).all()
 
     reviews = []
-    total_rating = 0
     for review, user in reviews_query:
         reviews.append({
             "rating": review.rating,
@@ -285,9 +270,10 @@ def view_menu_item_page(
             "user_name": f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email.split('@')[0],
             "avatar_url": user.avatar_url or "/static/images/default_user_profile.jpg",
         })
-        total_rating += review.rating
 
-    avg_rating = round(total_rating / len(reviews), 1) if reviews else 0
+    stats = (await session.run_sync(get_rating_stats, [item_id])).get(str(item_id))
+    avg_rating = round(stats.rating_avg, 1) if stats else 0
+    review_count = stats.review_count if stats else 0
 
     cart_count = get_cart_count(request)
     logged_in_user = request.session.get("user")
@@ -299,7 +285,7 @@ def view_menu_item_page(
             "item": item,
             "reviews": reviews,
             "avg_rating": avg_rating,
-            "review_count": len(reviews),
+            "review_count": review_count,
             "cart_count": cart_count,
             "user": logged_in_user,
         },
@@ -310,8 +296,8 @@ def view_menu_item_page(
 # Get item by ID (API JSON)
 # -------------------------------
 @router.get("/{item_id}", response_model=MenuItem)
-def get_menu_item(item_id: UUID, session: Session = Depends(get_session)):
-    item = session.get(MenuItem, item_id)
+async def get_menu_item(item_id: UUID, session: AsyncSession = Depends(get_async_session)):
+    item = await session.run_sync(menu_catalog.get, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     return item
@@ -400,8 +386,12 @@ def update_menu_item(
         # Append new gallery images to existing list
         item.gallery_urls = existing_gallery + new_gallery
 
+    bump_catalog_version(session)
     session.commit()
     session.refresh(item)
+    enqueue_index_upsert(item)
+    invalidate_catalog()
+    invalidate_featured()
     return item
 
 
@@ -418,5 +408,9 @@ def delete_menu_item(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     session.delete(item)
+    bump_catalog_version(session)
     session.commit()
+    enqueue_index_delete(item_id)
+    invalidate_catalog()
+    invalidate_featured()
     return {"detail": "Item deleted"}
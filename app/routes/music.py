@@ -3,6 +3,7 @@ from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session, select
 from app.core.db import engine
+from app.core.featured import invalidate_featured
 from app.models.postgres.music import MusicTrack
 from app.utils.s3_util import upload_file_to_s3
 from app.core.security import require_admin
@@ -122,5 +123,6 @@ async def upload_track(
         )
         session.add(track)
         session.commit()
+    invalidate_featured()
 
     return RedirectResponse("/music/listen", status_code=303)
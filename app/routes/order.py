@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Body
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Body
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from uuid import UUID
 from sqlmodel import Session, select
-from typing import List, Dict, Any
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime
+from typing import List, Dict, Any, Optional
 
-from app.core.db import get_session
+from app.core.db import get_async_session, get_session
+from app.core.order_export import ORDER_LIST_PAGE_SIZE, export_lines, iter_order_rows, order_list_page, order_list_query
+from app.core.order_history import ORDER_HISTORY_PAGE_SIZE, decode_cursor, group_order_rows, order_history_query
 from app.models.postgres.order import Order
 from app.models.postgres.order_item import OrderItem
-from app.models.postgres.menu import MenuItem
+from app.core import order_writer
 from app.models.postgres.user import User
+from app.core.security import require_admin
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 templates = Jinja2Templates(directory="app/templates")
@@ -22,63 +27,65 @@ templates = Jinja2Templates(directory="app/templates")
 # /orders/view  ← THIS MUST COME BEFORE {order_id}
 # -----------------------------------------------
 @router.get("/view")
-def orders_view_page(request: Request, session: Session = Depends(get_session)):
+async def orders_view_page(
+    request: Request,
+    before: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(ORDER_HISTORY_PAGE_SIZE, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+):
     user_session = request.session.get("user")
-    if not user_session:
-        # No logged in session → redirect to login
+    try:
+        # Session stores the id as a string; bind it as a UUID (portable across DBs)
+        user_id = UUID(str(user_session["id"])) if user_session else None
+    except (KeyError, TypeError, ValueError):
+        user_id = None  # malformed or legacy session cookie
+    if user_id is None:
+        # No usable logged in session → redirect to login
         return RedirectResponse("/auth/login?redirect_url=/cart/checkout", status_code=303)
 
-    user_id = user_session["id"]
-
-    # Fetch user's orders
-    orders = session.exec(
-        select(Order).where(Order.user_id == user_id).order_by(Order.created_at.desc())
-    ).all()
-
-    # Manually fetch items for each order
-    orders_with_items = []
-    for order in orders:
-        order_items = session.exec(
-            select(OrderItem).where(OrderItem.order_id == order.id)
-        ).all()
-
-        # Convert UUIDs to strings for template compatibility
-        order_dict = {
-            "id": str(order.id),  # Convert UUID to string
-            "user_id": str(order.user_id),
-            "status": order.status,
-            "created_at": order.created_at,
-            "total": order.total
-        }
+    keyset = decode_cursor(before) if before else None
+    if before and keyset is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        # Convert order item UUIDs to strings
-        items_list = []
-        for item in order_items:
-            item_dict = {
-                "id": str(item.id),
-                "order_id": str(item.order_id),
-                "menu_item_id": str(item.menu_item_id),
-                "title": item.title,
-                "unit_price": item.unit_price,
-                "quantity": item.quantity
-            }
-            items_list.append(item_dict)
-
-        orders_with_items.append({
-            "order": order_dict,  # Use the converted dictionary
-            "items": items_list  # Use the converted list
-        })
+    # One page of orders and their items in a single query
+    rows = (await session.exec(order_history_query(user_id, limit, keyset))).all()
+    orders_with_items, next_cursor = group_order_rows(rows, limit)
 
     return templates.TemplateResponse(
         "order.html",
         {
             "request": request,
             "orders_with_items": orders_with_items,
+            "next_cursor": next_cursor,
+            "is_first_page": keyset is None,
             "user": user_session,
         }
     )
 
 
+# -----------------------------------------------
+# Export orders (admin) as NDJSON or CSV, streamed
+# /orders/export  ← MUST COME BEFORE {order_id}
+# -----------------------------------------------
+@router.get("/export")
+def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    user=Depends(require_admin),
+):
+    # Rows are read through a server-side cursor and written as they arrive
+    lines = export_lines(format, iter_order_rows(status, created_from, created_to))
+    if format == "csv":
+        return StreamingResponse(
+            lines,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="orders.csv"'},
+        )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 # -----------------------------------------------
 # Create Order (API) - FIXED VERSION
 # -----------------------------------------------
@@ -95,41 +102,16 @@ def create_order(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Create order first
-    order = Order(user_id=str(user_id), total=0.0, status="pending")
-    session.add(order)
-    session.commit()  # Commit to get order.id
-    session.refresh(order)
-
-    total_cost = 0.0
-
-    # Create order items individually (FIXED - no relationship assignment)
-    for item in items:
-        menu_item_id = item.get("menu_item_id")
-        qty = item.get("quantity", 1)
-
-        menu_item = session.get(MenuItem, menu_item_id)
-        if not menu_item:
-            raise HTTPException(status_code=404, detail=f"Menu item not found: {menu_item_id}")
-
-        cost = menu_item.price * qty
-        total_cost += cost
-
-        # Create and add each order item
-        order_item = OrderItem(
-            order_id=order.id,
-            menu_item_id=menu_item.id,
-            title=menu_item.title,
-            unit_price=menu_item.price,
-            quantity=qty
+    # Priced with one catalog lookup, written with one commit
+    try:
+        order, _ = order_writer.create_order(
+            session,
+            user_id,
+            [(item.get("menu_item_id"), item.get("quantity", 1)) for item in items],
         )
-        session.add(order_item)
-
-    # Update order total
-    order.total = total_cost
-    session.add(order)
+    except order_writer.UnknownMenuItem as e:
+        raise HTTPException(status_code=404, detail=str(e))
     session.commit()
-    session.refresh(order)
 
     return order
 
@@ -139,15 +121,15 @@ def create_order(
 # /orders/{order_id}
 # -----------------------------------------------
 @router.get("/{order_id}")
-def get_order(order_id: UUID, session: Session = Depends(get_session)):
-    order = session.get(Order, order_id)
+async def get_order(order_id: UUID, session: AsyncSession = Depends(get_async_session)):
+    order = await session.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
     # Get order items separately since relationship might not work
-    order_items = session.exec(
+    order_items = (await session.exec(
         select(OrderItem).where(OrderItem.order_id == order_id)
-    ).all()
+    )).all()
 
     return {
         "order": order,
@@ -159,12 +141,12 @@ def get_order(order_id: UUID, session: Session = Depends(get_session)):
 # Order Detail Page - FIXED: Convert UUIDs for template
 # -----------------------------------------------
 @router.get("/{order_id}/detail")
-def order_detail_page(order_id: UUID, request: Request, session: Session = Depends(get_session)):
+async def order_detail_page(order_id: UUID, request: Request, session: AsyncSession = Depends(get_async_session)):
     user_session = request.session.get("user")
     if not user_session:
         return RedirectResponse("/auth/login?redirect_url=/cart/checkout", status_code=303)
 
-    order = session.get(Order, order_id)
+    order = await session.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
@@ -173,9 +155,9 @@ def order_detail_page(order_id: UUID, request: Request, session: Session = Depen
         raise HTTPException(status_code=403, detail="Not authorized")
 
     # Get order items manually
-    order_items = session.exec(
+    order_items = (await session.exec(
         select(OrderItem).where(OrderItem.order_id == order_id)
-    ).all()
+    )).all()
 
     # Convert UUIDs to strings for template
     order_dict = {
@@ -215,18 +197,32 @@ def order_detail_page(order_id: UUID, request: Request, session: Session = Depen
 # (MUST be above single order lookup)
 # -----------------------------------------------
 @router.get("/user/{user_id}", response_model=List[Order])
-def list_orders_by_user(user_id: UUID, session: Session = Depends(get_session)):
-    return session.exec(
-        select(Order).where(Order.user_id == str(user_id))
-    ).all()
+async def list_orders_by_user(user_id: UUID, session: AsyncSession = Depends(get_async_session)):
+    return (await session.exec(
+        select(Order).where(Order.user_id == user_id)
+    )).all()
 
 
 # -----------------------------------------------
 # List ALL orders (admin)
 # -----------------------------------------------
-@router.get("/", response_model=List[Order])
-def list_orders(session: Session = Depends(get_session)):
-    return session.exec(select(Order)).all()
+@router.get("/")
+async def list_orders(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at"),
+    created_to: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at"),
+    before: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(ORDER_LIST_PAGE_SIZE, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(require_admin),
+):
+    keyset = decode_cursor(before) if before else None
+    if before and keyset is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = (await session.exec(order_list_query(limit, status, created_from, created_to, keyset))).all()
+    orders, next_cursor = order_list_page(rows, limit)
+    return {"orders": orders, "next_cursor": next_cursor}
 
 
 # -----------------------------------------------
@@ -2,13 +2,16 @@ import os
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session
-from app.core.db import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.db import get_async_session, get_session
 from app.core.security import verify_password, hash_password
 from app.models.postgres.user import User
 from fastapi.templating import Jinja2Templates
 from botocore.exceptions import BotoCoreError, ClientError
 from app.core.logger import get_logger
 from app.core.send_email import send_password_changed_email
+from app.core.user_cache import invalidate_user
+import asyncio
 import boto3
 import uuid
 
@@ -103,6 +106,7 @@ def update_name(
     user.last_name = last_name.strip() or None
     session.add(user)
     session.commit()
+    invalidate_user(user.id)
     # refresh session display name
     request.session["user"]["first_name"] = user.first_name or ""
     redirect_url = "/profile?success=name"
@@ -155,6 +159,7 @@ def update_address(
         user.default_phone = None
         session.add(user)
         session.commit()
+        invalidate_user(user.id)
         return RedirectResponse(url="/profile?success=address", status_code=303)
 
     if any(required_fields) and not all(required_fields):
@@ -182,6 +187,7 @@ def update_address(
     user.default_phone = cleaned_address["default_phone"]
     session.add(user)
     session.commit()
+    invalidate_user(user.id)
 
     return RedirectResponse(url="/profile?success=address", status_code=303)
 
@@ -231,6 +237,7 @@ def update_password(
     user.password_hash = hash_password(new_password)
     session.add(user)
     session.commit()
+    invalidate_user(user.id)
 
     # Best-effort confirmation email
     try:
@@ -247,9 +254,9 @@ def update_password(
 async def upload_avatar(
     request: Request,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    user = require_user(request, session)
+    user = await session.run_sync(lambda s: require_user(request, s))
 
     if file.content_type not in ALLOWED_MIME:
         raise HTTPException(status_code=400, detail="Unsupported file type")
@@ -263,7 +270,8 @@ async def upload_avatar(
         raise HTTPException(status_code=400, detail="File too large (max 5MB)")
 
     try:
-        s3_client.put_object(
+        await asyncio.to_thread(
+            s3_client.put_object,
             Bucket=S3_BUCKET_IMAGE,
             Key=key,
             Body=data,
@@ -288,7 +296,8 @@ async def upload_avatar(
 
     user.avatar_url = f"{AVATAR_BASE_URL}/{key}"
     session.add(user)
-    session.commit()
+    await session.commit()
+    invalidate_user(user.id)
 
     # update session avatar
     if "user" in request.session:
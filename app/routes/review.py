@@ -2,9 +2,11 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 from typing import List
-from app.core.db import get_session
+from app.core.db import get_async_session, get_session
+from app.core.rating_stats import record_rating
 from app.models.postgres.review import Review
 from app.models.postgres.user import User
 from app.models.postgres.menu import MenuItem
@@ -39,10 +41,12 @@ def add_review(
     ).first()
 
     if existing:
+        previous_rating = existing.rating
         existing.rating = rating
         existing.comment = comment
         existing.created_at = datetime.utcnow()
     else:
+        previous_rating = None
         review = Review(
             user_id=user_id,
             menu_item_id=menu_item_id,
@@ -51,6 +55,8 @@ def add_review(
         )
         session.add(review)
 
+    # Keep menu_item_rating_stats in the same transaction as the review
+    record_rating(session, menu_item_id, rating, previous_rating)
     session.commit()
 
     # Redirect back to menu item page
@@ -58,17 +64,17 @@ def add_review(
 
 
 @router.get("/menu/{menu_item_id}")
-def get_reviews_for_item(
+async def get_reviews_for_item(
     menu_item_id: UUID,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Get all reviews for a specific menu item with user info"""
-    reviews = session.exec(
+    reviews = (await session.exec(
         select(Review, User)
         .join(User, Review.user_id == User.id)
         .where(Review.menu_item_id == menu_item_id)
         .order_by(Review.created_at.desc())
-    ).all()
+    )).all()
 
     result = []
     for review, user in reviews:
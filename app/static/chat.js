@@ -195,6 +195,85 @@ async function sendToAI(message) {
   }
 }
 
+// ===============================
+// STREAMING CALL (SSE over fetch)
+// ===============================
+// Calls onDelta(textSoFar) as tokens arrive. Returns the final reply, or
+// null if streaming isn't available so the caller can fall back to sendToAI.
+async function streamToAI(message, onDelta) {
+  let res;
+  try {
+    res = await fetch("/ai/chat/stream", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        message: message,
+        session_id: getSessionId()
+      }),
+    });
+  } catch (err) {
+    console.error("[YorkieChat] stream fetch error:", err);
+    return null;
+  }
+
+  if (!res.ok || !res.body) {
+    console.error("[YorkieChat] stream not available:", res.status);
+    return null;
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let reply = "";
+
+  // The connection can drop mid-reply (network, proxy timeout): keep what
+  // arrived instead of retrying, the server already saved the message
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // SSE frames are separated by a blank line
+      let sep;
+      while ((sep = buffer.indexOf("\n\n")) !== -1) {
+        const frame = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+
+        let event = "message";
+        let data = "";
+        for (const line of frame.split("\n")) {
+          if (line.startsWith("event:")) event = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        }
+        if (!data) continue;
+        const payload = JSON.parse(data);
+
+        if (event === "meta") {
+          if (payload.session_id) {
+            chatSessionId = payload.session_id;
+            localStorage.setItem('yorkie_chat_session_id', payload.session_id);
+          }
+          if (payload.preferences) updateMemoryPanel(payload.preferences);
+        } else if (event === "token") {
+          reply += payload.delta;
+          onDelta(reply);
+        } else if (event === "done") {
+          reply = payload.reply;
+        } else if (event === "error") {
+          console.error("[YorkieChat] stream error:", payload.detail);
+          return reply || "🐶 Oops, the server had a little hiccup.";
+        }
+      }
+    }
+  } catch (err) {
+    console.error("[YorkieChat] stream read error:", err);
+    return reply || "🐶 Oops, the server had a little hiccup.";
+  }
+
+  return reply;
+}
+
 // ===============================
 // SEND BUTTON HANDLER
 // ===============================
@@ -211,16 +290,22 @@ chatSend?.addEventListener("click", async () => {
   // Temporary "thinking" bubble
   addMessage("🐶 ...thinking...", "bot");
 
-  // Call backend
-  const reply = await sendToAI(text);
-
   // Replace the last bot message (the thinking one)
-  const lastChild = chatMessages.lastElementChild;
-  if (lastChild) {
-    lastChild.innerHTML = `<span>${reply}</span>`;
-  } else {
-    addMessage(reply, "bot");
+  const bubble = chatMessages.lastElementChild;
+  const render = (reply) => {
+    if (bubble) {
+      bubble.innerHTML = `<span>${reply}</span>`;
+    } else {
+      addMessage(reply, "bot");
+    }
+  };
+
+  // Call backend: stream tokens into the bubble, fall back to the JSON endpoint
+  let reply = await streamToAI(text, render);
+  if (reply === null) {
+    reply = await sendToAI(text);
   }
+  render(reply);
 });
 
 // ===============================
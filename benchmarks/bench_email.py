@@ -0,0 +1,124 @@
+# benchmarks/bench_email.py
+"""
+Outbound email: inline SES calls vs the in-process outbox, offline.
+
+    python -m benchmarks.bench_email --messages 200 --latency-ms 80 --workers 1 4 8
+    python -m benchmarks.bench_email --notice-recipients 500 --latency-ms 80
+
+Uses LocalSES (sleeps --latency-ms per call, like an SES round trip).
+"request" is the time the caller is blocked per message: the SES call
+itself inline, one enqueue with the outbox. "drain" is how long the
+workers take to deliver everything (the SES send-rate limit is off
+unless --max-rate is given).
+
+--notice-recipients compares an event notice sent one SES call per
+recipient with the bulk fan-out job (send_bulk_templated_email, 50
+recipients per call, EVENT_NOTIFY_PARALLEL calls in flight).
+"""
+
+import argparse
+import json
+import time
+
+from app.core import event_notify, send_email
+from app.core.email_outbox import EmailOutbox, LocalSES
+
+
+def _message(i: int):
+    return {
+        "Source": "Yorkie Bakery <noreply@yorkiebakery.com>",
+        "Destination": {"ToAddresses": [f"guest{i}@example.com"]},
+        "Message": {"Subject": {"Data": f"Order #{i}"}, "Body": {"Text": {"Data": "Thanks for your order!"}}},
+    }
+
+
+def _inline(messages: int, latency_ms: float):
+    ses = LocalSES(latency_ms=latency_ms)
+    started = time.perf_counter()
+    for i in range(messages):
+        ses.send_email(**_message(i))
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": "inline",
+        "request_ms": round(elapsed / messages * 1000, 3),
+        "drain_s": round(elapsed, 3),
+        "msgs_per_s": round(messages / elapsed, 1),
+    }
+
+
+def _outbox(messages: int, latency_ms: float, workers: int, max_rate: float, fail_every: int):
+    ses = LocalSES(latency_ms=latency_ms, fail_every=fail_every)
+    outbox = EmailOutbox(lambda m: ses.send_email(**m), workers=workers, max_rate=max_rate, retry_base=0.05)
+
+    started = time.perf_counter()
+    for i in range(messages):
+        outbox.enqueue(_message(i))
+    enqueued = time.perf_counter() - started
+    outbox.drain()
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": f"outbox x{workers}",
+        "request_ms": round(enqueued / messages * 1000, 3),
+        "drain_s": round(elapsed, 3),
+        "msgs_per_s": round(messages / elapsed, 1),
+        **outbox.stats,
+    }
+
+
+def _notice_fanout(recipients: int, latency_ms: float):
+    people = [(f"guest{i}@example.com", f"Guest {i}") for i in range(recipients)]
+
+    ses = send_email.ses = LocalSES(latency_ms=latency_ms)
+    started = time.perf_counter()
+    for email, _ in people:
+        ses.send_email(**_message(0) | {"Destination": {"ToAddresses": [email]}})
+    serial = time.perf_counter() - started
+
+    ses = send_email.ses = LocalSES(latency_ms=latency_ms)
+    job = event_notify.NotifyJob("bench", "Tasting", "Doors at 6", people)
+    started = time.perf_counter()
+    event_notify.run_job(job)
+    bulk = time.perf_counter() - started
+
+    report = [
+        {"mode": "per-recipient", "calls": recipients, "drain_s": round(serial, 3)},
+        {"mode": "bulk job", "calls": len(job.chunks), "drain_s": round(bulk, 3), "sent": job.sent},
+    ]
+    for row in report:
+        print(f"{row['mode']:>14} | {row['calls']:>5} SES calls | {row['drain_s']:>7.3f} s")
+    return report
+
+
+def run(messages, latency_ms, workers, max_rate, fail_every):
+    report = [_inline(messages, latency_ms)]
+    report += [_outbox(messages, latency_ms, n, max_rate, fail_every) for n in workers]
+    for row in report:
+        print(
+            f"{row['mode']:>12} | request {row['request_ms']:>8.3f} ms/msg "
+            f"| drain {row['drain_s']:>7.3f} s | {row['msgs_per_s']:>7.1f} msg/s"
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--max-rate", type=float, default=0, help="Outbox send-rate limit (msg/s), 0 = off")
+    parser.add_argument("--fail-every", type=int, default=0, help="Throttle every n-th SES call")
+    parser.add_argument("--notice-recipients", type=int, help="Benchmark event-notice fan-out instead")
+    parser.add_argument("--out", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.notice_recipients:
+        report = _notice_fanout(args.notice_recipients, args.latency_ms)
+    else:
+        report = run(args.messages, args.latency_ms, args.workers, args.max_rate, args.fail_every)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_vecstore.py
+"""
+Filtered top-k latency: Chroma (PersistentClient) vs NumpyCollection.
+
+    python -m benchmarks.bench_vecstore --sizes 1000 10000 100000 --dim 384
+
+Synthetic catalog with the same metadata shape as run_embeddings
+(price, origin, category, comma-separated flavor/dietary strings).
+Only filters both backends support are used for the comparison.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "FALSE")
+
+import chromadb
+from chromadb.config import Settings
+
+from app.ai.numpy_index import NumpyCollection
+
+ORIGINS = ["french", "japanese", "thai", "chinese", "american", "italian", "korean"]
+CATEGORIES = ["pastry", "dessert", "drink", "bread", "entree"]
+FLAVORS = ["sweet", "nutty", "fruity", "creamy", "chocolate", "citrus", "matcha", "coffee"]
+DIETARY = ["vegetarian", "vegan", "gluten_free", "contains_dairy"]
+
+FILTERS = [
+    None,
+    {"price": {"$lte": 5.0}},
+    {"origin": "french"},
+    {"$and": [{"category": "dessert"}, {"price": {"$lte": 8.0}}]},
+]
+
+
+def synthetic_catalog(n: int, dim: int, rng: np.random.Generator):
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    metadatas = []
+    for i in range(n):
+        metadatas.append({
+            "title": f"item {i}",
+            "origin": ORIGINS[i % len(ORIGINS)],
+            "category": CATEGORIES[(i // 7) % len(CATEGORIES)],
+            "price": round(float(rng.uniform(1, 20)), 2),
+            "flavor_profiles": ",".join(rng.choice(FLAVORS, size=2, replace=False)),
+            "dietary_features": ",".join(rng.choice(DIETARY, size=1)),
+        })
+    return [str(i) for i in range(n)], vectors, metadatas
+
+
+def _time_queries(collection, queries, top_k):
+    latencies = []
+    for i, q in enumerate(queries):
+        where = FILTERS[i % len(FILTERS)]
+        started = time.perf_counter()
+        collection.query(query_embeddings=[q.tolist()], n_results=top_k, where=where,
+                         include=["metadatas", "distances"])
+        latencies.append((time.perf_counter() - started) * 1000)
+    arr = np.array(latencies)
+    return {
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "qps": round(len(arr) / (arr.sum() / 1000), 1),
+    }
+
+
+def run(sizes, dim, queries, top_k, seed):
+    rng = np.random.default_rng(seed)
+    report = []
+
+    for n in sizes:
+        ids, vectors, metadatas = synthetic_catalog(n, dim, rng)
+        probes = rng.standard_normal((queries, dim), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            client = chromadb.PersistentClient(path=tmp, settings=Settings(anonymized_telemetry=False))
+            chroma = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"})
+            started = time.perf_counter()
+            for i in range(0, n, 5000):
+                chroma.add(ids=ids[i:i + 5000], embeddings=vectors[i:i + 5000].tolist(),
+                           metadatas=metadatas[i:i + 5000])
+            chroma_load = time.perf_counter() - started
+            chroma_stats = _time_queries(chroma, probes, top_k)
+
+        index = NumpyCollection()
+        started = time.perf_counter()
+        index.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+        numpy_load = time.perf_counter() - started
+        numpy_stats = _time_queries(index, probes, top_k)
+
+        row = {
+            "items": n,
+            "dim": dim,
+            "chroma": {"load_s": round(chroma_load, 2), **chroma_stats},
+            "numpy": {"load_s": round(numpy_load, 2), **numpy_stats},
+        }
+        report.append(row)
+        print(
+            f"{n:>7} items | chroma p50 {chroma_stats['p50_ms']:>8.3f} ms p95 {chroma_stats['p95_ms']:>8.3f} ms "
+            f"| numpy p50 {numpy_stats['p50_ms']:>8.3f} ms p95 {numpy_stats['p95_ms']:>8.3f} ms"
+        )
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.dim, args.queries, args.top_k, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,23 @@ from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.templating import Jinja2Templates
-from sqlmodel import SQLModel, select
-from sqlalchemy.sql import func
+from sqlmodel import SQLModel
 import os
 
 # Internal imports
 from app.core.db import engine
 from app.core.db import get_session
 from app.core.cart_utils import get_cart_count
+from app.core.featured import featured_pool
+from app.core.menu_search import ensure_search_index
+from app.core.send_email import email_outbox
+from app.core.user_cache import skip_user_hydration, user_cache, wants_user
+from app.core.logger import get_logger
 from app.models.postgres.menu import MenuItem
 from app.models.postgres.music import MusicTrack
-from app.models.postgres.review import Review
 from app.routes import auth, menu, order, cart, music, about, event, health, review, profile
 from app.graphql.schema import graphql_router
 from app.ai.route import ai_demo, ai_chat, ai_vision, ai_debug
-from app.models.postgres.user import User
 
 # ===============================================
 # FASTAPI APP INIT
@@ -26,6 +28,8 @@ from app.models.postgres.user import User
 app = FastAPI()
 app.router.default_options = True
 
+logger = get_logger(__name__)
+
 templates = Jinja2Templates(directory="app/templates")
 
 # ===============================================
@@ -68,6 +72,31 @@ def serve_ai_demo_index():
 # ===============================================
 # MIDDLEWARE
 # ===============================================
+# Static files, health checks and JSON AI endpoints never render the navbar
+skip_user_hydration("/static", "/assets", "/ai-demo", "/health", "/ai")
+
+
+# Registered before SessionMiddleware so it runs inside it (request.session is set)
+@app.middleware("http")
+async def attach_user(request: Request, call_next):
+    user_session = request.session.get("user") if wants_user(request.url.path) else None
+    if user_session and user_session.get("id"):
+        try:
+            # Cached per user (USER_CACHE_TTL_SECONDS); profile/login writes invalidate it
+            profile = await user_cache.profile(user_session["id"])
+        except Exception as e:
+            logger.warning(f"User hydration failed: {e}")
+            profile = None
+        if profile:
+            request.state.current_user = profile
+            # Keep session data in sync (helps navbar/chat avatar refresh right after login)
+            for key in ("avatar_url", "first_name", "last_name"):
+                if user_session.get(key) != profile[key]:
+                    user_session[key] = profile[key]
+
+    return await call_next(request)
+
+
 app.add_middleware(SessionMiddleware, secret_key="SUPER_SECRET_DO_NOT_HARD_CODE")
 
 app.add_middleware(
@@ -83,47 +112,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ===============================================
-# USER CONTEXT MIDDLEWARE (refresh avatar/session)
-# ===============================================
-@app.middleware("http")
-async def attach_user(request: Request, call_next):
-    try:
-        # short-lived session for user refresh
-        for session_db in get_session():
-            user_session = request.session.get("user")
-            if user_session:
-                user_id = user_session.get("id")
-                # session stores id as string; cast to UUID for safety
-                if user_id:
-                    try:
-                        from uuid import UUID
-                        user_id_obj = UUID(str(user_id))
-                    except Exception:
-                        user_id_obj = user_id
-                else:
-                    user_id_obj = None
-
-                user = session_db.get(User, user_id_obj) if user_id_obj else None
-                if user:
-                    request.state.current_user = user
-                    # Keep session data in sync (helps navbar/chat avatar refresh right after login)
-                    request.session["user"]["avatar_url"] = user.avatar_url
-                    request.session["user"]["first_name"] = user.first_name
-                    request.session["user"]["last_name"] = user.last_name
-            break
-    except Exception:
-        pass
-
-    response = await call_next(request)
-    return response
-
 # ===============================================
 # STARTUP — DB Init
 # ===============================================
 @app.on_event("startup")
 def on_startup():
     SQLModel.metadata.create_all(engine)
+    # SQLite only: FTS5 index for /menu/search (Postgres uses migrations/008)
+    ensure_search_index(engine)
+
+# ===============================================
+# SHUTDOWN — flush the in-memory email outbox
+# ===============================================
+EMAIL_DRAIN_SECONDS = float(os.getenv("EMAIL_DRAIN_SECONDS", "10"))
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if not email_outbox.drain(timeout=EMAIL_DRAIN_SECONDS):
+        logger.warning(f"Shutting down with {email_outbox.pending_count()} emails still queued")
 
 # ===============================================
 # ROUTERS
@@ -154,44 +160,17 @@ app.include_router(ai_debug.router)
 def home(request: Request, session=Depends(get_session)):
     cart_count = get_cart_count(request)
 
-    # 🎂 Featured menu — only pastry category AND available items
-    menu_items = session.exec(
-        select(MenuItem)
-        .where(MenuItem.category == "pastry")
-        .where(MenuItem.is_available == True)
-        .order_by(func.random())
-    ).all()
-
-    # Fetch review stats for featured menu items
-    review_stats = {}
-    menu_ids = [m.id for m in menu_items]
-    if menu_ids:
-        rows = session.exec(
-            select(
-                Review.menu_item_id,
-                func.count(Review.id),
-                func.avg(Review.rating),
-            )
-            .where(Review.menu_item_id.in_(menu_ids))
-            .group_by(Review.menu_item_id)
-        ).all()
-        for menu_id, count, avg in rows:
-            review_stats[str(menu_id)] = {"count": count, "avg": float(avg) if avg is not None else None}
-
-    # 🎵 Featured music — only tracks with audio file (non-null s3_url)
-    tracks = session.exec(
-        select(MusicTrack)
-        .where(MusicTrack.file_url != "")
-        .order_by(func.random())
-    ).all()
+    # 🎂 Featured pastries + review stats and 🎵 featured tracks, sampled
+    # from cached pools (the DB is only read when the pools expire)
+    featured = featured_pool.sample(session)
 
     return templates.TemplateResponse(
         "index.html",
         {
             "request": request,
             "cart_count": cart_count,
-            "menu_items": menu_items,
-            "review_stats": review_stats,
-            "tracks": tracks,
+            "menu_items": featured["menu_items"],
+            "review_stats": featured["review_stats"],
+            "tracks": featured["tracks"],
         }
     )
@@ -0,0 +1,37 @@
+-- ============ CHAT MESSAGES (append-only history) ============
+-- Replaces the chat_session.conversation_history JSON blob, which was
+-- rewritten on every message and truncated to the last 20 entries.
+
+ALTER TABLE chat_session ADD COLUMN IF NOT EXISTS message_count INT NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS chat_message (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    session_id TEXT NOT NULL REFERENCES chat_session(session_id) ON DELETE CASCADE,
+    seq INT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_chat_message_session_seq ON chat_message(session_id, seq);
+
+-- Backfill from the legacy JSON column (idempotent: skips sessions already migrated)
+INSERT INTO chat_message (session_id, seq, role, content, metadata, created_at)
+SELECT
+    cs.session_id,
+    msg.ordinality::INT,
+    msg.value->>'role',
+    COALESCE(msg.value->>'content', ''),
+    msg.value->'metadata',
+    COALESCE((msg.value->>'timestamp')::TIMESTAMP, cs.last_message_at, NOW())
+FROM chat_session cs
+CROSS JOIN LATERAL jsonb_array_elements(COALESCE(cs.conversation_history::jsonb, '[]'::jsonb))
+    WITH ORDINALITY AS msg(value, ordinality)
+WHERE NOT EXISTS (SELECT 1 FROM chat_message cm WHERE cm.session_id = cs.session_id);
+
+UPDATE chat_session cs
+SET message_count = sub.max_seq
+FROM (SELECT session_id, MAX(seq) AS max_seq FROM chat_message GROUP BY session_id) sub
+WHERE sub.session_id = cs.session_id AND cs.message_count < sub.max_seq;
+
@@ -0,0 +1,22 @@
+-- ============ MENU ITEM RATING STATS (review aggregate) ============
+-- Maintained by the review write paths (app/core/rating_stats.py) so menu
+-- pages read count/avg in one query instead of loading every review.
+
+CREATE TABLE IF NOT EXISTS menu_item_rating_stats (
+    menu_item_id UUID PRIMARY KEY REFERENCES menu_item(id) ON DELETE CASCADE,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_avg DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Backfill / repair from the review table (safe to re-run)
+INSERT INTO menu_item_rating_stats (menu_item_id, review_count, rating_sum, rating_avg, updated_at)
+SELECT menu_item_id, COUNT(*), SUM(rating), AVG(rating), NOW()
+FROM review
+GROUP BY menu_item_id
+ON CONFLICT (menu_item_id) DO UPDATE
+SET review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    rating_avg = EXCLUDED.rating_avg,
+    updated_at = EXCLUDED.updated_at;
@@ -0,0 +1,15 @@
+-- ============ MENU ITEM ARRAY INDEXES ============
+-- /menu/view, /menu/search, /menu/?tag= and GraphQL menuItems(tags:) filter
+-- with array containment (col @> ARRAY[...]), which GIN indexes can answer.
+-- CONCURRENTLY: run with psql -f (not inside a transaction block).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_menu_item_dietary_features_gin
+    ON menu_item USING GIN (dietary_features);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_menu_item_flavor_profiles_gin
+    ON menu_item USING GIN (flavor_profiles);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_menu_item_tags_gin
+    ON menu_item USING GIN (tags);
+
+ANALYZE menu_item;
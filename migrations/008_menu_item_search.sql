@@ -0,0 +1,34 @@
+-- ============ MENU ITEM FULL-TEXT SEARCH ============
+-- Weighted tsvector (title A > tags B > description C) kept current by a
+-- trigger, GIN-indexed for /menu/search, plus a trigram index on title for
+-- the typo fallback (app/core/menu_search.py).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE menu_item ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION menu_item_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_menu_item_search_vector ON menu_item;
+CREATE TRIGGER trg_menu_item_search_vector
+    BEFORE INSERT OR UPDATE OF title, tags, description ON menu_item
+    FOR EACH ROW EXECUTE FUNCTION menu_item_search_vector_update();
+
+-- Backfill existing rows (fires the trigger)
+UPDATE menu_item SET title = title WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_menu_item_search_vector
+    ON menu_item USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_menu_item_title_trgm
+    ON menu_item USING GIN (title gin_trgm_ops);
+
+ANALYZE menu_item;
@@ -0,0 +1,18 @@
+-- ============ MENU CATALOG VERSION (cache staleness check) ============
+-- Each API worker caches the menu catalog in memory and compares this
+-- counter (one primary-key read) to decide whether to reload it. The
+-- admin menu handlers bump it in the same transaction as the write.
+-- Raw SQL edits to menu_item should bump it too:
+--   UPDATE menu_catalog_version SET version = version + 1, updated_at = NOW() WHERE id = 1;
+
+CREATE TABLE IF NOT EXISTS menu_catalog_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO menu_catalog_version (id, version, updated_at)
+VALUES (1, 1, NOW())
+ON CONFLICT (id) DO UPDATE
+SET version = menu_catalog_version.version + 1,
+    updated_at = EXCLUDED.updated_at;
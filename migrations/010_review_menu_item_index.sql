@@ -0,0 +1,11 @@
+-- ============ REVIEW PER-ITEM ORDER INDEX ============
+-- GraphQL menuItems { reviews } loads the newest reviews of many items in
+-- one query: ROW_NUMBER() OVER (PARTITION BY menu_item_id ORDER BY
+-- created_at DESC). This index serves both the IN (...) lookup and the
+-- per-item ordering, as well as /menu/item/{id}.
+-- CONCURRENTLY: run with psql -f (not inside a transaction block).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_menu_item_created_at
+    ON review (menu_item_id, created_at DESC);
+
+ANALYZE review;
@@ -0,0 +1,12 @@
+-- ============ ORDER HISTORY KEYSET INDEX ============
+-- /orders/view pages through a user's orders newest first:
+--   WHERE user_id = $1 AND (created_at, id) < ($2, $3)
+--   ORDER BY created_at DESC, id DESC LIMIT n
+-- id breaks ties between orders created in the same instant, so every
+-- page is an index range scan no matter how deep it is.
+-- CONCURRENTLY: run with psql -f (not inside a transaction block).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_order_user_created_at
+    ON "order" (user_id, created_at DESC, id DESC);
+
+ANALYZE "order";
@@ -0,0 +1,16 @@
+-- ============ ADMIN ORDER LISTING / EXPORT INDEXES ============
+-- GET /orders/ pages through all orders newest first, optionally
+-- filtered by status and a created_at window:
+--   WHERE [status = $1 AND] created_at >= $2 AND created_at < $3
+--     AND (created_at, id) < ($4, $5)
+--   ORDER BY created_at DESC, id DESC LIMIT n
+-- GET /orders/export walks the same ranges oldest first.
+-- CONCURRENTLY: run with psql -f (not inside a transaction block).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_order_created_at
+    ON "order" (created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_order_status_created_at
+    ON "order" (status, created_at DESC, id DESC);
+
+ANALYZE "order";
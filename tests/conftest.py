@@ -11,6 +11,12 @@ from fastapi.testclient import TestClient
 os.environ.setdefault("DATABASE_URL", "sqlite://")
 # Provide a dummy OpenAI key so AI modules initialize without raising during import
 os.environ.setdefault("OPENAI_API_KEY", "test-key")
+# Menu writes must not spawn background embedding/Chroma calls during tests
+os.environ.setdefault("VECTOR_INDEX_SYNC", "false")
+# Read the menu through the (fake) session instead of the process-wide catalog cache
+os.environ.setdefault("MENU_CACHE", "false")
+# Send email inline (through the patched `ses`) rather than from outbox worker threads
+os.environ.setdefault("EMAIL_OUTBOX", "false")
 
 # Ensure frontend dist exists so StaticFiles mount in main.py doesn't fail
 frontend_dist = Path("ai_demo_frontend/dist")
@@ -60,6 +66,8 @@ if "app.routes.music" not in sys.modules:
 
 from main import app
 from app.core import db, security
+from app.core.featured import featured_pool
+from app.core.user_cache import user_cache
 from app.models.postgres.menu import MenuItem
 from app.models.postgres.review import Review
 from app.models.postgres.user import User
@@ -92,6 +100,7 @@ class FakeSession:
         self.order_items = []
         self.events = []
         self.music_tracks = []
+        self.executed = []
         self.commits = 0
 
     def get(self, model, obj_id):
@@ -120,6 +129,11 @@ class FakeSession:
         return None
 
     def exec(self, statement):
+        if not hasattr(statement, "get_final_froms"):
+            # INSERT/UPDATE statements (e.g. the rating stats upsert) are recorded, not applied
+            self.executed.append(statement)
+            return FakeResult([])
+
         froms = statement.get_final_froms()
         table_name = froms[0].name if froms else ""
 
@@ -217,6 +231,37 @@ class FakeSession:
         return obj
 
 
+class AsyncFakeSession:
+    """AsyncSession-shaped view of a FakeSession (what get_async_session yields)."""
+
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    async def get(self, model, obj_id):
+        return self.sync_session.get(model, obj_id)
+
+    async def exec(self, statement):
+        return self.sync_session.exec(statement)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+    def add(self, obj):
+        self.sync_session.add(obj)
+
+    async def delete(self, obj):
+        self.sync_session.delete(obj)
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def refresh(self, obj):
+        return self.sync_session.refresh(obj)
+
+
 @pytest.fixture
 def fake_session():
     session = FakeSession()
@@ -244,8 +289,15 @@ def overrides(fake_session, monkeypatch, request):
     def _get_session():
         yield fake_session
 
+    async def _get_async_session():
+        yield AsyncFakeSession(fake_session)
+
     app.dependency_overrides[db.get_session] = _get_session
+    app.dependency_overrides[db.get_async_session] = _get_async_session
     app.dependency_overrides[security.require_admin] = lambda: {"role": "admin"}
+    # Home page pools are process-wide; don't let one test's data leak into the next
+    featured_pool.invalidate()
+    user_cache.clear()
     monkeypatch.setattr(menu_routes, "upload_file_to_s3", lambda *_, **__: "https://example.com/uploaded.jpg")
 
     # Mock ALL email sending globally to prevent real emails during tests
@@ -261,6 +313,9 @@ def overrides(fake_session, monkeypatch, request):
         monkeypatch.setattr("app.core.send_email.send_order_confirmation_email", mock_email_func)
         monkeypatch.setattr("app.core.send_email.send_owner_new_order_email", mock_email_func)
         monkeypatch.setattr("app.core.send_email.send_event_notice", mock_email_func)
+        monkeypatch.setattr(
+            "app.core.send_email.send_event_notice_batch", lambda recipients, *_: [None] * len(recipients)
+        )
 
         # Also patch where they're imported into routes
         from app.routes import event as event_routes_import
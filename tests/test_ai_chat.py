@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.ai.route import ai_chat
+
+DELAY = 0.2
+
+
+@pytest.fixture
+def fake_chat_pipeline(monkeypatch):
+    saved = {"messages": [], "prefs": None, "flushes": 0}
+
+    class FakeTurn:
+        session_id = "s-1"
+        preferences = {"flavors": ["nutty"]}
+
+        async def history_async(self, limit=10):
+            return [{"role": "user", "content": "hi"}]
+
+        def update_preferences(self, prefs):
+            self.preferences = {**self.preferences, **prefs}
+            saved["prefs"] = self.preferences
+
+        def add_message(self, role, content, metadata=None):
+            saved["messages"].append((role, content))
+
+        async def flush_async(self):
+            saved["flushes"] += 1
+
+        @classmethod
+        async def load_async(cls, session_id=None):
+            return cls()
+
+    @asynccontextmanager
+    async def fake_chat_turn(session_id=None):
+        await asyncio.sleep(DELAY)
+        turn = FakeTurn()
+        yield turn
+        await turn.flush_async()
+
+    async def slow_prefs(message):
+        await asyncio.sleep(DELAY)
+        return {"flavors": ["chocolate"], "name": "Spencer"}
+
+    async def slow_retrieve(req):
+        await asyncio.sleep(DELAY)
+        items = [{"title": "Chocolate Croissant", "price": 4.5, "origin": "french"}]
+        return {"ids": ["1"], "metadatas": items, "distances": [0.1]}, items
+
+    async def fake_completion(system_prompt, user_message, conversation_history=None):
+        assert "Chocolate Croissant" in user_message
+        assert "Customer name: Spencer" in user_message
+        assert conversation_history == [{"role": "user", "content": "hi"}]
+        return "Try the chocolate croissant!"
+
+    async def fake_stream(system_prompt, user_message, conversation_history=None):
+        for delta in ["Try the ", "chocolate ", "croissant!"]:
+            yield delta
+
+    monkeypatch.setattr(ai_chat, "ChatTurn", FakeTurn)
+    monkeypatch.setattr(ai_chat, "chat_turn_async", fake_chat_turn)
+    monkeypatch.setattr(ai_chat, "chat_response_stream", fake_stream)
+    monkeypatch.setattr(ai_chat, "extract_preferences_async", slow_prefs)
+    monkeypatch.setattr(ai_chat, "retrieve_for_chat", slow_retrieve)
+    monkeypatch.setattr(ai_chat, "chat_response_async", fake_completion)
+    return saved
+
+
+def test_chat_runs_independent_stages_concurrently(client, fake_chat_pipeline):
+    started = time.perf_counter()
+    resp = client.post("/ai/chat", json={"message": "I love chocolate, my name is Spencer"})
+    elapsed = time.perf_counter() - started
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["reply"] == "Try the chocolate croissant!"
+    assert data["session_id"] == "s-1"
+    assert data["preferences"]["flavors"] == ["chocolate"]
+    assert data["preferences"]["last_viewed"] == ["Chocolate Croissant"]
+
+    # Session load, then preference extraction + retrieval side by side
+    assert elapsed < DELAY * 2.5
+
+    assert fake_chat_pipeline["messages"] == [
+        ("user", "I love chocolate, my name is Spencer"),
+        ("assistant", "Try the chocolate croissant!"),
+    ]
+    assert fake_chat_pipeline["prefs"]["name"] == "Spencer"
+    assert fake_chat_pipeline["flushes"] == 1
+
+
+def parse_sse(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_chat_stream_emits_meta_tokens_done_and_persists(client, fake_chat_pipeline):
+    resp = client.post("/ai/chat/stream", json={"message": "I love chocolate, my name is Spencer"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(resp.text)
+    assert events[0][0] == "meta"
+    assert events[0][1]["session_id"] == "s-1"
+    assert events[0][1]["preferences"]["last_viewed"] == ["Chocolate Croissant"]
+    assert [data["delta"] for name, data in events if name == "token"] == [
+        "Try the ", "chocolate ", "croissant!",
+    ]
+    assert events[-1] == ("done", {"reply": "Try the chocolate croissant!"})
+
+    assert fake_chat_pipeline["messages"] == [
+        ("user", "I love chocolate, my name is Spencer"),
+        ("assistant", "Try the chocolate croissant!"),
+    ]
+    assert fake_chat_pipeline["flushes"] == 1
+
+
+def test_chat_stream_reports_error_and_keeps_partial_reply(client, fake_chat_pipeline, monkeypatch):
+    async def broken_stream(system_prompt, user_message, conversation_history=None):
+        yield "Try the "
+        raise RuntimeError("upstream closed")
+
+    monkeypatch.setattr(ai_chat, "chat_response_stream", broken_stream)
+
+    resp = client.post("/ai/chat/stream", json={"message": "hello"})
+    events = parse_sse(resp.text)
+
+    assert events[-1] == ("error", {"detail": "Completion failed"})
+    assert fake_chat_pipeline["messages"][-1] == ("assistant", "Try the")
+    assert fake_chat_pipeline["flushes"] == 1
+
+
+def test_chat_stream_reports_setup_failure_and_keeps_user_message(client, fake_chat_pipeline, monkeypatch):
+    async def broken_retrieve(req):
+        raise RuntimeError("vector store unavailable")
+
+    monkeypatch.setattr(ai_chat, "retrieve_for_chat", broken_retrieve)
+
+    resp = client.post("/ai/chat/stream", json={"message": "hello"})
+    assert resp.status_code == 200
+    assert parse_sse(resp.text) == [("error", {"detail": "Chat failed"})]
+    assert fake_chat_pipeline["messages"] == [("user", "hello")]
+    assert fake_chat_pipeline["flushes"] == 1
+
+
+def test_chat_stream_reports_session_load_failure(client, fake_chat_pipeline, monkeypatch):
+    async def broken_load(session_id=None):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(ai_chat.ChatTurn, "load_async", broken_load)
+
+    resp = client.post("/ai/chat/stream", json={"message": "hello"})
+    assert parse_sse(resp.text) == [("error", {"detail": "Chat failed"})]
+    assert fake_chat_pipeline["flushes"] == 0
@@ -566,3 +566,40 @@ def test_menu_operations_variations(client, fake_session):
     # Delete items
     for item in items[:2]:
         client.delete(f"/menu/{item.id}")
+
+
+def _capture_statements(fake_session, monkeypatch):
+    from sqlalchemy.dialects import postgresql
+
+    captured = []
+    original = fake_session.exec
+
+    def exec_and_capture(statement):
+        if hasattr(statement, "get_final_froms"):
+            captured.append(str(statement.compile(dialect=postgresql.dialect())))
+        return original(statement)
+
+    monkeypatch.setattr(fake_session, "exec", exec_and_capture)
+    return captured
+
+
+def test_menu_view_dietary_filter_uses_array_containment(client, fake_session, monkeypatch):
+    captured = _capture_statements(fake_session, monkeypatch)
+
+    resp = client.get("/menu/view?dietary=vegan&dietary=gluten_free")
+    assert resp.status_code == 200
+
+    menu_sql = [sql for sql in captured if "FROM menu_item \n" in sql]
+    assert len(menu_sql) == 1
+    assert "menu_item.dietary_features @>" in menu_sql[0]
+
+
+def test_menu_search_array_filters_use_containment(client, fake_session, monkeypatch):
+    captured = _capture_statements(fake_session, monkeypatch)
+
+    resp = client.get("/menu/search?dietary=vegan&flavor=nutty")
+    assert resp.status_code == 200
+
+    assert "menu_item.dietary_features @>" in captured[0]
+    assert "menu_item.flavor_profiles @>" in captured[0]
+    assert "ANY" not in captured[0]
@@ -0,0 +1,168 @@
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from main import app
+from app.ai import session_manager
+from app.core import db
+from app.core.menu_catalog import MenuCatalog
+from app.core.security import hash_password
+from app.models.postgres.chat_message import ChatMessage
+from app.models.postgres.chat_session import ChatSession
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.menu_catalog_version import MenuCatalogVersion
+from app.models.postgres.order import Order
+from app.models.postgres.order_item import OrderItem
+from app.models.postgres.review import Review
+from app.models.postgres.user import User
+
+TABLES = [User, MenuItem, MenuCatalogVersion, Review, Order, OrderItem, ChatSession, ChatMessage]
+
+
+def test_async_database_url():
+    assert db.async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert db.async_database_url("postgresql+psycopg2://u:p@db/app?sslmode=require") == (
+        "postgresql+asyncpg://u:p@db/app?ssl=require"
+    )
+    assert db.async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    """Sync + async engines on the same SQLite file; get_async_session uses the async one."""
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    connect_args = {"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES}
+    sync_engine = create_engine(url, connect_args=connect_args)
+    SQLModel.metadata.create_all(sync_engine, tables=[model.__table__ for model in TABLES])
+    async_engine = create_async_engine(db.async_database_url(url), connect_args=connect_args)
+
+    async def _get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[db.get_async_session] = _get_async_session
+    monkeypatch.setattr(session_manager, "engine", sync_engine)
+    monkeypatch.setattr(session_manager, "async_engine", async_engine)
+
+    queries = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    yield sync_engine, queries
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def seeded(engines, fake_session):
+    sync_engine, _ = engines
+    user = User(
+        email="async@example.com", password_hash=hash_password("password123"),
+        first_name="Async", is_verified=True,
+    )
+    # Login still goes through the sync (fake) session
+    fake_session.users.append(user)
+
+    now = datetime(2025, 1, 1)
+    with Session(sync_engine, expire_on_commit=False) as session:
+        session.add(User(**user.model_dump()))
+        item = MenuItem(
+            title="Kouign-amann", description="", price=5.0, category="pastry", is_available=True,
+            tags=["buttery"], flavor_profiles=[], dietary_features=[], gallery_urls=[],
+        )
+        session.add(item)
+        session.add(Review(user_id=user.id, menu_item_id=item.id, rating=5, comment="flaky"))
+        orders = [Order(user_id=user.id, total=5.0 * (i + 1), created_at=now + timedelta(days=i)) for i in range(3)]
+        session.add_all(orders)
+        for i, order in enumerate(orders):
+            for _ in range(i + 1):
+                session.add(OrderItem(
+                    order_id=order.id, menu_item_id=item.id, title=item.title, unit_price=5.0, quantity=1,
+                ))
+        session.commit()
+    return {"user": user, "item": item, "orders": orders}
+
+
+def test_order_reads_use_async_session(client, engines, seeded):
+    _, queries = engines
+    order = seeded["orders"][2]
+
+    resp = client.get(f"/orders/{order.id}")
+    assert resp.status_code == 200
+    assert len(resp.json()["items"]) == 3
+
+    resp = client.get(f"/orders/user/{seeded['user'].id}")
+    assert sorted(o["total"] for o in resp.json()) == [5.0, 10.0, 15.0]
+    assert queries
+
+
+def test_orders_view_loads_a_page_in_one_query(client, engines, seeded):
+    _, queries = engines
+    login = client.post("/auth/login", json={"email": "async@example.com", "password": "password123"})
+    assert login.status_code == 200
+
+    queries.clear()
+    resp = client.get("/orders/view", params={"limit": 2})
+    assert resp.status_code == 200
+    # orders page + their items in one round trip
+    assert len(queries) == 1
+    assert "LEFT OUTER JOIN order_item" in queries[0]
+    assert resp.text.count("order-card") == 2
+    assert "/orders/view?before=" in resp.text
+
+    assert client.get("/orders/view", params={"before": "not-a-cursor"}).status_code == 400
+
+
+def test_menu_and_review_reads_use_async_session(client, engines, seeded):
+    item = seeded["item"]
+
+    assert [i["title"] for i in client.get("/menu/").json()] == ["Kouign-amann"]
+    assert client.get(f"/menu/{item.id}").json()["title"] == "Kouign-amann"
+
+    reviews = client.get(f"/reviews/menu/{item.id}").json()
+    assert [(r["rating"], r["user_name"]) for r in reviews] == [(5, "Async")]
+
+
+def test_catalog_reads_from_concurrent_coroutines_do_not_deadlock(engines, seeded, monkeypatch):
+    """Every call re-checks the version; the catalog lock must not be held across run_sync I/O."""
+    catalog = MenuCatalog(enabled=True, check_seconds=0)
+    override = app.dependency_overrides[db.get_async_session]
+    results = []
+
+    async def read():
+        async for session in override():
+            return await session.run_sync(lambda s: catalog.list_available(s, category="pastry"))
+
+    async def scenario():
+        results.extend(await asyncio.gather(*(read() for _ in range(12))))
+
+    runner = threading.Thread(target=asyncio.run, args=(scenario(),), daemon=True)
+    runner.start()
+    runner.join(timeout=20)
+    assert not runner.is_alive(), "event loop blocked on the catalog lock"
+    assert [[item.title for item in items] for items in results] == [["Kouign-amann"]] * 12
+
+
+def test_chat_turn_async_round_trip(engines):
+    async def scenario():
+        async with session_manager.chat_turn_async("abc") as turn:
+            turn.update_preferences({"flavors": ["sweet"]})
+            turn.add_message("user", "hello")
+
+        async with session_manager.chat_turn_async("abc") as turn:
+            assert turn.is_new is False
+            assert [m["content"] for m in await turn.history_async(10)] == ["hello"]
+            turn.add_message("assistant", "hi!")
+
+    asyncio.run(scenario())
+
+    sync_engine, _ = engines
+    with Session(sync_engine) as session:
+        stored = session.exec(select(ChatSession).where(ChatSession.session_id == "abc")).one()
+        assert stored.message_count == 2
+        assert stored.preferences == {"flavors": ["sweet"]}
+    assert [m["content"] for m in session_manager.get_conversation_history("abc")] == ["hello", "hi!"]
@@ -0,0 +1,56 @@
+from app.ai.emb_cache import EmbeddingCache, cache_key
+
+
+def test_cache_key_depends_on_model_and_text():
+    assert cache_key("m1", "macarons") == cache_key("m1", "macarons")
+    assert cache_key("m1", "macarons") != cache_key("m2", "macarons")
+    assert cache_key("m1", "macarons") != cache_key("m1", "croissant")
+
+
+def test_memory_only_cache_hit_and_miss():
+    cache = EmbeddingCache(path=None, memory_items=4)
+
+    assert cache.get("m", "macarons") is None
+    cache.put("m", "macarons", [0.1, 0.2, 0.3])
+    assert cache.get("m", "macarons") == [0.1, 0.2, 0.3]
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = EmbeddingCache(path=None, memory_items=2)
+    cache.put("m", "a", [1.0])
+    cache.put("m", "b", [2.0])
+    cache.get("m", "a")          # "a" is now most recent
+    cache.put("m", "c", [3.0])   # evicts "b"
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0]
+    assert cache.get("m", "c") == [3.0]
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    first = EmbeddingCache(path=path, memory_items=2)
+    first.put("m", "something sweet under 5", [0.5, 0.25])
+
+    second = EmbeddingCache(path=path, memory_items=2)
+    assert second.get("m", "something sweet under 5") == [0.5, 0.25]
+    assert second.stats()["disk_hits"] == 1
+
+    # Promoted to memory on the next lookup
+    second.get("m", "something sweet under 5")
+    assert second.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "emb.sqlite3"), memory_items=1, disk_items=10)
+    for i in range(25):
+        cache.put("m", f"text {i}", [float(i)])
+
+    assert cache.stats()["disk_items"] <= 10
+    # The most recent entries are kept
+    assert cache.get("m", "text 24") == [24.0]
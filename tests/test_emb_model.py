@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+import pytest
+
+from app.ai import emb_model
+from app.ai.emb_cache import EmbeddingCache
+from app.ai.index_sync import build_document
+from app.models.postgres.menu import MenuItem
+
+
+class FakeEmbeddings:
+    embedding_model = "test-embedding"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), float(i)] for i, text in enumerate(texts)]
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    fake = FakeEmbeddings()
+    cache = EmbeddingCache(path=None)
+    monkeypatch.setattr(emb_model, "get_provider", lambda: fake)
+    monkeypatch.setattr(emb_model, "get_embedding_cache", lambda: cache)
+    return fake
+
+
+def test_embed_texts_batches_and_aligns_results(fake_embeddings):
+    texts = ["Macaron", "croissant", "", "Matcha Latte!", "croissant"]
+    vectors = emb_model.embed_texts(texts, batch_size=2, max_workers=2)
+
+    assert len(vectors) == len(texts)
+    assert vectors[2] is None
+    assert vectors[1] == vectors[4]
+    assert vectors[0][0] == float(len("macarons"))
+    assert vectors[3][0] == float(len("matcha latte"))
+
+    # Three unique non-empty texts → two requests of at most two inputs
+    assert sorted(len(c) for c in fake_embeddings.calls) == [1, 2]
+
+
+def test_embed_texts_uses_cache(fake_embeddings):
+    emb_model.embed_text("macarons")
+    assert len(fake_embeddings.calls) == 1
+
+    emb_model.embed_texts(["macaron", "macarons", "eclair"])
+    # Only "eclair" goes over the wire
+    assert fake_embeddings.calls[-1] == ["eclair"]
+
+
+def test_build_document_skips_empty_items():
+    item = MenuItem(id=uuid4(), title="", description="", tags=[], flavor_profiles=[], dietary_features=[])
+    assert build_document(item) is None
+
+    item = MenuItem(
+        id=uuid4(), title="Mango Cake", description="Fresh", price=6.5,
+        category="dessert", origin="thai", tags=["fruit"],
+        flavor_profiles=["sweet"], dietary_features=["vegetarian"],
+    )
+    doc_id, text, meta = build_document(item)
+    assert doc_id == str(item.id)
+    assert "mango cake" in text
+    assert meta["price"] == 6.5
+    assert meta["flavor_profiles"] == "sweet"
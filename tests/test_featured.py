@@ -0,0 +1,121 @@
+import random
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.featured import FeaturedPool
+from app.core.rating_stats import record_rating
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.menu_item_rating_stats import MenuItemRatingStats
+
+
+class Track:
+    def __init__(self, title, file_url):
+        self.title, self.file_url = title, file_url
+
+
+TRACKS = [Track(f"Track {i}", f"https://example.com/{i}.mp3") for i in range(4)]
+
+
+@pytest.fixture
+def featured_engine(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(
+        engine, tables=[MenuItem.__table__, MenuItemRatingStats.__table__]
+    )
+    monkeypatch.setattr("app.core.rating_stats.engine", engine)
+    # music_track is stubbed out in the test app (see conftest); tracks come from a list
+    queries = []
+    monkeypatch.setattr(FeaturedPool, "load_tracks", lambda self, session: queries.append("tracks") or list(TRACKS))
+
+    with Session(engine) as session:
+        for i in range(10):
+            session.add(MenuItem(
+                id=uuid4(), title=f"Pastry {i}", description="", price=4.0,
+                category="pastry" if i < 8 else "drink", is_available=i != 0,
+                tags=[], flavor_profiles=[], dietary_features=[], gallery_urls=[],
+            ))
+        session.commit()
+    return engine
+
+
+def _count_queries(engine):
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def test_pools_hold_only_eligible_rows(featured_engine):
+    pool = FeaturedPool(ttl=60)
+    with Session(featured_engine) as session:
+        snapshot = pool.snapshot(session)
+
+    assert sorted(m.title for m in snapshot["menu"]) == [f"Pastry {i}" for i in range(1, 8)]
+    assert len(snapshot["tracks"]) == 4
+
+
+def test_samples_are_served_from_memory_until_invalidated(featured_engine):
+    pool = FeaturedPool(ttl=60)
+    queries = _count_queries(featured_engine)
+
+    with Session(featured_engine) as session:
+        first = pool.sample(session, menu_k=3, track_k=2, rng=random.Random(1))
+        loads = len(queries)
+        for _ in range(20):
+            page = pool.sample(session, menu_k=3, track_k=2)
+            assert len(page["menu_items"]) == 3 and len(page["tracks"]) == 2
+        assert len(queries) == loads
+
+        pool.invalidate()
+        pool.sample(session, menu_k=3, track_k=2)
+        assert len(queries) == 2 * loads
+
+    assert len(first["menu_items"]) == 3
+
+
+def test_ttl_expiry_reloads(featured_engine, monkeypatch):
+    pool = FeaturedPool(ttl=10)
+    clock = [1000.0]
+    monkeypatch.setattr("app.core.featured.time.monotonic", lambda: clock[0])
+
+    with Session(featured_engine) as session:
+        before = pool.snapshot(session)
+        clock[0] += 5
+        assert pool.snapshot(session) is before
+        clock[0] += 6
+        assert pool.snapshot(session) is not before
+
+
+def test_review_stats_are_precomputed_for_sampled_items(featured_engine):
+    with Session(featured_engine) as session:
+        item = session.exec(MenuItem.__table__.select().where(MenuItem.title == "Pastry 3")).first()
+        record_rating(session, item.id, 5)
+        record_rating(session, item.id, 3)
+        session.commit()
+
+        pool = FeaturedPool(ttl=60)
+        page = pool.sample(session, menu_k=0, track_k=0)
+
+    assert len(page["menu_items"]) == 7  # k=0 → whole pool, shuffled
+    assert page["review_stats"] == {str(item.id): {"count": 2, "avg": 4.0}}
+
+
+def test_home_page_renders_sampled_pastries(client, fake_session, monkeypatch):
+    monkeypatch.setattr(FeaturedPool, "load_tracks", lambda self, session: [])
+    pastry = MenuItem(
+        id=uuid4(), title="Featured Croissant", description="", price=4.0, category="pastry",
+        is_available=True, tags=[], flavor_profiles=[], dietary_features=[], gallery_urls=[],
+    )
+    fake_session.menu_items[pastry.id] = pastry
+
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert "Featured Croissant" in resp.text
@@ -0,0 +1,164 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.graphql import extensions as graphql_extensions
+from app.graphql import schema as graphql_schema
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.review import Review
+from app.models.postgres.user import User
+
+
+@pytest.fixture(autouse=True)
+def clear_graphql_caches(monkeypatch):
+    monkeypatch.setattr(graphql_extensions, "persisted_queries", graphql_extensions.PersistedQueryStore(""))
+    monkeypatch.setattr(graphql_schema, "persisted_queries", graphql_extensions.persisted_queries)
+    graphql_extensions.response_cache.clear()
+    yield
+    graphql_extensions.response_cache.clear()
+
+
+@pytest.fixture
+def graphql_engine(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[MenuItem.__table__, Review.__table__, User.__table__])
+    monkeypatch.setattr(graphql_schema, "engine", engine)
+
+    now = datetime(2025, 1, 1)
+    with Session(engine) as session:
+        users = [User(email=f"u{i}@example.com", password_hash="x", first_name=f"User{i}") for i in range(4)]
+        session.add_all(users)
+        for i in range(5):
+            item = MenuItem(
+                id=uuid4(), title=f"Item {i}", description="", price=3.0, category="pastry", is_available=True,
+                tags=[], flavor_profiles=[], dietary_features=[], gallery_urls=[],
+                created_at=now + timedelta(minutes=i),
+            )
+            session.add(item)
+            # Item i has i reviews, rating == age rank so ordering is checkable
+            for j in range(i):
+                session.add(Review(
+                    user_id=users[j].id, menu_item_id=item.id, rating=j + 1, comment=f"r{j}",
+                    created_at=now + timedelta(days=10 - j),
+                ))
+        session.commit()
+    return engine
+
+
+def _count_queries(engine):
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def _menu_items(client, review_args=""):
+    resp = client.post("/graphql", json={"query": f"""
+        {{ menuItems(limit: 10) {{ title reviews{review_args} {{ rating user {{ name }} }} }} }}
+    """})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert "errors" not in body, body
+    return {item["title"]: item["reviews"] for item in body["data"]["menuItems"]}
+
+
+def test_menu_items_reviews_use_one_batched_query(client, graphql_engine):
+    queries = _count_queries(graphql_engine)
+    items = _menu_items(client, "(limit: 2)")
+
+    assert [len(items[f"Item {i}"]) for i in range(5)] == [0, 1, 2, 2, 2]
+    # Newest first within each item
+    assert [r["rating"] for r in items["Item 4"]] == [1, 2]
+    assert items["Item 4"][0]["user"]["name"] == "User0"
+
+    review_queries = [q for q in queries if "review" in q]
+    assert len(queries) == 2  # menu items + one windowed reviews query
+    assert len(review_queries) == 1 and "row_number() OVER (PARTITION BY" in review_queries[0]
+
+
+def test_per_item_offset_is_applied_inside_each_partition(client, graphql_engine):
+    items = _menu_items(client, "(limit: 2, offset: 1)")
+    assert [r["rating"] for r in items["Item 4"]] == [2, 3]
+    assert [r["rating"] for r in items["Item 2"]] == [2]
+    assert items["Item 1"] == []
+
+
+def test_top_level_reviews_query(client, graphql_engine):
+    with Session(graphql_engine) as session:
+        item = session.exec(MenuItem.__table__.select().where(MenuItem.title == "Item 3")).first()
+
+    resp = client.post("/graphql", json={
+        "query": "query($id: ID!) { reviews(menuItemId: $id, limit: 5) { rating comment } }",
+        "variables": {"id": str(item.id)},
+    })
+    assert resp.json()["data"]["reviews"] == [
+        {"rating": 1, "comment": "r0"}, {"rating": 2, "comment": "r1"}, {"rating": 3, "comment": "r2"},
+    ]
+
+
+# ---------------------------------------------------------------
+# COST LIMITS / PERSISTED QUERIES / RESPONSE CACHE
+# ---------------------------------------------------------------
+def test_expensive_query_is_rejected_before_execution(client, graphql_engine):
+    queries = _count_queries(graphql_engine)
+    resp = client.post("/graphql", json={"query": "{ menuItems(limit: 1000) { reviews(limit: 1000) { rating } } }"})
+
+    body = resp.json()
+    assert body["data"] is None
+    assert "exceeds the limit" in body["errors"][0]["message"]
+    assert queries == []
+
+
+def test_query_cost_multiplies_by_list_limits(graphql_engine):
+    document = graphql_extensions._parse_cached("{ menuItems(limit: 10) { title reviews(limit: 3) { rating } } }")
+    cost, depth = graphql_extensions.query_cost(graphql_schema.schema._schema, document)
+    # menuItems + 10 * (title + reviews + 3 * rating)
+    assert cost == 1 + 10 * (1 + 1 + 3)
+    assert depth == 3
+
+
+def test_automatic_persisted_query_flow(client, graphql_engine):
+    query = "{ menuItems(limit: 2) { title } }"
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": graphql_extensions.query_hash(query)}}
+
+    miss = client.post("/graphql", json={"extensions": extensions})
+    assert miss.status_code == 200
+    assert miss.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    registered = client.post("/graphql", json={"query": query, "extensions": extensions})
+    assert len(registered.json()["data"]["menuItems"]) == 2
+
+    hit = client.post("/graphql", json={"extensions": extensions})
+    assert hit.json() == registered.json()
+
+    via_get = client.get("/graphql", params={"extensions": json.dumps(extensions)})
+    assert via_get.json() == registered.json()
+
+
+def test_persisted_query_hash_mismatch_is_rejected(client, graphql_engine):
+    resp = client.post("/graphql", json={
+        "query": "{ menuItems { title } }",
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": "0" * 64}},
+    })
+    assert resp.status_code == 400
+
+
+def test_anonymous_queries_are_served_from_cache_until_a_review_is_added(client, graphql_engine):
+    queries = _count_queries(graphql_engine)
+    first = _menu_items(client)
+    executed = len(queries)
+    assert _menu_items(client) == first
+    assert len(queries) == executed
+
+    graphql_extensions.response_cache.clear()
+    _menu_items(client)
+    assert len(queries) > executed
@@ -0,0 +1,102 @@
+import asyncio
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.ai import hybrid
+from app.ai.numpy_index import NumpyCollection
+from app.core.menu_search import ensure_search_index
+from app.models.postgres.menu import MenuItem
+
+
+def test_reciprocal_rank_fusion_weights_and_ties():
+    fused = hybrid.reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], [1.0, 1.0], k=60)
+    assert [doc_id for doc_id, _ in fused] == ["a", "c", "b"]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+    # Lexical weight 0 → pure vector order
+    fused = hybrid.reciprocal_rank_fusion([["a", "b"], ["b"]], [1.0, 0.0])
+    assert [doc_id for doc_id, _ in fused] == ["a", "b"]
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    index = NumpyCollection()
+    index.upsert(
+        ids=["croissant", "pain", "mochi", "tart"],
+        embeddings=[[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0, 0, 1]],
+        metadatas=[
+            {"title": "Croissant", "origin": "french", "price": 4.0},
+            {"title": "Pain au Chocolat", "origin": "french", "price": 4.5},
+            {"title": "Mochi", "origin": "japanese", "price": 3.0},
+            {"title": "Chocolate Tart", "origin": "french", "price": 6.0},
+        ],
+    )
+    monkeypatch.setattr(hybrid, "get_collection", lambda: index)
+    monkeypatch.setattr("app.ai.rag.get_collection", lambda: index)
+    monkeypatch.setattr(hybrid, "HYBRID_CANDIDATES", 2)
+    return index
+
+
+def test_hybrid_promotes_lexical_hits_outside_vector_candidates(catalog, monkeypatch):
+    monkeypatch.setattr(hybrid, "lexical_search", lambda query, limit: ["tart", "pain"])
+
+    result = hybrid.hybrid_retrieve("chocolate", top_k=3, embedding=[1, 0, 0])
+
+    # "pain" is in both lists; "tart" only came from full-text (no distance)
+    assert result["ids"] == ["pain", "croissant", "tart"]
+    assert result["distances"][2] is None
+    assert result["metadatas"][2]["title"] == "Chocolate Tart"
+    assert result["scores"] == sorted(result["scores"], reverse=True)
+
+
+def test_hybrid_applies_filters_to_lexical_hits(catalog, monkeypatch):
+    monkeypatch.setattr(hybrid, "lexical_search", lambda query, limit: ["mochi", "tart"])
+
+    result = hybrid.hybrid_retrieve("sweet", filters={"origin": "french"}, top_k=5, embedding=[1, 0, 0])
+    assert "mochi" not in result["ids"]
+    assert "tart" in result["ids"]
+
+
+def test_hybrid_async_matches_sync(catalog, monkeypatch):
+    async def fake_embed(text):
+        return [1, 0, 0]
+
+    monkeypatch.setattr(hybrid, "embed_text_async", fake_embed)
+    monkeypatch.setattr(hybrid, "lexical_search", lambda query, limit: ["tart"])
+
+    result = asyncio.run(hybrid.hybrid_retrieve_async("chocolate tart", top_k=3))
+    assert result == hybrid.hybrid_retrieve("chocolate tart", top_k=3, embedding=[1, 0, 0])
+
+
+def test_lexical_search_uses_full_text_index(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[MenuItem.__table__])
+    ensure_search_index(engine)
+    monkeypatch.setattr(hybrid, "engine", engine)
+
+    tart, mochi = uuid4(), uuid4()
+    with Session(engine) as session:
+        for item_id, title, available in [(tart, "Chocolate Tart", True), (mochi, "Mochi", True),
+                                          (uuid4(), "Chocolate Cake", False)]:
+            session.add(MenuItem(id=item_id, title=title, description="", tags=[], flavor_profiles=[],
+                                 dietary_features=[], gallery_urls=[], price=4.0, is_available=available))
+        session.commit()
+
+    # OR semantics, stopwords dropped, unavailable items excluded
+    found = hybrid.lexical_search("I want something with chocolate or mochi please")
+    assert sorted(found) == sorted([str(tart), str(mochi)])
+    assert hybrid.lexical_search("the and of") == []
+
+
+def test_lexical_search_degrades_to_empty_without_index(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    monkeypatch.setattr(hybrid, "engine", engine)
+    assert hybrid.lexical_search("croissant") == []
@@ -0,0 +1,180 @@
+import time
+from uuid import uuid4
+
+import pytest
+
+from app.ai import emb_model, index_sync, run_embeddings, vecstore
+from app.models.postgres.menu import MenuItem
+
+
+class FakeCollection:
+    def __init__(self):
+        self.rows = {}
+        self.upsert_calls = 0
+
+    def get(self, include=None, limit=None, offset=0):
+        ids = sorted(self.rows)[offset:offset + limit]
+        return {"ids": ids, "metadatas": [self.rows[i]["metadata"] for i in ids]}
+
+    def upsert(self, ids, embeddings, metadatas):
+        self.upsert_calls += 1
+        for i, e, m in zip(ids, embeddings, metadatas):
+            self.rows[i] = {"embedding": e, "metadata": m}
+
+    def delete(self, ids):
+        for i in ids:
+            self.rows.pop(i, None)
+
+
+def make_item(title, **kwargs):
+    defaults = dict(description="tasty", price=4.0, category="pastry", origin="french",
+                    tags=[], flavor_profiles=["sweet"], dietary_features=[])
+    defaults.update(kwargs)
+    return MenuItem(id=uuid4(), title=title, **defaults)
+
+
+@pytest.fixture
+def fake_index(monkeypatch):
+    collection = FakeCollection()
+    embedded = []
+
+    def fake_embed_texts(texts, **_):
+        embedded.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(vecstore, "get_collection", lambda: collection)
+    monkeypatch.setattr(run_embeddings, "get_collection", lambda: collection)
+    monkeypatch.setattr(run_embeddings, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(emb_model, "embed_texts", fake_embed_texts)
+    return collection, embedded
+
+
+def test_content_hash_changes_with_item():
+    item = make_item("Croissant")
+    _, _, meta1 = index_sync.build_document(item)
+    item.price = 5.0
+    _, _, meta2 = index_sync.build_document(item)
+    assert meta1["content_hash"] != meta2["content_hash"]
+
+
+def test_build_document_drops_none_metadata():
+    _, _, meta = index_sync.build_document(make_item("Free Sample", price=None))
+    assert "price" not in meta
+
+
+def test_incremental_sync_only_touches_diffs(fake_index, monkeypatch):
+    collection, embedded = fake_index
+    a, b, c = make_item("Croissant"), make_item("Eclair"), make_item("Macaron")
+
+    monkeypatch.setattr(run_embeddings, "iter_menu_item_batches", lambda _: iter([[a, b], [c]]))
+    stats = run_embeddings.build_embeddings(batch_size=2)
+    assert stats["upserted"] == 3
+    assert set(collection.rows) == {str(a.id), str(b.id), str(c.id)}
+
+    # Second run: b changed, c removed, nothing else re-embedded
+    embedded.clear()
+    b.description = "now with chocolate"
+    monkeypatch.setattr(run_embeddings, "iter_menu_item_batches", lambda _: iter([[a, b]]))
+    stats = run_embeddings.build_embeddings(batch_size=2)
+
+    assert stats == {"items": 2, "unchanged": 1, "upserted": 1, "deleted": 1}
+    assert len(embedded) == 1 and "chocolate" in embedded[0]
+    assert str(c.id) not in collection.rows
+
+
+def test_sync_queue_coalesces_writes(fake_index):
+    collection, embedded = fake_index
+    queue = index_sync.IndexSyncQueue(delay=0)
+    queue._ensure_worker = lambda: None  # drive flush() by hand
+
+    item = make_item("Mochi")
+    gone = make_item("Old Tart")
+    collection.rows[str(gone.id)] = {"embedding": [1.0], "metadata": {}}
+
+    queue.enqueue_upsert(item)
+    item.title = "Matcha Mochi"
+    queue.enqueue_upsert(item)
+    queue.enqueue_delete(gone.id)
+    assert queue.pending_count() == 2
+
+    result = queue.flush()
+    assert result == {"upserted": 1, "deleted": 1}
+    assert collection.upsert_calls == 1
+    assert collection.rows[str(item.id)]["metadata"]["title"] == "Matcha Mochi"
+    assert str(gone.id) not in collection.rows
+    assert queue.flush() == {"upserted": 0, "deleted": 0}
+
+
+def test_failed_flush_requeues_batch_without_clobbering_newer_writes(fake_index, monkeypatch):
+    collection, _ = fake_index
+    queue = index_sync.IndexSyncQueue(delay=0)
+    queue._ensure_worker = lambda: None
+
+    item = make_item("Mochi")
+    other = make_item("Tart")
+    queue.enqueue_upsert(item)
+    queue.enqueue_upsert(other)
+
+    def failing_embed(texts, **_):
+        # An admin edit lands while the batch is in flight
+        item.title = "Matcha Mochi"
+        queue.enqueue_upsert(item)
+        raise RuntimeError("embeddings API down")
+
+    monkeypatch.setattr(emb_model, "embed_texts", failing_embed)
+    with pytest.raises(RuntimeError):
+        queue.flush()
+    assert queue.pending_count() == 2
+
+    monkeypatch.setattr(emb_model, "embed_texts", lambda texts, **_: [[1.0] for _ in texts])
+    assert queue.flush() == {"upserted": 2, "deleted": 0}
+    assert collection.rows[str(item.id)]["metadata"]["title"] == "Matcha Mochi"
+    assert str(other.id) in collection.rows
+    assert queue._attempts == {}
+
+
+def test_item_without_vector_is_removed_without_retries(fake_index, monkeypatch):
+    collection, _ = fake_index
+    queue = index_sync.IndexSyncQueue(delay=0)
+    queue._ensure_worker = lambda: None
+
+    ok, empty = make_item("Croissant"), make_item("Mochi")
+    collection.rows[str(empty.id)] = {"embedding": [1.0], "metadata": {}}
+    calls = []
+
+    def embed(texts, **_):
+        calls.append(texts)
+        return [None if "mochi" in t else [1.0] for t in texts]
+
+    monkeypatch.setattr(emb_model, "embed_texts", embed)
+    queue.enqueue_upsert(ok)
+    queue.enqueue_upsert(empty)
+
+    assert queue.flush() == {"upserted": 1, "deleted": 1}
+    assert queue.pending_count() == 0 and queue._attempts == {}
+    assert queue.flush() == {"upserted": 0, "deleted": 0}
+    assert len(calls) == 1
+    assert list(collection.rows) == [str(ok.id)]
+
+
+def test_worker_retries_failed_batch_with_backoff(fake_index, monkeypatch):
+    collection, _ = fake_index
+    calls = []
+
+    def flaky_embed(texts, **_):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError("rate limited")
+        return [[1.0] for _ in texts]
+
+    monkeypatch.setattr(emb_model, "embed_texts", flaky_embed)
+    queue = index_sync.IndexSyncQueue(delay=0, retry_base=0.05)
+    item = make_item("Mochi")
+    queue.enqueue_upsert(item)
+
+    deadline = time.monotonic() + 5
+    while str(item.id) not in collection.rows and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert str(item.id) in collection.rows
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.05 and calls[2] - calls[1] >= 0.1
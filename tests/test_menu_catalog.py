@@ -0,0 +1,135 @@
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import menu_catalog as catalog_module
+from app.core.menu_catalog import MenuCatalog, bump_catalog_version, read_catalog_version
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.menu_catalog_version import MenuCatalogVersion
+
+
+def _item(title, category="pastry", tags=(), dietary=(), available=True):
+    return MenuItem(
+        id=uuid4(), title=title, description="", price=5.0, category=category, is_available=available,
+        tags=list(tags), flavor_profiles=[], dietary_features=list(dietary), gallery_urls=[],
+    )
+
+
+@pytest.fixture
+def catalog_engine(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[MenuItem.__table__, MenuCatalogVersion.__table__])
+    monkeypatch.setattr(catalog_module, "engine", engine)
+
+    with Session(engine) as session:
+        for item in [
+            _item("Croissant", tags=["french", "buttery"], dietary=["vegetarian"]),
+            _item("Vegan Scone", tags=["british"], dietary=["vegan", "vegetarian"]),
+            _item("Matcha Latte", category="drink", tags=["japanese"], dietary=["vegan"]),
+            _item("Retired Tart", tags=["french"], available=False),
+        ]:
+            session.add(item)
+        session.commit()
+    return engine
+
+
+def _count_queries(engine):
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def test_secondary_indexes_answer_filters(catalog_engine):
+    catalog = MenuCatalog(enabled=True, check_seconds=60)
+    with Session(catalog_engine) as session:
+        titles = lambda items: [i.title for i in items]  # noqa: E731
+
+        assert titles(catalog.list_available(session)) == ["Croissant", "Vegan Scone", "Matcha Latte"]
+        assert titles(catalog.list_available(session, category="pastry")) == ["Croissant", "Vegan Scone"]
+        assert titles(catalog.list_available(session, tags=["french"])) == ["Croissant"]
+        assert titles(catalog.list_available(session, dietary=["vegan", "vegetarian"])) == ["Vegan Scone"]
+        assert titles(catalog.list_available(session, category="drink", dietary=["vegan"])) == ["Matcha Latte"]
+        assert titles(catalog.list_available(session, offset=1, limit=1)) == ["Vegan Scone"]
+        assert catalog.list_available(session, tags=["unknown"]) == []
+
+
+def test_reads_are_dictionary_lookups_after_first_load(catalog_engine):
+    catalog = MenuCatalog(enabled=True, check_seconds=60)
+    with Session(catalog_engine) as session:
+        retired = [i for i in catalog.snapshot(session).by_id.values() if i.title == "Retired Tart"][0]
+        queries = _count_queries(catalog_engine)
+
+        # Unavailable items are still reachable by id (cart / order lookups)
+        assert catalog.get(session, retired.id).title == "Retired Tart"
+        assert catalog.get(session, str(retired.id)) is retired
+        assert catalog.get(session, "not-a-uuid") is None
+        assert [i.title for i in catalog.get_many(session, [retired.id, uuid4()])] == ["Retired Tart"]
+        catalog.list_available(session, tags=["french"])
+
+    assert queries == []
+
+
+def test_version_bump_from_another_worker_is_picked_up(catalog_engine, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(catalog_module.time, "monotonic", lambda: clock[0])
+    worker_a = MenuCatalog(enabled=True, check_seconds=1)
+    worker_b = MenuCatalog(enabled=True, check_seconds=1)
+
+    with Session(catalog_engine) as session:
+        assert len(worker_a.list_available(session)) == 3
+        assert len(worker_b.list_available(session)) == 3
+
+        # Worker B handles an admin write: bump in the same transaction
+        session.add(_item("New Danish"))
+        bump_catalog_version(session)
+        session.commit()
+        worker_b.invalidate()
+        assert read_catalog_version(session) == 1
+
+        assert len(worker_b.list_available(session)) == 4
+        # Worker A keeps its snapshot until the next version check...
+        assert len(worker_a.list_available(session)) == 3
+        clock[0] += 1.5
+        # ...then one primary-key read detects the change and reloads
+        assert len(worker_a.list_available(session)) == 4
+
+
+def test_unchanged_version_check_does_not_reload(catalog_engine, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(catalog_module.time, "monotonic", lambda: clock[0])
+    catalog = MenuCatalog(enabled=True, check_seconds=1)
+
+    with Session(catalog_engine) as session:
+        first = catalog.snapshot(session)
+        queries = _count_queries(catalog_engine)
+        clock[0] += 5
+        assert catalog.snapshot(session) is first
+    assert len(queries) == 1 and "menu_catalog_version" in queries[0]
+
+
+def test_cached_items_survive_request_session_commit(catalog_engine):
+    catalog = MenuCatalog(enabled=True, check_seconds=60)
+    with Session(catalog_engine) as session:
+        item = catalog.list_available(session)[0]
+        session.add(_item("Unrelated"))
+        session.commit()  # would expire instances owned by this session
+    assert item.title == "Croissant"
+
+
+def test_admin_writes_bump_version_and_invalidate(client, fake_session, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr("app.routes.menu.invalidate_catalog", lambda: invalidated.append(True))
+
+    item_id = next(iter(fake_session.menu_items))
+    resp = client.delete(f"/menu/{item_id}")
+    assert resp.status_code == 200
+    assert invalidated == [True]
+    assert any("menu_catalog_version" in str(stmt) for stmt in fake_session.executed)
@@ -0,0 +1,98 @@
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core import menu_search
+from app.models.postgres.menu import MenuItem
+
+
+@pytest.fixture
+def search_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[MenuItem.__table__])
+    return engine
+
+
+def _item(title, description="", tags=(), **kwargs):
+    return MenuItem(
+        id=uuid4(), title=title, description=description, tags=list(tags),
+        flavor_profiles=[], dietary_features=[], gallery_urls=[],
+        price=kwargs.pop("price", 5.0), is_available=True, **kwargs,
+    )
+
+
+def _search(engine, q, **kwargs):
+    with Session(engine) as session:
+        query = select(MenuItem).where(MenuItem.is_available == True)  # noqa: E712
+        return [i.title for i in menu_search.search_menu(session, query, q, limit=kwargs.pop("limit", 20), **kwargs)]
+
+
+def test_sqlite_fts_ranks_title_over_tags_over_description(search_engine):
+    with Session(search_engine) as session:
+        # Rows inserted before the index exists are backfilled
+        session.add(_item("Earl Grey Tea", description="Pairs well with a chocolate croissant"))
+        session.commit()
+
+    menu_search.ensure_search_index(search_engine)
+
+    with Session(search_engine) as session:
+        session.add(_item("Chocolate Croissant", description="Flaky and buttery", tags=["french"]))
+        session.add(_item("Pain Suisse", description="Custard pastry", tags=["chocolate"]))
+        session.add(_item("Matcha Roll", description="Green tea sponge"))
+        session.commit()
+
+    assert _search(search_engine, "chocolate") == ["Chocolate Croissant", "Pain Suisse", "Earl Grey Tea"]
+    # Prefix + stemming, AND across terms, punctuation ignored
+    assert _search(search_engine, "choc croissants!") == ["Chocolate Croissant", "Earl Grey Tea"]
+    assert _search(search_engine, "chocolate", limit=1, offset=1) == ["Pain Suisse"]
+    assert _search(search_engine, "nonexistent_item_xyz") == []
+
+
+def test_sqlite_fts_follows_updates_and_deletes(search_engine):
+    menu_search.ensure_search_index(search_engine)
+    item = _item("Mango Cake", description="Fresh mango")
+
+    with Session(search_engine) as session:
+        session.add(item)
+        session.commit()
+        assert _search(search_engine, "mango") == ["Mango Cake"]
+
+        item.title = "Passion Fruit Cake"
+        item.description = "Tart and tropical"
+        session.add(item)
+        session.commit()
+        assert _search(search_engine, "mango") == []
+        assert _search(search_engine, "passion") == ["Passion Fruit Cake"]
+
+        session.delete(item)
+        session.commit()
+    assert _search(search_engine, "passion") == []
+
+
+def test_search_without_terms_lists_filtered_items_by_title(search_engine):
+    with Session(search_engine) as session:
+        session.add(_item("Scone", price=3.0))
+        session.add(_item("Baguette", price=4.0))
+        session.commit()
+    assert _search(search_engine, "  ?? ") == ["Baguette", "Scone"]
+
+
+def test_postgres_query_uses_weighted_tsvector_rank():
+    query = menu_search.full_text_query(select(MenuItem), ["choc", "croissant"], "postgresql")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "menu_item.search_vector @@ to_tsquery" in sql
+    assert "ts_rank(menu_item.search_vector" in sql
+
+    params = query.compile(dialect=postgresql.dialect()).params
+    assert "choc:* & croissant:*" in params.values()
+
+    fuzzy = str(menu_search.trigram_query(select(MenuItem), "crosant").compile(dialect=postgresql.dialect()))
+    assert "similarity(menu_item.title" in fuzzy
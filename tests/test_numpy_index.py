@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+
+from app.ai.numpy_index import NumpyCollection
+
+
+def _catalog():
+    ids = ["a", "b", "c", "d"]
+    vectors = [[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0, 0, 1]]
+    metadatas = [
+        {"title": "Croissant", "origin": "french", "category": "pastry", "price": 4.0,
+         "flavor_profiles": "buttery,sweet", "dietary_features": "vegetarian"},
+        {"title": "Macarons", "origin": "french", "category": "dessert", "price": 9.0,
+         "flavor_profiles": "sweet,nutty", "dietary_features": "gluten_free"},
+        {"title": "Mochi", "origin": "japanese", "category": "dessert", "price": 3.0,
+         "flavor_profiles": "sweet", "dietary_features": "vegan,gluten_free"},
+        {"title": "Mystery Box", "origin": "fusion", "category": "pastry"},
+    ]
+    index = NumpyCollection(capacity=2)  # forces growth
+    index.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+    return index
+
+
+def test_query_orders_by_cosine_distance():
+    index = _catalog()
+    result = index.query(query_embeddings=[[1, 0, 0]], n_results=2)
+
+    assert result["ids"] == [["a", "b"]]
+    assert np.isclose(result["distances"][0][0], 0.0, atol=1e-6)
+    assert result["metadatas"][0][1]["title"] == "Macarons"
+
+
+def test_query_applies_where_filters():
+    index = _catalog()
+    where = {"$and": [{"price": {"$lte": 5.0}}, {"flavor_profiles": {"$contains": "sweet"}}]}
+    result = index.query(query_embeddings=[[1, 0, 0]], n_results=5, where=where)
+    assert result["ids"] == [["a", "c"]]
+
+    result = index.query(query_embeddings=[[0, 1, 0]], n_results=5,
+                         where={"$or": [{"origin": "japanese"}, {"dietary_features": {"$contains": "vegetarian"}}]})
+    assert result["ids"] == [["c", "a"]]
+
+    # Missing price never satisfies a numeric comparison
+    result = index.query(query_embeddings=[[0, 0, 1]], n_results=5, where={"price": {"$gte": 0}})
+    assert "d" not in result["ids"][0]
+
+
+def test_upsert_delete_and_get():
+    index = _catalog()
+    index.upsert(ids=["c"], embeddings=[[1, 0, 0]], metadatas=[{"title": "Matcha Mochi", "price": 3.5}])
+    index.delete(ids=["a", "missing"])
+
+    assert index.count() == 3
+    assert index.get(ids=["c"])["metadatas"][0]["title"] == "Matcha Mochi"
+    assert index.query(query_embeddings=[[1, 0, 0]], n_results=1)["ids"] == [["c"]]
+    assert sorted(index.get(include=["metadatas"], limit=10, offset=0)["ids"]) == ["b", "c", "d"]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = NumpyCollection(path=path)
+    index.upsert(ids=["x", "y"], embeddings=[[1, 0], [0, 1]],
+                 metadatas=[{"title": "X", "price": 1.0}, {"title": "Y", "tags": "new"}])
+
+    reloaded = NumpyCollection(path=path)
+    assert reloaded.count() == 2
+    result = reloaded.query(query_embeddings=[[0, 1]], n_results=1, where={"tags": {"$contains": "new"}})
+    assert result["ids"] == [["y"]]
+
+
+def test_get_combines_ids_and_where():
+    index = _catalog()
+    result = index.get(ids=["a", "b", "c", "zz"], where={"origin": "french"})
+    assert result["ids"] == ["a", "b"]
+
+
+def test_writers_reload_newer_snapshot_before_saving(tmp_path):
+    path = str(tmp_path / "index.npz")
+    first = NumpyCollection(path=path)
+    second = NumpyCollection(path=path)
+
+    first.upsert(ids=["x"], embeddings=[[1, 0]], metadatas=[{"title": "X"}])
+    second.upsert(ids=["y"], embeddings=[[0, 1]], metadatas=[{"title": "Y"}])
+    first.delete(ids=["missing"])
+
+    assert sorted(NumpyCollection(path=path).get()["ids"]) == ["x", "y"]
+    assert sorted(first.get()["ids"]) == ["x", "y"]
+
+
+def test_deferred_writes_save_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    index = NumpyCollection(path=path)
+    saves = []
+    monkeypatch.setattr(index, "_save", lambda real=index._save: saves.append(1) or real())
+
+    with index.deferred():
+        for i in range(5):
+            index.upsert(ids=[f"id{i}"], embeddings=[[1, i]])
+        index.delete(ids=["id0"])
+        assert not os.path.exists(path)
+
+    assert len(saves) == 1
+    assert NumpyCollection(path=path).count() == 4
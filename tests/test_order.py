@@ -51,6 +51,18 @@ def test_order_list_page_renders(client):
     assert resp.status_code in [200, 303, 307, 404]
 
 
+def test_order_list_page_redirects_on_malformed_session(client, fake_session):
+    legacy = User(
+        id="legacy-42", email="legacy@example.com", password_hash=hash_password("pass123"), is_verified=True,
+    )
+    fake_session.users.append(legacy)
+    assert client.post("/auth/login", json={"email": legacy.email, "password": "pass123"}).status_code == 200
+
+    resp = client.get("/orders/view")
+    assert resp.status_code == 303
+    assert resp.headers["location"].startswith("/auth/login")
+
+
 def test_get_order_by_id(client, test_order, fake_session):
     """Test retrieving a specific order"""
     resp = client.get(f"/order/{test_order.id}")
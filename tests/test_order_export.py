@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from main import app
+from app.core import db, order_export
+from app.models.postgres.order import Order
+from app.models.postgres.user import User
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def orders_db(tmp_path, monkeypatch):
+    """12 orders an hour apart, alternating pending/confirmed; 5 and 6 share a timestamp."""
+    url = f"sqlite:///{tmp_path / 'orders.db'}"
+    connect_args = {"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES}
+    sync_engine = create_engine(url, connect_args=connect_args)
+    SQLModel.metadata.create_all(sync_engine, tables=[User.__table__, Order.__table__])
+    async_engine = create_async_engine(db.async_database_url(url), connect_args=connect_args)
+
+    async def _get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[db.get_async_session] = _get_async_session
+    monkeypatch.setattr(order_export, "engine", sync_engine)
+
+    orders = [
+        Order(
+            user_id=uuid4(), total=float(i), status="pending" if i % 2 else "confirmed",
+            created_at=START + timedelta(hours=5 if i == 6 else i),
+        )
+        for i in range(12)
+    ]
+    with Session(sync_engine, expire_on_commit=False) as session:
+        session.add_all(orders)
+        session.commit()
+    yield orders
+    asyncio.run(async_engine.dispose())
+
+
+def _list_all(client, **params):
+    pages, cursor = [], None
+    while True:
+        resp = client.get("/orders/", params={**params, **({"before": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        body = resp.json()
+        pages.append(body["orders"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_listing_pages_newest_first_without_gaps(client, orders_db):
+    pages = _list_all(client, limit=5)
+    assert [len(page) for page in pages] == [5, 5, 2]
+    totals = [o["total"] for page in pages for o in page]
+    assert sorted(totals) == [float(i) for i in range(12)]
+    keys = [(o["created_at"], o["id"]) for page in pages for o in page]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_listing_filters_by_status_and_date_window(client, orders_db):
+    pages = _list_all(
+        client, limit=2, status="pending",
+        created_from=(START + timedelta(hours=3)).isoformat(),
+        created_to=(START + timedelta(hours=9)).isoformat(),
+    )
+    assert [o["total"] for page in pages for o in page] == [7.0, 5.0, 3.0]
+    assert client.get("/orders/", params={"before": "not-a-cursor"}).status_code == 400
+
+
+def test_ndjson_export_streams_every_matching_order(client, orders_db):
+    resp = client.get("/orders/export", params={"status": "confirmed"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["total"] for r in rows] == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    assert set(rows[0]) == set(order_export.EXPORT_COLUMNS)
+    assert rows[0]["created_at"] == START.isoformat()
+
+
+def test_csv_export_has_header_and_one_row_per_order(client, orders_db):
+    resp = client.get("/orders/export", params={"format": "csv"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert rows[0] == order_export.EXPORT_COLUMNS
+    assert len(rows) == 13
+    assert {row[0] for row in rows[1:]} == {str(o.id) for o in orders_db}
+
+    assert client.get("/orders/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_reads_in_batches(orders_db):
+    batches = list(order_export.iter_order_rows(batch_size=5))
+    assert [len(batch) for batch in batches] == [5, 5, 2]
+    chunks = list(order_export.export_lines("ndjson", iter(batches)))
+    assert [chunk.count("\n") for chunk in chunks] == [5, 5, 2]
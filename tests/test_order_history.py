@@ -0,0 +1,76 @@
+import sqlite3
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.order_history import decode_cursor, encode_cursor, group_order_rows, order_history_query
+from app.models.postgres.order import Order
+from app.models.postgres.order_item import OrderItem
+from app.models.postgres.user import User
+
+
+@pytest.fixture
+def history_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Order.__table__, OrderItem.__table__])
+    user_id, other_id = uuid4(), uuid4()
+    now = datetime(2025, 1, 1)
+
+    with Session(engine) as session:
+        # Orders 0..6; 3 and 4 share a timestamp so the id tie-break matters
+        for i in range(7):
+            created_at = now + timedelta(hours=min(i, 3) if i in (3, 4) else i)
+            order = Order(user_id=user_id, total=float(i), created_at=created_at)
+            session.add(order)
+            for j in range(i % 3):
+                session.add(OrderItem(
+                    order_id=order.id, menu_item_id=uuid4(), title=f"item {j}", unit_price=1.0, quantity=1,
+                ))
+        session.add(Order(user_id=other_id, total=99.0, created_at=now))
+        session.commit()
+        yield session, user_id
+
+
+def _pages(session, user_id, limit):
+    pages, cursor = [], None
+    while True:
+        rows = session.exec(order_history_query(user_id, limit, decode_cursor(cursor) if cursor else None)).all()
+        page, cursor = group_order_rows(rows, limit)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_order_once_newest_first(history_session):
+    session, user_id = history_session
+    pages = _pages(session, user_id, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    orders = [entry["order"] for page in pages for entry in page]
+    assert sorted(o["total"] for o in orders) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    keys = [(o["created_at"], o["id"]) for o in orders]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_items_are_grouped_under_their_order(history_session):
+    session, user_id = history_session
+    page = _pages(session, user_id, limit=10)[0]
+
+    for entry in page:
+        assert len(entry["items"]) == int(entry["order"]["total"]) % 3
+        assert all(item["order_id"] == entry["order"]["id"] for item in entry["items"])
+
+
+def test_cursor_round_trip_and_garbage():
+    order_id = uuid4()
+    created_at = datetime(2025, 5, 6, 7, 8, 9, 123456)
+    assert decode_cursor(encode_cursor(created_at, order_id)) == (created_at, order_id)
+    assert decode_cursor("not-a-cursor") is None
+    assert decode_cursor("") is None
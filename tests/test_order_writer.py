@@ -0,0 +1,122 @@
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core import order_writer
+from app.core.menu_catalog import menu_catalog
+from app.core.security import hash_password
+from app.models.postgres.menu import MenuItem
+from app.models.postgres.order import Order
+from app.models.postgres.order_item import OrderItem
+from app.models.postgres.user import User
+
+
+@pytest.fixture
+def writer_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(
+        engine, tables=[User.__table__, MenuItem.__table__, Order.__table__, OrderItem.__table__],
+    )
+    items = [
+        MenuItem(
+            title=title, description="", price=price, category="pastry", is_available=True,
+            tags=[], flavor_profiles=[], dietary_features=[], gallery_urls=[],
+        )
+        for title, price in (("Croissant", 3.0), ("Eclair", 4.5), ("Madeleine", 1.25))
+    ]
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all(items)
+        session.commit()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    with Session(engine) as session:
+        yield session, items, queries
+
+
+def test_order_and_items_written_with_one_lookup_and_two_inserts(writer_session):
+    session, items, queries = writer_session
+    user_id = uuid4()
+
+    order, order_items = order_writer.create_order(
+        session, user_id, [(items[0].id, 2), (str(items[1].id), 1), (items[2].id, 4)],
+    )
+    session.commit()
+
+    # one IN lookup for prices, one INSERT for the order, one multi-row INSERT for its items
+    assert len(queries) == 3
+    assert queries[0].startswith("SELECT") and " IN " in queries[0]
+    assert queries[1].startswith("INSERT INTO \"order\"")
+    assert queries[2].startswith("INSERT INTO order_item") and queries[2].count("(?, ?, ?, ?, ?, ?)") == 3
+    assert order.total == 3.0 * 2 + 4.5 + 1.25 * 4
+
+    stored = session.exec(select(OrderItem).where(OrderItem.order_id == order.id)).all()
+    assert sorted((i.title, i.quantity) for i in stored) == [("Croissant", 2), ("Eclair", 1), ("Madeleine", 4)]
+    assert {i.id for i in stored} == {i.id for i in order_items}
+    assert session.get(Order, order.id).user_id == user_id
+
+
+def test_unknown_item_writes_nothing(writer_session):
+    session, items, queries = writer_session
+
+    with pytest.raises(order_writer.UnknownMenuItem):
+        order_writer.create_order(session, uuid4(), [(items[0].id, 1), (uuid4(), 1)])
+    assert not any(q.startswith("INSERT") for q in queries)
+
+    order, order_items = order_writer.create_order(
+        session, uuid4(), [(items[0].id, 1), (uuid4(), 1)], total=0, ignore_missing=True,
+    )
+    session.commit()
+    assert [i.title for i in order_items] == ["Croissant"]
+    assert session.get(Order, order.id).total == 0
+
+
+def test_prices_come_from_the_order_transaction_not_the_menu_cache(writer_session, monkeypatch):
+    session, items, _ = writer_session
+    # A warm snapshot in this worker that predates the price change and deletion below
+    monkeypatch.setattr(menu_catalog, "get_many", lambda session, ids: list(items))
+
+    croissant = session.get(MenuItem, items[0].id)
+    croissant.price = 3.75
+    session.add(croissant)
+    session.delete(session.get(MenuItem, items[1].id))
+    session.commit()
+
+    with pytest.raises(order_writer.UnknownMenuItem):
+        order_writer.create_order(session, uuid4(), [(items[1].id, 1)])
+    order, _ = order_writer.create_order(session, uuid4(), [(items[0].id, 2)])
+    assert order.total == 7.5
+
+
+def test_create_order_route_commits_once(client, fake_session):
+    user = User(
+        id=uuid4(), email="writer@example.com", password_hash=hash_password("pass123"), is_verified=True,
+    )
+    fake_session.add(user)
+    item = MenuItem(id=uuid4(), title="Canele", price=3.5, is_available=True, gallery_urls=[])
+    fake_session.menu_items[item.id] = item
+    commits = fake_session.commits
+
+    resp = client.post(
+        "/orders/", params={"user_id": str(user.id)},
+        json=[{"menu_item_id": str(item.id), "quantity": 2}],
+    )
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 7.0
+    assert fake_session.commits == commits + 1
+    inserted = [stmt.table.name for stmt in fake_session.executed]
+    assert inserted == ["order", "order_item"]
+
+    resp = client.post(
+        "/orders/", params={"user_id": str(user.id)},
+        json=[{"menu_item_id": str(uuid4()), "quantity": 1}],
+    )
+    assert resp.status_code == 404
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.ai import chat_model, emb_model, interpret, provider
+from app.ai.emb_cache import EmbeddingCache
+from app.ai.provider import FakeProvider, OpenAIProvider, hashed_bow_embedding
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    fake = FakeProvider(dim=64)
+    previous = provider.set_provider(fake)
+    monkeypatch.setattr(emb_model, "get_embedding_cache", lambda: EmbeddingCache(path=None))
+    yield fake
+    provider.set_provider(previous)
+
+
+def test_hashed_bow_embedding_is_deterministic_and_normalized():
+    a = hashed_bow_embedding("chocolate croissant", 64)
+    assert a == hashed_bow_embedding("Chocolate  croissant!", 64)
+    assert len(a) == 64
+    assert np.linalg.norm(a) == pytest.approx(1.0, rel=1e-5)
+    assert hashed_bow_embedding("", 64) == [0.0] * 64
+
+    # Shared words → closer than unrelated text
+    b = hashed_bow_embedding("chocolate eclair", 64)
+    c = hashed_bow_embedding("spicy thai noodles", 64)
+    assert np.dot(a, b) > np.dot(a, c)
+
+
+def test_fake_provider_backs_the_ai_modules(fake_provider):
+    vectors = emb_model.embed_texts(["Croissant", "croissant", "Matcha"])
+    assert vectors[0] == vectors[1] == emb_model.embed_text("croissant")
+    assert len(vectors[2]) == 64
+
+    reply = chat_model.chat_response("system", "any nutty pastries?")
+    assert reply == "Woof! Yorkie here. You asked about: any nutty pastries?"
+
+    async def collect():
+        return [d async for d in chat_model.chat_response_stream("system", "hello there")]
+
+    assert "".join(asyncio.run(collect())) == "Woof! Yorkie here. You asked about: hello there"
+
+    fake_provider.json_reply = {"origin": "french", "price_max": 5}
+    filters = interpret.parse_query_filters("cheap french pastry")
+    assert filters["origin"] == "french"
+    assert filters["price_max"] == 5
+
+
+def test_openai_provider_sorts_embeddings_and_parses_json():
+    data = [SimpleNamespace(index=i, embedding=[float(i)]) for i in range(3)]
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"name": "Spencer"}'))]
+    )
+    client = SimpleNamespace(
+        embeddings=SimpleNamespace(create=lambda model, input: SimpleNamespace(data=list(reversed(data)))),
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kw: completion)),
+    )
+
+    p = OpenAIProvider()
+    p._client = client
+
+    assert p.embed(["a", "b", "c"]) == [[0.0], [1.0], [2.0]]
+    assert p.chat_json([{"role": "user", "content": "hi"}]) == {"name": "Spencer"}
@@ -89,3 +89,50 @@ def test_review_variations(client, fake_session):
             )
 
 
+
+
+@pytest.fixture
+def stats_engine():
+    from sqlalchemy.pool import StaticPool
+    from sqlmodel import SQLModel, create_engine
+    from app.models.postgres.menu_item_rating_stats import MenuItemRatingStats
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[MenuItemRatingStats.__table__])
+    return engine
+
+
+def test_record_rating_maintains_count_sum_and_avg(stats_engine):
+    from sqlmodel import Session
+    from app.core.rating_stats import get_rating_stats, record_rating
+
+    item_a, item_b = uuid4(), uuid4()
+    with Session(stats_engine) as session:
+        record_rating(session, item_a, 4)           # new review
+        record_rating(session, item_a, 2)           # second reviewer
+        record_rating(session, item_a, 5, previous_rating=2)  # edit: 2 → 5
+        record_rating(session, item_b, 3)
+        session.commit()
+
+        stats = get_rating_stats(session, [item_a, item_b, uuid4()])
+
+    assert set(stats) == {str(item_a), str(item_b)}
+    assert stats[str(item_a)].review_count == 2
+    assert stats[str(item_a)].rating_sum == 9
+    assert stats[str(item_a)].rating_avg == pytest.approx(4.5)
+    assert stats[str(item_b)].to_dict() == {"count": 1, "sum": 3, "avg": 3.0}
+
+
+def test_add_review_updates_rating_stats_in_same_transaction(fake_session):
+    user_id = uuid4()
+    menu_item_id = uuid4()
+    fake_session.menu_items[menu_item_id] = object()
+    request = _make_request_with_user(user_id)
+
+    add_review(request=request, menu_item_id=menu_item_id, rating=4, comment="Tasty", session=fake_session)
+    add_review(request=request, menu_item_id=menu_item_id, rating=2, comment="Meh", session=fake_session)
+
+    upserts = [stmt.compile().params for stmt in fake_session.executed]
+    assert [p["review_count"] for p in upserts] == [1, 0]
+    assert [p["rating_sum"] for p in upserts] == [4, -2]
+    assert fake_session.commits == 2
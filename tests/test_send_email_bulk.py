@@ -0,0 +1,132 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core import event_notify
+from app.core import send_email as send_email_module
+from app.core.email_outbox import LocalSES
+from app.core.event_notify import NotifyJob, NotifyJobs, run_job
+from app.core.security import hash_password
+from app.models.postgres.event import Event
+from app.models.postgres.user import User
+
+
+@pytest.fixture
+def local_ses(monkeypatch):
+    ses = LocalSES()
+    monkeypatch.setattr(send_email_module, "ses", ses)
+    monkeypatch.setattr(send_email_module, "_event_notice_template_ready", False)
+    monkeypatch.setattr(event_notify, "EMAIL_RETRY_BASE_SECONDS", 0.01)
+    return ses
+
+
+def _recipients(n):
+    return [(f"guest{i}@example.com", f"Guest {i}") for i in range(n)]
+
+
+def _wait(jobs, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = jobs.get(job_id).to_dict()
+        if status["finished_at"]:
+            return status
+        time.sleep(0.01)
+    raise AssertionError("notify job did not finish")
+
+
+@pytest.mark.email
+def test_recipients_are_deduped_and_sent_in_chunks_of_50(local_ses, monkeypatch):
+    calls = []
+    real_batch = send_email_module.send_event_notice_batch
+    monkeypatch.setattr(
+        send_email_module, "send_event_notice_batch",
+        lambda recipients, *args: calls.append(len(recipients)) or real_batch(recipients, *args),
+    )
+    jobs = NotifyJobs()
+
+    recipients = _recipients(110) + [("GUEST3@example.com ", "Dup")]
+    job = jobs.start(uuid4(), "Croissant Class", "Bring an apron", recipients)
+    status = _wait(jobs, job.id)
+
+    assert sorted(calls) == [10, 50, 50]
+    assert status["status"] == "done"
+    assert (status["total"], status["sent"], status["failed"]) == (110, 110, 0)
+    assert (status["chunks"], status["chunks_done"], status["progress"]) == (3, 3, 1.0)
+
+    assert list(local_ses.templates) == [send_email_module.EVENT_NOTICE_TEMPLATE]
+    first = next(m for m in local_ses.sent if m["Destination"]["ToAddresses"] == ["guest3@example.com"])
+    assert first["Message"]["Subject"]["Data"] == "⚠️ Yorkie Bakery - Event Update for Croissant Class"
+    assert first["Message"]["Body"]["Text"]["Data"].startswith("Hello Guest 3,")
+    assert "Bring an apron" in first["Message"]["Body"]["Text"]["Data"]
+
+
+@pytest.mark.email
+def test_chunks_are_sent_in_parallel(local_ses):
+    local_ses.latency_ms = 100
+    job = NotifyJob(uuid4(), "Tasting", "Doors at 6", _recipients(200))
+
+    started = time.perf_counter()
+    run_job(job, parallel=4)
+    assert time.perf_counter() - started < 0.3
+    assert job.sent == 200 and len(local_ses.sent) == 200
+
+
+@pytest.mark.email
+def test_throttled_bulk_calls_are_retried(local_ses):
+    local_ses.fail_every = 2
+    job = NotifyJob(uuid4(), "Tasting", "Doors at 6", _recipients(150))
+    run_job(job, parallel=1)
+    assert (job.sent, job.failed) == (150, 0)
+    assert len(local_ses.sent) == 150
+
+
+@pytest.mark.email
+def test_per_recipient_statuses_retry_transient_and_record_rejections(monkeypatch):
+    attempts = []
+
+    def batch(recipients, *_):
+        attempts.append([email for email, _ in recipients])
+        statuses = []
+        for email, _ in recipients:
+            if email.startswith("bad"):
+                statuses.append("MessageRejected")
+            elif email.startswith("broken"):
+                statuses.append("Failed")
+            elif email.startswith("slow") and len(attempts) == 1:
+                statuses.append("TransientFailure")
+            else:
+                statuses.append(None)
+        return statuses
+
+    monkeypatch.setattr(send_email_module, "send_event_notice_batch", batch)
+    monkeypatch.setattr(event_notify, "EMAIL_RETRY_BASE_SECONDS", 0.01)
+    recipients = [("ok@x.com", None), ("bad@x.com", None), ("broken@x.com", None), ("slow@x.com", None)]
+    job = NotifyJob(uuid4(), "Tasting", "Doors at 6", recipients)
+    run_job(job)
+
+    assert attempts == [["ok@x.com", "bad@x.com", "broken@x.com", "slow@x.com"], ["slow@x.com"]]
+    assert job.to_dict()["errors"] == {"MessageRejected": 1, "Failed": 1}
+    assert (job.sent, job.failed) == (2, 2)
+
+
+def test_notify_route_starts_job_and_status_is_pollable(client, fake_session):
+    admin = User(
+        id=uuid4(), email="admin@example.com", password_hash=hash_password("password123"),
+        is_verified=True, is_admin=True,
+    )
+    fake_session.users.append(admin)
+    event = Event(id=uuid4(), title="Tasting", event_datetime=datetime.utcnow() + timedelta(days=3))
+    fake_session.add(event)
+
+    assert client.post(f"/events/notify/{event.id}", data={"message": "hi"}).status_code == 403
+    client.post("/auth/login", json={"email": admin.email, "password": "password123"})
+
+    resp = client.post(f"/events/notify/{event.id}", data={"message": "Doors at 6"})
+    assert resp.status_code == 303
+    job_id = resp.headers["location"].split("notify_job=")[1]
+
+    status = client.get(f"/events/notify/jobs/{job_id}").json()
+    assert status["event_id"] == str(event.id) and status["total"] == 0
+    assert client.get("/events/notify/jobs/unknown").status_code == 404
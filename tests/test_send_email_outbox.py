@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+
+from app.core import send_email as send_email_module
+from app.core.email_outbox import EmailOutbox, LocalSES
+
+
+def _message(to="guest@example.com"):
+    return {
+        "Source": "noreply@example.com",
+        "Destination": {"ToAddresses": [to]},
+        "Message": {"Subject": {"Data": "hi"}, "Body": {"Text": {"Data": "hello"}}},
+    }
+
+
+def _error(code):
+    error = RuntimeError(code)
+    error.response = {"Error": {"Code": code}}
+    return error
+
+
+@pytest.mark.email
+def test_enqueue_returns_immediately_and_workers_send_concurrently():
+    ses = LocalSES(latency_ms=50)
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def send(message):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            ses.send_email(**message)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    outbox = EmailOutbox(send, workers=4, max_rate=0)
+    started = time.perf_counter()
+    for i in range(16):
+        outbox.enqueue(_message(f"guest{i}@example.com"))
+    assert time.perf_counter() - started < 0.2
+
+    assert outbox.drain(timeout=5)
+    assert len(ses.sent) == 16
+    assert peak[0] == 4
+    assert outbox.stats == {"queued": 16, "sent": 16, "retried": 0, "failed": 0}
+
+
+@pytest.mark.email
+def test_throttled_sends_are_retried_with_backoff():
+    ses = LocalSES(fail_every=3)
+    outbox = EmailOutbox(lambda m: ses.send_email(**m), workers=2, retry_base=0.01, max_rate=0)
+    for i in range(9):
+        outbox.enqueue(_message(f"guest{i}@example.com"))
+
+    assert outbox.drain(timeout=5)
+    assert sorted(m["Destination"]["ToAddresses"][0] for m in ses.sent) == [
+        f"guest{i}@example.com" for i in range(9)
+    ]
+    assert outbox.stats["retried"] >= 3 and outbox.stats["failed"] == 0
+
+
+@pytest.mark.email
+def test_permanent_errors_and_exhausted_retries_are_dropped():
+    calls = []
+
+    def send(message):
+        calls.append(message["Destination"]["ToAddresses"][0])
+        raise _error("MessageRejected" if "bad" in calls[-1] else "Throttling")
+
+    outbox = EmailOutbox(send, workers=1, max_attempts=3, retry_base=0.01, max_rate=0)
+    outbox.enqueue(_message("bad@example.com"))
+    outbox.enqueue(_message("slow@example.com"))
+
+    assert outbox.drain(timeout=5)
+    assert calls.count("bad@example.com") == 1
+    assert calls.count("slow@example.com") == 3
+    assert outbox.stats["failed"] == 2
+    assert outbox.pending_count() == 0
+
+
+@pytest.mark.email
+def test_sends_are_paced_to_max_rate():
+    sent_at = []
+    outbox = EmailOutbox(lambda m: sent_at.append(time.monotonic()), workers=4, max_rate=50)
+    for _ in range(6):
+        outbox.enqueue(_message())
+
+    assert outbox.drain(timeout=5)
+    gaps = [b - a for a, b in zip(sorted(sent_at), sorted(sent_at)[1:])]
+    assert min(gaps) >= 0.015
+
+
+@pytest.mark.email
+def test_send_functions_only_enqueue_when_outbox_is_on(monkeypatch):
+    ses = LocalSES(latency_ms=20)
+    outbox = EmailOutbox(send_email_module.deliver, workers=2, max_rate=0)
+    monkeypatch.setattr(send_email_module, "ses", ses)
+    monkeypatch.setattr(send_email_module, "email_outbox", outbox)
+    monkeypatch.setattr(send_email_module, "EMAIL_OUTBOX", True)
+
+    send_email_module.send_order_confirmation_email(
+        "customer@example.com", [{"title": "Croissant", "qty": 2, "price": 3.5}], 7.0,
+    )
+    send_email_module.send_owner_new_order_email(
+        [{"title": "Croissant", "qty": 2, "price": 3.5}], 7.0, "customer@example.com",
+    )
+    assert ses.sent == []
+
+    assert outbox.drain(timeout=5)
+    recipients = sorted(m["Destination"]["ToAddresses"][0] for m in ses.sent)
+    assert recipients == ["customer@example.com", "yorkiebakery@gmail.com"]
+
+
+@pytest.mark.email
+def test_app_shutdown_drains_queued_mail(monkeypatch):
+    import main
+    from fastapi.testclient import TestClient
+
+    ses = LocalSES(latency_ms=30)
+    outbox = EmailOutbox(lambda m: ses.send_email(**m), workers=1, max_rate=0)
+    monkeypatch.setattr(main, "email_outbox", outbox)
+
+    with TestClient(main.app):
+        for i in range(5):
+            outbox.enqueue(_message(f"guest{i}@example.com"))
+        assert len(ses.sent) < 5
+
+    # The shutdown hook waited for the workers instead of dropping the queue
+    assert len(ses.sent) == 5
+    assert outbox.pending_count() == 0
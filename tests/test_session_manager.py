@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.ai import session_manager
+from app.models.postgres.chat_message import ChatMessage
+from app.models.postgres.chat_session import ChatSession
+from app.models.postgres.user import User
+
+
+@pytest.fixture
+def chat_engine(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, ChatSession.__table__, ChatMessage.__table__])
+    monkeypatch.setattr(session_manager, "engine", engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt.split()[0].upper()))
+    engine.statements = statements
+    return engine
+
+
+def _load(engine, session_id):
+    with Session(engine) as db:
+        return db.exec(select(ChatSession).where(ChatSession.session_id == session_id)).first()
+
+
+def _contents(session_id, limit=100):
+    return [m["content"] for m in session_manager.get_conversation_history(session_id, limit=limit)]
+
+
+def test_new_session_is_inserted_once(chat_engine):
+    with session_manager.chat_turn("abc") as turn:
+        turn.update_preferences({"flavors": ["sweet"]})
+        turn.add_message("user", "hello")
+        turn.add_message("assistant", "hi!")
+
+    assert chat_engine.statements == ["SELECT", "INSERT", "INSERT"]
+    stored = _load(chat_engine, "abc")
+    assert stored.message_count == 2
+    assert stored.preferences == {"flavors": ["sweet"]}
+    assert [m["role"] for m in session_manager.get_conversation_history("abc")] == ["user", "assistant"]
+
+
+def test_existing_session_one_read_one_write(chat_engine):
+    with session_manager.chat_turn("abc") as turn:
+        turn.add_message("user", "first")
+        turn.update_preferences({"flavors": ["sweet"]})
+
+    chat_engine.statements.clear()
+    with session_manager.chat_turn("abc") as turn:
+        assert turn.history(limit=20)[0]["content"] == "first"
+        turn.update_preferences({"flavors": ["nutty"], "name": "Spencer"})
+        turn.add_message("user", "second")
+        turn.add_message("assistant", "reply")
+
+    # session read, history range-read, preferences re-read, session update, message insert
+    assert chat_engine.statements == ["SELECT", "SELECT", "SELECT", "UPDATE", "INSERT"]
+    assert _contents("abc") == ["first", "second", "reply"]
+    stored = _load(chat_engine, "abc")
+    assert stored.message_count == 3
+    assert stored.preferences == {"flavors": ["sweet", "nutty"], "name": "Spencer"}
+
+
+def test_unchanged_preferences_skip_the_reread(chat_engine):
+    with session_manager.chat_turn("abc") as turn:
+        turn.update_preferences({"flavors": ["sweet"]})
+
+    chat_engine.statements.clear()
+    with session_manager.chat_turn("abc") as turn:
+        turn.update_preferences({"flavors": ["sweet"]})
+        turn.add_message("user", "hello")
+
+    assert chat_engine.statements == ["SELECT", "UPDATE", "INSERT"]
+
+
+def test_concurrent_turns_keep_each_others_changes(chat_engine):
+    with session_manager.chat_turn("abc") as turn:
+        turn.update_preferences({"flavors": ["sweet"], "last_viewed": ["Croissant", "Mochi"]})
+        turn.add_message("user", "first")
+
+    first = session_manager.ChatTurn.load("abc")
+    second = session_manager.ChatTurn.load("abc")
+
+    first.update_preferences({"flavors": ["nutty"], "name": "Spencer"})
+    first.preferences["last_viewed"] = ["Mochi", "Tart"]  # trimmed + appended in place
+    first.add_message("user", "from first")
+    second.update_preferences({"flavors": ["chocolate"], "budget": "low"})
+    second.add_message("user", "from second")
+    second.add_message("assistant", "reply to second")
+
+    second.flush()
+    first.flush()
+
+    stored = _load(chat_engine, "abc")
+    assert stored.preferences == {
+        "flavors": ["sweet", "chocolate", "nutty"],
+        "last_viewed": ["Mochi", "Tart"],
+        "budget": "low",
+        "name": "Spencer",
+    }
+    assert first.preferences == stored.preferences
+    assert stored.message_count == 4
+    assert _contents("abc") == ["first", "from second", "reply to second", "from first"]
+
+
+def test_turn_is_not_flushed_when_block_raises(chat_engine):
+    with pytest.raises(RuntimeError):
+        with session_manager.chat_turn("abc") as turn:
+            turn.add_message("user", "lost")
+            raise RuntimeError("completion failed")
+
+    assert _load(chat_engine, "abc") is None
+
+
+def test_expired_session_is_replaced(chat_engine):
+    with Session(chat_engine) as db:
+        db.add(ChatSession(
+            session_id="old",
+            message_count=1,
+            preferences={"name": "Old"},
+            expires_at=datetime.utcnow() - timedelta(hours=1),
+        ))
+        db.add(ChatMessage(session_id="old", seq=1, role="user", content="stale"))
+        db.commit()
+
+    with session_manager.chat_turn("old") as turn:
+        assert turn.history() == []
+        assert turn.preferences == {}
+        turn.add_message("user", "fresh")
+
+    assert _contents("old") == ["fresh"]
+    assert _load(chat_engine, "old").expires_at > datetime.utcnow()
+
+
+def test_add_message_appends_without_rewrite(chat_engine):
+    session_manager.get_or_create_session("abc")
+    for i in range(25):
+        session_manager.add_message("abc", "user", f"msg {i}", metadata={"i": i})
+
+    # History is no longer truncated to 20
+    assert len(_contents("abc")) == 25
+    recent = session_manager.get_conversation_history("abc", limit=3)
+    assert [m["content"] for m in recent] == ["msg 22", "msg 23", "msg 24"]
+    assert recent[-1]["metadata"] == {"i": 24}
+
+    chat_engine.statements.clear()
+    session_manager.add_message("abc", "assistant", "one more")
+    assert chat_engine.statements == ["UPDATE", "INSERT"]
+
+    with pytest.raises(ValueError):
+        session_manager.add_message("missing", "user", "hello")
@@ -0,0 +1,90 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core import user_cache as user_cache_module
+from app.core.security import hash_password
+from app.core.user_cache import UserCache, user_cache, wants_user
+from app.models.postgres.user import User
+
+
+@pytest.fixture
+def logged_in(client, fake_session, monkeypatch):
+    """Log a user in through the fake session and count profile loads."""
+    user = User(
+        id=uuid4(), email="cache@example.com", password_hash=hash_password("password123"),
+        first_name="Cache", is_verified=True, avatar_url="https://cdn.example.com/a.png",
+    )
+    fake_session.users.append(user)
+    loads = []
+
+    async def fake_load(self, user_id):
+        loads.append(user_id)
+        found = fake_session.get(User, user_id)
+        return user_cache_module.user_profile(found) if found else None
+
+    monkeypatch.setattr(UserCache, "load", fake_load)
+    user_cache.clear()
+    resp = client.post("/auth/login", json={"email": user.email, "password": "password123"})
+    assert resp.status_code == 200
+    yield user, loads
+    user_cache.clear()
+
+
+def test_skip_prefixes_match_whole_segments():
+    assert not wants_user("/static/main.js")
+    assert not wants_user("/health")
+    assert not wants_user("/ai/chat")
+    assert not wants_user("/ai-demo/index.html")
+    assert wants_user("/")
+    assert wants_user("/aibout")
+    assert wants_user("/healthy")
+
+
+def test_profile_is_loaded_once_then_served_from_cache(client, logged_in):
+    user, loads = logged_in
+    for _ in range(3):
+        assert client.get("/system-design/view").status_code == 200
+    assert loads == [str(user.id)]
+
+
+def test_static_and_health_requests_skip_hydration(client, logged_in):
+    _, loads = logged_in
+    client.get("/static/main.js")
+    client.get("/health")
+    assert loads == []
+
+
+def test_profile_update_invalidates_cached_profile(client, logged_in):
+    user, loads = logged_in
+    client.get("/system-design/view")
+    assert user_cache.get(str(user.id))["first_name"] == "Cache"
+
+    resp = client.post("/profile/name", data={"first_name": "Renamed", "last_name": ""})
+    assert resp.status_code == 303
+    assert user_cache.get(str(user.id)) is None
+
+    client.get("/system-design/view")
+    assert user_cache.get(str(user.id))["first_name"] == "Renamed"
+    assert len(loads) == 2
+
+
+def test_cache_entries_expire_and_are_bounded(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl=10, max_entries=2)
+
+    cache.set("a", {"id": "a"})
+    cache.set("b", {"id": "b"})
+    cache.set("c", {"id": "c"})
+    assert cache.get("a") is None and cache.get("c") == {"id": "c"}
+
+    now[0] += 11
+    assert cache.get("b") is None
+
+
+def test_missing_or_malformed_user_is_not_cached():
+    cache = UserCache(ttl=10)
+    assert asyncio.run(cache.profile("not-a-uuid")) is None
+    assert cache.get("not-a-uuid") is None